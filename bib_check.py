@@ -5,19 +5,32 @@ bib-check: BibTeX 文件深度检查和自动修复工具
 """
 
 import argparse
+import asyncio
+import multiprocessing
+import multiprocessing.util
 import sys
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 import yaml
+from bibtexparser.bibdatabase import BibDatabase
 from colorama import init, Fore, Style
+from tqdm import tqdm
 
 from utils.bib_parser import BibParser
+from utils.bib_stream import SpliceWriter
+from utils.cache import create_cache, shutdown_revalidator
+from utils.incremental import IncrementalState, run_signature
+from utils.rate_limit import start_shared_limiters, use_shared_limiters
 from utils.report import Report, SummaryReport
 from checkers.auto_update import AutoUpdater
 from checkers.link_check import LinkChecker
 from checkers.biblatex_validate import BibLaTeXValidator
 from checkers.auto_fix import AutoFixer
+from sources.aio import is_offline, use_asyncio
+from utils.snapshot import RecordingCache, read_snapshot, write_snapshot
 
 # 初始化 colorama
 init(autoreset=True)
@@ -30,7 +43,86 @@ class BibSanitizer:
         """初始化"""
         self.config = self._load_config(config_path)
         self.report = Report()
+        # AutoUpdater / LinkChecker / 校验器共享同一缓存实例
+        self.cache = create_cache(self.config.get('cache', {}))
+        # 批量规划阶段已解析的 arXiv-only 条目结果（按规范化标识去重）
+        self.planned = {}
     
+    def allow_stale(self, max_stale):
+        """启用 stale-while-revalidate，过期不超过 max_stale 秒的缓存先返回再后台刷新"""
+        cache_config = self.config.setdefault('cache', {})
+        cache_config['stale_while_revalidate'] = True
+        cache_config['max_stale'] = max_stale
+        self.cache = create_cache(cache_config)
+
+    def use_snapshot(self, snapshot_path):
+        """离线模式：只读使用快照中的数据源记录，不发出任何网络请求"""
+        cache_config = self.config.setdefault('cache', {})
+        cache_config['snapshot'] = snapshot_path
+        cache_config['offline'] = True
+        # 不联网时无需限速
+        for source_config in self.config.get('sources', {}).values():
+            if isinstance(source_config, dict):
+                source_config['rate_limit'] = 0
+        self.cache = create_cache(cache_config)
+        snapshot = getattr(self.cache, 'backend', self.cache)
+        print(f"{Fore.GREEN}[信息] 离线模式: 使用快照 {snapshot_path}（{len(snapshot)} 条记录）{Style.RESET_ALL}")
+
+    def export_snapshot(self, input_files, snapshot_path):
+        """解析输入文件涉及的全部数据源记录并导出为快照"""
+        recorder = RecordingCache(self.cache)
+        for input_file in input_files:
+            print(f"{Fore.CYAN}[信息] 正在解析: {input_file}{Style.RESET_ALL}")
+            bib_database = BibParser().parse_file(input_file)
+            if bib_database is None:
+                print(f"{Fore.RED}[错误] 无法解析文件: {input_file}{Style.RESET_ALL}")
+                return False
+            report = Report()
+            # 非 dry-run：一并获取 BibTeX，离线运行 --auto-update 时可直接替换条目
+            AutoUpdater(self.config, report, cache=recorder).update_entries(bib_database)
+            BibLaTeXValidator(self.config, report, cache=recorder)._resolve_dois(bib_database.entries)
+        keys, objects = write_snapshot(snapshot_path, recorder.records)
+        print(f"{Fore.GREEN}[成功] 已导出快照: {snapshot_path}（{keys} 个键，{objects} 个对象）{Style.RESET_ALL}")
+        return True
+
+    def plan_lookups(self, input_files, priority=None, resolution=None):
+        """批量规划：先解析全部输入文件，每个唯一标识只查询一次数据源
+
+        返回去重统计 {'entries', 'unique', 'saved'}，解析结果保存在 self.planned，
+        process_file 中的 AutoUpdater 直接复用。
+        """
+        if priority:
+            self.config['sources']['priority'] = priority.split(',')
+        if resolution:
+            self.config['sources']['resolution'] = resolution
+        entries = []
+        for input_file in input_files:
+            bib_database = BibParser().parse_file(input_file)
+            if bib_database is not None:
+                entries.extend(bib_database.entries)
+
+        print(f"\n{Fore.CYAN}[批量规划] 跨 {len(input_files)} 个文件去重解析 arXiv-only 条目{Style.RESET_ALL}")
+        updater = AutoUpdater(self.config, Report(), dry_run=True, cache=self.cache)
+        self.planned, total, unique = updater.resolve_identities(entries)
+        stats = {'entries': total, 'unique': unique, 'saved': total - unique}
+        print(f"{Fore.GREEN}[批量规划] {total} 个条目，{unique} 个唯一标识，"
+              f"节省 {stats['saved']} 次查询{Style.RESET_ALL}")
+        return stats
+
+    def import_snapshot(self, snapshot_path):
+        """将快照写入本地磁盘缓存（预热缓存）"""
+        cache_config = dict(self.config.get('cache', {}))
+        cache_config['enabled'] = True
+        cache_config['memory_items'] = 0
+        cache = create_cache(cache_config)
+        records = read_snapshot(snapshot_path)
+        for key, value in records.items():
+            cache.set(key, value)
+        if hasattr(cache, 'close'):
+            cache.close()
+        print(f"{Fore.GREEN}[成功] 已导入 {len(records)} 条记录到缓存: {cache_config.get('dir', '.cache/bib-check')}{Style.RESET_ALL}")
+        return True
+
     def _load_config(self, config_path):
         """加载配置文件"""
         if not os.path.exists(config_path):
@@ -45,11 +137,13 @@ class BibSanitizer:
         return {
             'sources': {
                 'priority': ['semantic-scholar', 'dblp', 'crossref', 'arxiv', 'pubmed'],
+                'resolution': 'all',
                 'semantic_scholar': {
                     'base_url': 'https://api.semanticscholar.org/graph/v1',
                     'timeout': 10,
                     'retry': 3,
-                    'rate_limit': 100
+                    'rate_limit': 100,
+                    'batch_size': 500
                 },
                 'dblp': {
                     'base_url': 'https://dblp.org/search/publ/api',
@@ -62,13 +156,16 @@ class BibSanitizer:
                     'timeout': 10,
                     'retry': 3,
                     'rate_limit': 60,
-                    'mailto': ''
+                    'mailto': '',
+                    'batch_size': 50,
+                    'batch_threshold': 10
                 },
                 'arxiv': {
                     'base_url': 'http://export.arxiv.org/api/query',
                     'timeout': 10,
                     'retry': 3,
-                    'rate_limit': 30
+                    'rate_limit': 30,
+                    'batch_size': 100
                 },
                 'pubmed': {
                     'base_url': 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils',
@@ -76,7 +173,9 @@ class BibSanitizer:
                     'retry': 3,
                     'rate_limit': 60,
                     'email': '',
-                    'tool': 'bib-check'
+                    'tool': 'bib-check',
+                    'batch_size': 200,
+                    'title_batch_size': 20
                 }
             },
             'link_check': {
@@ -96,12 +195,50 @@ class BibSanitizer:
             },
             'cache': {
                 'enabled': False,
+                'backend': 'file',
                 'dir': '.cache/bib-check',
+                'memory_items': 1024,
                 'ttl': 86400,
+                'negative_ttl': 604800,
+                'stale_while_revalidate': False,
+                'max_stale': 604800,
+                'revalidate_workers': 2,
                 'max_size_mb': 200
             },
             'concurrency': {
-                'max_workers': 4
+                'max_workers': 4,
+                'fanout': 'sequential',
+                'backend': 'threads',
+                'async_limit': 32,
+                'pool_size': 100,
+                'pool_per_host': 8,
+                'stream_batch_size': 1000,
+                'adaptive': {
+                    'enabled': False,
+                    'initial': None,
+                    'min_limit': 1,
+                    'max_limit': 32,
+                    'decrease_factor': 0.5
+                }
+            },
+            'circuit_breaker': {
+                'enabled': True,
+                'failure_threshold': 5,
+                'cooldown': 60,
+                'probe_timeout': 60
+            },
+            'hedging': {
+                'enabled': False,
+                'percentile': 95,
+                'min_samples': 20,
+                'min_delay': 0.05
+            },
+            'scheduler': {
+                'enabled': False,
+                'state_file': 'scheduler.json',
+                'min_samples': 10,
+                'skip_below': 0.05,
+                'explore_every': 20
             },
             'output': {
                 'backup': True,
@@ -112,7 +249,9 @@ class BibSanitizer:
                 'report_tex_suffix': '.report.tex',
                 'report_pdf_suffix': '.report.pdf',
                 'summary_suffix': '.summary.json',
-                'summary_md_suffix': '.summary.md'
+                'summary_md_suffix': '.summary.md',
+                'state_suffix': '.state.json',
+                'state_max_age': 604800
             },
             'validation': {
                 'check_missing_fields': True,
@@ -121,6 +260,7 @@ class BibSanitizer:
                 'check_unique_ids': True,
                 'check_type_consistency': True,
                 'check_doi_format': True,
+                'check_doi_exists': False,
                 'check_isbn_issn_format': True,
                 'check_year_range': True,
                 'check_pages_format': True,
@@ -133,14 +273,27 @@ class BibSanitizer:
     def process_file(self, input_file, output_file=None,
                     auto_update=False,
                     check_links=False, validate=False, dry_run=False, priority=None,
+                    resolution=None,
                     write_bib=False, aux_file=None, html_report=False,
                     auto_fix=False, fix_preview=False,
-                    csv_report=False, latex_report=False, pdf_report=False):
+                    csv_report=False, latex_report=False, pdf_report=False,
+                    incremental=False, stream=False):
         """处理 BibTeX 文件"""
         self.report = Report()
+        if hasattr(self.cache, 'reset_stats'):
+            self.cache.reset_stats()
         if fix_preview:
             dry_run = True
         print(f"{Fore.CYAN}[信息] 正在处理文件: {input_file}{Style.RESET_ALL}")
+
+        if stream:
+            return self._process_stream(
+                input_file, output_file, auto_update=auto_update,
+                check_links=check_links, validate=validate, write_bib=write_bib and not dry_run,
+                aux_file=aux_file, auto_fix=auto_fix, fix_preview=fix_preview, incremental=incremental,
+                report_options={'html_report': html_report, 'csv_report': csv_report,
+                                'latex_report': latex_report, 'pdf_report': pdf_report}
+            )
         
         # 解析 BibTeX 文件
         parser = BibParser()
@@ -155,6 +308,8 @@ class BibSanitizer:
         # 如果指定了优先级，更新配置
         if priority:
             self.config['sources']['priority'] = priority.split(',')
+        if resolution:
+            self.config['sources']['resolution'] = resolution
         
         # 解析 .aux 文件（如果提供）
         used_ids = None
@@ -167,6 +322,26 @@ class BibSanitizer:
                 print(f"{Fore.GREEN}[信息] 从 {aux_file} 提取到 {len(used_ids)} 个引用{Style.RESET_ALL}")
             else:
                 print(f"{Fore.YELLOW}[警告] 未能从 {aux_file} 提取引用{Style.RESET_ALL}")
+
+        # 增量模式：跳过指纹未变化的条目，稍后合并其上次的检查结果
+        state = None
+        skipped_ids = []
+        check_database = bib_database
+        report_target = output_file or input_file
+        if incremental:
+            features = {
+                'auto_update': auto_update, 'check_links': check_links, 'validate': validate,
+                'auto_fix': auto_fix, 'fix_preview': fix_preview, 'dry_run': dry_run, 'aux': bool(used_ids)
+            }
+            state_suffix = self.config.get('output', {}).get('state_suffix', '.state.json')
+            state = IncrementalState(
+                f"{report_target}{state_suffix}",
+                run_signature(self.config, features),
+                self.config.get('output', {}).get('state_max_age', 604800)
+            )
+            check_database, skipped_ids = state.select(bib_database, used_ids, rewrite=write_bib and not dry_run)
+            print(f"{Fore.GREEN}[增量] 跳过 {len(skipped_ids)} 个未变化的条目，"
+                  f"检查 {len(check_database.entries)} 个条目{Style.RESET_ALL}")
         
         # 功能 1: Auto-Update
         if auto_update:
@@ -174,8 +349,12 @@ class BibSanitizer:
             print(f"{Fore.CYAN}[功能 1] 自动更新 arXiv 条目{Style.RESET_ALL}")
             print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             
-            updater = AutoUpdater(self.config, self.report)
-            bib_database = updater.update_entries(bib_database)
+            updater = AutoUpdater(self.config, self.report, dry_run=dry_run, cache=self.cache,
+                                  resolved=self.planned)
+            if use_asyncio(self.config):
+                asyncio.run(updater.update_entries_async(check_database))
+            else:
+                updater.update_entries(check_database)
         
         # 功能 2: 自动修复
         auto_fixed = False
@@ -184,16 +363,18 @@ class BibSanitizer:
             print(f"{Fore.CYAN}[功能 2] 自动修复常见问题{Style.RESET_ALL}")
             print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             fixer = AutoFixer(self.config, self.report)
-            auto_fixed = fixer.fix_entries(bib_database, apply=not fix_preview)
+            auto_fixed = fixer.fix_entries(check_database, apply=not fix_preview)
 
         # 功能 3: Dead Link Check
-        if check_links:
+        if check_links and is_offline(self.config):
+            print(f"{Fore.YELLOW}[警告] 离线模式无法检查链接，已跳过{Style.RESET_ALL}")
+        elif check_links:
             print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             print(f"{Fore.CYAN}[功能 3] 检查链接可用性{Style.RESET_ALL}")
             print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             
-            checker = LinkChecker(self.config, self.report)
-            checker.check_entries(bib_database)
+            checker = LinkChecker(self.config, self.report, cache=self.cache)
+            checker.check_entries(check_database)
         
         # 功能 4: BibLaTeX 校验
         if validate:
@@ -201,14 +382,25 @@ class BibSanitizer:
             print(f"{Fore.CYAN}[功能 4] BibLaTeX 字段校验{Style.RESET_ALL}")
             print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
             
-            validator = BibLaTeXValidator(self.config, self.report)
-            validator.validate_entries(bib_database, used_ids)
+            validator = BibLaTeXValidator(self.config, self.report, cache=self.cache)
+            validator.validate_entries(check_database, used_ids)
 
         # 作者截断（默认启用）
         print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}[功能 5] 作者截断{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
-        authors_changed = self._truncate_authors(bib_database)
+        authors_changed = self._truncate_authors(check_database)
+
+        if state is not None:
+            state.record(check_database.entries, self.report.entry_findings())
+            self.report.merge_findings(state.findings(skipped_ids))
+            state.save([entry.get('ID', '') for entry in bib_database.entries])
+            self.report.set_performance('incremental', {
+                'checked': len(check_database.entries),
+                'skipped': len(skipped_ids)
+            })
+        if hasattr(self.cache, 'stats'):
+            self.report.set_performance('cache', self.cache.stats())
         
         # 写回文件（默认不输出新 Bib 文件）
         if write_bib and not dry_run and (auto_update or authors_changed or auto_fixed):
@@ -223,6 +415,13 @@ class BibSanitizer:
             parser.write_file(bib_database, output_file)
             print(f"\n{Fore.GREEN}[成功] 已写入文件: {output_file}{Style.RESET_ALL}")
         
+        self._write_reports(report_target, input_file, html_report, csv_report, latex_report, pdf_report)
+        
+        return True
+
+    def _write_reports(self, report_target, input_file, html_report=False,
+                       csv_report=False, latex_report=False, pdf_report=False):
+        """打印执行报告并写入各格式的报告文件"""
         # 生成报告
         print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}执行报告{Style.RESET_ALL}")
@@ -230,7 +429,6 @@ class BibSanitizer:
         self.report.print_report()
 
         # 写入 JSON 报告
-        report_target = output_file or input_file
         report_suffix = self.config.get('output', {}).get('report_suffix', '.report.json')
         report_path = f"{report_target}{report_suffix}"
         self.report.write_json(report_path)
@@ -269,9 +467,94 @@ class BibSanitizer:
             pdf_path = f"{report_target}{pdf_suffix}"
             self.report.write_pdf(pdf_path)
             print(f"{Fore.GREEN}[报告] 已写入: {pdf_path}{Style.RESET_ALL}")
-        
+
+    def _process_stream(self, input_file, output_file=None, auto_update=False, check_links=False,
+                        validate=False, write_bib=False, aux_file=None, auto_fix=False,
+                        fix_preview=False, incremental=False, report_options=None):
+        """流式模式：逐批解析并检查条目，内存占用与文件大小无关
+
+        仅支持逐条目即可完成的检查（自动修复、链接检查、字段校验、作者截断）。
+        写回时边检查边拼接输出，未修改的条目保留原文。
+        """
+        for enabled, name in ((auto_update, '--auto-update'), (incremental, '--incremental')):
+            if enabled:
+                print(f"{Fore.YELLOW}[警告] 流式模式不支持 {name}，已忽略{Style.RESET_ALL}")
+
+        used_ids = self._extract_citations_from_aux(aux_file) if aux_file else None
+        fixer = AutoFixer(self.config, self.report) if auto_fix else None
+        checker = None
+        if check_links and is_offline(self.config):
+            print(f"{Fore.YELLOW}[警告] 离线模式无法检查链接，已跳过{Style.RESET_ALL}")
+        elif check_links:
+            checker = LinkChecker(self.config, self.report, cache=self.cache)
+        validator = BibLaTeXValidator(self.config, self.report, cache=self.cache) if validate else None
+
+        target_file = output_file or input_file
+        temp_file = f"{target_file}.tmp"
+        bib_parser = BibParser()
+        batch_size = max(int(self.config.get('concurrency', {}).get('stream_batch_size', 1000)), 1)
+        total = 0
+        with bib_parser.stream_file(input_file) as stream, \
+                (open(temp_file, 'wb') if write_bib else nullcontext()) as out:
+            writer = SpliceWriter(stream.buffer, out, bib_parser.entry_to_string) if write_bib else None
+            batch = []
+            for item in tqdm(stream, desc="流式检查", unit="条目"):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    total += self._check_stream_batch(batch, fixer, checker, validator, fix_preview,
+                                                      used_ids, writer)
+                    batch = []
+            if batch:
+                total += self._check_stream_batch(batch, fixer, checker, validator, fix_preview,
+                                                  used_ids, writer)
+            if writer is not None:
+                writer.finish()
+            parse_errors = stream.errors
+
+        print(f"{Fore.GREEN}[成功] 流式检查 {total} 个条目{Style.RESET_ALL}")
+        if parse_errors:
+            print(f"{Fore.YELLOW}[警告] {parse_errors} 条记录无法解析，已跳过{Style.RESET_ALL}")
+        if writer is not None:
+            if writer.rewritten:
+                if output_file is None and self.config['output'].get('backup', True):
+                    backup_file = input_file + self.config['output'].get('backup_suffix', '.bak')
+                    shutil.copy2(input_file, backup_file)
+                    print(f"\n{Fore.YELLOW}[备份] 原文件已备份至: {backup_file}{Style.RESET_ALL}")
+                os.replace(temp_file, target_file)
+                print(f"\n{Fore.GREEN}[成功] 已写入文件: {target_file}（重写 {writer.rewritten} 个条目）{Style.RESET_ALL}")
+            else:
+                os.remove(temp_file)
+        self.report.set_performance('stream', {
+            'entries': total,
+            'batch_size': batch_size,
+            'parse_errors': parse_errors,
+            'rewritten': writer.rewritten if writer is not None else 0
+        })
+        if hasattr(self.cache, 'stats'):
+            self.report.set_performance('cache', self.cache.stats())
+        self._write_reports(target_file, input_file, **(report_options or {}))
         return True
 
+    def _check_stream_batch(self, items, fixer, checker, validator, fix_preview, used_ids, writer=None):
+        """检查流式模式中的一批 StreamEntry（顺序与 process_file 相同），返回条目数"""
+        originals = [dict(item.entry) for item in items] if writer is not None else None
+        batch = BibDatabase()
+        batch.entries = [item.entry for item in items]
+        if fixer is not None:
+            fixer.fix_entries(batch, apply=not fix_preview)
+        if checker is not None:
+            checker.check_links(checker.collect_links(batch.entries), progress=False)
+        if validator is not None:
+            entries = batch.entries
+            if used_ids:
+                entries = [entry for entry in entries if entry.get('ID') in used_ids]
+            validator.validate_batch(entries)
+        self._truncate_authors(batch)
+        if writer is not None:
+            for item, original in zip(items, originals):
+                writer.write_entry(item.entry, original, item.start, item.end)
+        return len(batch.entries)
+
     def _truncate_authors(self, bib_database):
         """作者过长时截断为 et. al"""
         config = self.config.get('author_truncation', {})
@@ -351,8 +634,102 @@ def _collect_input_files(inputs, recursive=False, glob_pattern=None):
     return unique_files
 
 
+def _report_stats(report):
+    """单个文件的汇总统计"""
+    return {
+        'updates': len(report.updates),
+        'update_candidates': len(report.update_candidates),
+        'update_misses': len(report.update_misses),
+        'author_truncations': len(report.author_truncations),
+        'fixes': len(report.fixes),
+        'dead_links': len(report.dead_links),
+        'validation_issues': sum(len(v) for v in report.validation_issues.values()),
+        'errors': len(report.errors)
+    }
+
+
+_worker_sanitizer = None
+
+
+def _init_worker(config_path, limiter_address, max_stale=None, offline=None, planned=None):
+    """--jobs 工作进程初始化：独立的 BibSanitizer（独立 Report），共享限速器与磁盘缓存"""
+    global _worker_sanitizer
+    use_shared_limiters(limiter_address)
+    _worker_sanitizer = BibSanitizer(config_path)
+    if max_stale is not None:
+        _worker_sanitizer.allow_stale(max_stale)
+    if offline:
+        _worker_sanitizer.use_snapshot(offline)
+    _worker_sanitizer.planned = planned or {}
+    # 工作进程退出时不执行 atexit，需显式等待后台刷新写回缓存
+    multiprocessing.util.Finalize(None, shutdown_revalidator, exitpriority=10)
+
+
+def _process_file_worker(task):
+    """在工作进程中处理单个文件，返回 (是否成功, 统计信息)"""
+    file_path, output_file, options = task
+    success = _worker_sanitizer.process_file(file_path, output_file, **options)
+    return success, _report_stats(_worker_sanitizer.report)
+
+
+def _parse_duration(value):
+    """解析时长（秒），支持 s/m/h/d 后缀"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    text = str(value).strip().lower()
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的时长: {value}")
+
+
+def cache_main(argv):
+    """cache 子命令：导出 / 导入离线快照"""
+    parser = argparse.ArgumentParser(
+        prog='bib_check.py cache',
+        description='导出或导入离线缓存快照'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='解析输入文件涉及的数据源记录并导出快照')
+    export_parser.add_argument('snapshot', help='快照文件路径（如 snapshot.json.gz）')
+    export_parser.add_argument('input', nargs='+', help='输入 .bib/.tex 文件或目录路径')
+    export_parser.add_argument('-c', '--config', default='config.yaml', help='配置文件路径')
+    export_parser.add_argument('--recursive', action='store_true', help='递归处理目录下的文件')
+    export_parser.add_argument('--glob', dest='glob_pattern', help='指定 glob 模式过滤文件')
+    export_parser.add_argument('--priority', help='数据源优先级，用逗号分隔（如 semantic-scholar,dblp）')
+
+    import_parser = subparsers.add_parser('import', help='将快照写入本地磁盘缓存')
+    import_parser.add_argument('snapshot', help='快照文件路径')
+    import_parser.add_argument('-c', '--config', default='config.yaml', help='配置文件路径')
+
+    args = parser.parse_args(argv)
+    sanitizer = BibSanitizer(args.config)
+
+    if args.command == 'import':
+        if not os.path.exists(args.snapshot):
+            print(f"{Fore.RED}[错误] 快照不存在: {args.snapshot}{Style.RESET_ALL}")
+            return 1
+        return 0 if sanitizer.import_snapshot(args.snapshot) else 1
+
+    input_files = [
+        file_path for file_path in _collect_input_files(args.input, args.recursive, args.glob_pattern)
+        if file_path.endswith(('.bib', '.tex')) and os.path.exists(file_path)
+    ]
+    if not input_files:
+        print(f"{Fore.RED}[错误] 未找到输入文件{Style.RESET_ALL}")
+        return 1
+    if args.priority:
+        sanitizer.config['sources']['priority'] = args.priority.split(',')
+    return 0 if sanitizer.export_snapshot(input_files, args.snapshot) else 1
+
+
 def main():
     """主函数"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'cache':
+        sys.exit(cache_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description='bib-check: BibTeX 文件深度检查和自动修复工具',
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -382,7 +759,13 @@ def main():
     
     # 其他选项
     parser.add_argument('--priority', help='数据源优先级，用逗号分隔（如 semantic-scholar,dblp）')
+    parser.add_argument('--resolution',
+                       help='数据源解析策略（all, first-bibtex-hit, first-published-hit, quorum-N）')
     parser.add_argument('--aux', help='.aux 文件路径（用于过滤引用）')
+    parser.add_argument('--max-stale', metavar='DURATION', type=_parse_duration,
+                       help='启用 stale-while-revalidate：过期不超过该时长的缓存直接返回并在后台刷新（如 3600、12h、7d）')
+    parser.add_argument('--offline', metavar='SNAPSHOT',
+                       help='离线模式：只读使用 cache export 导出的快照，不发出网络请求')
     parser.add_argument('--html-report', action='store_true',
                        help='生成 HTML 交互报告')
     parser.add_argument('--csv-report', action='store_true',
@@ -395,6 +778,12 @@ def main():
                        help='生成批量处理汇总报告')
     parser.add_argument('--dry-run', action='store_true', 
                        help='不写回文件，仅生成报告')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='并行处理文件的进程数（默认 1；各进程共享限速器与磁盘缓存）')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量检查：跳过内容未变化的条目，复用上次的检查结果')
+    parser.add_argument('--stream', action='store_true',
+                       help='流式模式：逐条目解析超大文件，内存占用恒定（不支持 --auto-update）')
     
     args = parser.parse_args()
     
@@ -436,6 +825,13 @@ def main():
     
     # 创建 sanitizer 并处理文件
     sanitizer = BibSanitizer(args.config)
+    if args.max_stale is not None:
+        sanitizer.allow_stale(args.max_stale)
+    if args.offline:
+        if not os.path.exists(args.offline):
+            print(f"{Fore.RED}[错误] 快照不存在: {args.offline}{Style.RESET_ALL}")
+            sys.exit(1)
+        sanitizer.use_snapshot(args.offline)
 
     output_dir = None
     if args.output:
@@ -449,8 +845,25 @@ def main():
                 sys.exit(1)
             output_dir.mkdir(parents=True, exist_ok=True)
 
-    reports = []
-    all_success = True
+    options = {
+        'auto_update': args.auto_update,
+        'check_links': args.check_links,
+        'validate': args.validate,
+        'dry_run': args.dry_run,
+        'priority': args.priority,
+        'resolution': args.resolution,
+        'write_bib': args.write_bib,
+        'aux_file': args.aux,
+        'html_report': args.html_report,
+        'auto_fix': args.auto_fix,
+        'fix_preview': args.fix_preview,
+        'csv_report': args.csv_report,
+        'latex_report': args.latex_report,
+        'pdf_report': args.pdf_report,
+        'incremental': args.incremental,
+        'stream': args.stream
+    }
+    tasks = []
     for file_path in filtered_files:
         output_file = None
         if args.output:
@@ -458,40 +871,44 @@ def main():
                 output_file = str(output_dir / Path(file_path).name)
             else:
                 output_file = args.output
+        tasks.append((file_path, output_file, options))
 
-        success = sanitizer.process_file(
-            file_path,
-            output_file,
-            auto_update=args.auto_update,
-            check_links=args.check_links,
-            validate=args.validate,
-            dry_run=args.dry_run,
-            priority=args.priority,
-            write_bib=args.write_bib,
-            aux_file=args.aux,
-            html_report=args.html_report,
-            auto_fix=args.auto_fix,
-            fix_preview=args.fix_preview,
-            csv_report=args.csv_report,
-            latex_report=args.latex_report,
-            pdf_report=args.pdf_report
-        )
-        all_success = all_success and success
-        report = sanitizer.report
-        stats = {
-            'updates': len(report.updates),
-            'update_candidates': len(report.update_candidates),
-            'update_misses': len(report.update_misses),
-            'author_truncations': len(report.author_truncations),
-            'fixes': len(report.fixes),
-            'dead_links': len(report.dead_links),
-            'validation_issues': sum(len(v) for v in report.validation_issues.values()),
-            'errors': len(report.errors)
-        }
-        reports.append({'file': file_path, 'stats': stats})
+    # 多文件时先跨文件去重解析，相同论文只查询一次（增量模式按文件跳过条目，不做规划）
+    dedup = None
+    if args.auto_update and len(tasks) > 1 and not (args.incremental or args.stream):
+        dedup = sanitizer.plan_lookups(filtered_files, args.priority, args.resolution)
+
+    reports = []
+    all_success = True
+    jobs = min(max(args.jobs, 1), len(tasks))
+    if jobs > 1:
+        print(f"{Fore.GREEN}[信息] 使用 {jobs} 个进程并行处理 {len(tasks)} 个文件{Style.RESET_ALL}")
+        # 父进程此时可能已有后台线程（asyncio 事件循环、后台刷新、对冲线程池），
+        # fork 出的子进程会继承其中持有的锁而挂起，因此工作进程使用 spawn 启动
+        mp_context = multiprocessing.get_context('spawn')
+        limiter_manager = start_shared_limiters(mp_context)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(args.config, limiter_manager.address, args.max_stale, args.offline,
+                          sanitizer.planned)
+            ) as executor:
+                # map 按输入顺序返回结果
+                for (file_path, _, _), (success, stats) in zip(tasks, executor.map(_process_file_worker, tasks)):
+                    all_success = all_success and success
+                    reports.append({'file': file_path, 'stats': stats})
+        finally:
+            limiter_manager.shutdown()
+    else:
+        for file_path, output_file, file_options in tasks:
+            success = sanitizer.process_file(file_path, output_file, **file_options)
+            all_success = all_success and success
+            reports.append({'file': file_path, 'stats': _report_stats(sanitizer.report)})
 
     if len(filtered_files) > 1 or args.summary_report:
-        summary = SummaryReport(reports)
+        summary = SummaryReport(reports, dedup=dedup)
         summary_target_dir = output_dir or Path(filtered_files[0]).parent
         summary_json_suffix = sanitizer.config.get('output', {}).get('summary_suffix', '.summary.json')
         summary_md_suffix = sanitizer.config.get('output', {}).get('summary_md_suffix', '.summary.md')
@@ -1,12 +1,26 @@
 """自动更新 arXiv 条目"""
 
+import asyncio
+import math
+import os
 import re
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from colorama import Fore, Style
 from tqdm import tqdm
 
+from utils.aimd import adaptive_enabled, aimd_metrics, max_concurrency
 from utils.bib_parser import BibParser
-from utils.cache import FileCache
+from utils.circuit_breaker import CircuitBreaker, breaker_metrics, get_breaker
+from utils.cache import MISSING, create_cache, get_revalidator, track_stale
+from utils.hedging import hedge_metrics
+from utils.identity import IdentityIndex, identity_keys
+from utils.rate_limit import limiter_metrics
+from utils.resolution import ResolutionPolicy, has_bibtex
+from utils.scheduler import SourceScheduler, query_kind
+from utils.singleflight import get_flight
+from sources.aio import OfflineSession, TrackedSession, get_client, is_offline, use_asyncio
 from sources.semantic_scholar import SemanticScholarAPI
 from sources.dblp import DBLPAPI
 from sources.crossref import CrossrefAPI
@@ -17,15 +31,41 @@ from sources.pubmed import PubMedAPI
 class AutoUpdater:
     """自动更新器"""
     
-    def __init__(self, config, report):
-        """初始化"""
+    def __init__(self, config, report, dry_run=False, cache=None, resolved=None):
+        """初始化
+
+        resolved 为批量规划阶段（resolve_identities）已解析的结果，
+        命中的条目直接复用，不再查询数据源。
+        """
         self.config = config
         self.report = report
+        self.dry_run = dry_run
+        self.resolved = resolved or {}
         self.priority = config.get('sources', {}).get('priority', [
             'semantic-scholar', 'dblp', 'crossref', 'arxiv', 'pubmed'
         ])
-        self.max_workers = config.get('concurrency', {}).get('max_workers', 4)
-        self.cache = FileCache(config.get('cache', {}))
+        # 启用自适应并发时线程数取 adaptive.max_limit，实际并发由各数据源的 AIMD 上限控制
+        self.adaptive = adaptive_enabled(config)
+        self.max_workers = max_concurrency(config)
+        self.fanout = config.get('concurrency', {}).get('fanout', 'sequential')
+        self.async_limit = config.get('concurrency', {}).get('async_limit', 32)
+        self._source_pools = {}
+        self.offline = is_offline(config)
+        if self.offline:
+            # 离线快照模式不联网，按条目逐个数据源查询以便统计未覆盖的条目
+            self.fanout = 'sequential'
+        if use_asyncio(config) and get_client(config) is None:
+            print(f"{Fore.YELLOW}[警告] 未安装 aiohttp，asyncio 后端回退为 threads{Style.RESET_ALL}")
+        self.cache = cache if cache is not None else create_cache(config.get('cache', {}))
+        self.identity = IdentityIndex(self.cache)
+        try:
+            self.policy = ResolutionPolicy.from_config(config)
+        except ValueError as e:
+            print(f"{Fore.YELLOW}[警告] {e}，回退为 all{Style.RESET_ALL}")
+            self.policy = ResolutionPolicy('all')
+        self._stats_lock = threading.Lock()
+        self.source_calls = 0
+        self.source_calls_saved = 0
         
         # 初始化 API 客户端
         self.apis = {
@@ -35,33 +75,254 @@ class AutoUpdater:
             'arxiv': ArxivAPI(config, cache=self.cache),
             'pubmed': PubMedAPI(config, cache=self.cache)
         }
+        # stale-while-revalidate：过期缓存先返回，再在后台刷新
+        self.revalidator = None if self.offline else get_revalidator(config.get('cache', {}))
+        self.stale_served = 0
+        # 连续失败的数据源在冷却期内直接跳过（不占用限速令牌）
+        self.breakers = {source: get_breaker(source, config) for source in self.apis}
+        # 自适应调度：按观测到的命中率与延迟为每个条目排序 / 跳过数据源
+        self.scheduler = self._create_scheduler(config)
+        # 并发的相同查询合并为一次请求
+        self.flight = get_flight()
+        self.coalesced = 0
     
+    def _create_scheduler(self, config):
+        """scheduler.enabled 时创建调度器，统计保存在缓存目录（离线模式不启用）"""
+        scheduler_config = config.get('scheduler', {})
+        if not scheduler_config.get('enabled', False) or self.offline:
+            return None
+        cache_dir = config.get('cache', {}).get('dir', '.cache/bib-check')
+        return SourceScheduler(
+            policy=self.policy,
+            path=os.path.join(cache_dir, scheduler_config.get('state_file', 'scheduler.json')),
+            min_samples=scheduler_config.get('min_samples', 10),
+            skip_below=scheduler_config.get('skip_below', 0.05),
+            explore_every=scheduler_config.get('explore_every', 20)
+        )
+
     def update_entries(self, bib_database):
         """更新条目"""
-        arxiv_entries = self._find_arxiv_entries(bib_database)
-        
+        arxiv_entries = self._collect_entries(bib_database)
         if not arxiv_entries:
-            print(f"{Fore.YELLOW}[信息] 没有找到 arXiv-only 条目{Style.RESET_ALL}")
             return bib_database
-        
-        print(f"{Fore.GREEN}[信息] 找到 {len(arxiv_entries)} 个 arXiv-only 条目{Style.RESET_ALL}")
-        
+
+        self._open_source_pools()
+
         # 遍历更新
         updated_count = 0
-        if self.max_workers and self.max_workers > 1:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = [executor.submit(self._update_entry, entry) for entry in arxiv_entries]
-                for future in tqdm(as_completed(futures), total=len(futures), desc="更新条目", unit="条目"):
-                    if future.result():
+        try:
+            if self.max_workers and self.max_workers > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = [executor.submit(self._update_entry, entry) for entry in arxiv_entries]
+                    for future in tqdm(as_completed(futures), total=len(futures), desc="更新条目", unit="条目"):
+                        if future.result():
+                            updated_count += 1
+            else:
+                for entry in tqdm(arxiv_entries, desc="更新条目", unit="条目"):
+                    if self._update_entry(entry):
                         updated_count += 1
-        else:
-            for entry in tqdm(arxiv_entries, desc="更新条目", unit="条目"):
-                if self._update_entry(entry):
-                    updated_count += 1
+        finally:
+            self._close_source_pools()
+
+        self._finish_run(updated_count)
+        return bib_database
+
+    async def update_entries_async(self, bib_database):
+        """在 asyncio 事件循环中更新条目（concurrency.backend: asyncio）
+
+        每个条目仍在线程池线程中执行同步的更新流程，数据源的 HTTP 请求
+        提交到共享事件循环上执行并阻塞等待结果；同时在途的条目数（即线程数）
+        由 concurrency.async_limit 限制。
+        """
+        arxiv_entries = self._collect_entries(bib_database)
+        if not arxiv_entries:
+            return bib_database
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.async_limit, thread_name_prefix='bib-check-entry')
+        self._open_source_pools()
+
+        updated_count = 0
+        try:
+            tasks = [loop.run_in_executor(executor, self._update_entry, entry) for entry in arxiv_entries]
+            with tqdm(total=len(tasks), desc="更新条目", unit="条目") as progress:
+                for task in asyncio.as_completed(tasks):
+                    if await task:
+                        updated_count += 1
+                    progress.update(1)
+        finally:
+            executor.shutdown(wait=True)
+            self._close_source_pools()
+
+        self._finish_run(updated_count)
+        return bib_database
+
+    def _collect_entries(self, bib_database):
+        """收集待更新的 arXiv-only 条目"""
+        arxiv_entries = self._find_arxiv_entries(bib_database)
         
-        print(f"{Fore.GREEN}[成功] 成功更新 {updated_count} 个条目{Style.RESET_ALL}")
+        if not arxiv_entries:
+            print(f"{Fore.YELLOW}[信息] 没有找到 arXiv-only 条目{Style.RESET_ALL}")
+            return []
         
-        return bib_database
+        print(f"{Fore.GREEN}[信息] 找到 {len(arxiv_entries)} 个 arXiv-only 条目{Style.RESET_ALL}")
+        self._prefetch([entry for entry in arxiv_entries if self._plan_key(entry) not in self.resolved])
+        return arxiv_entries
+
+    def resolve_identities(self, entries):
+        """跨文件去重解析：每个唯一标识（DOI / arXiv ID / 规范化标题）只查询一次
+
+        返回 ({标识: 规划结果}, arXiv-only 条目数, 唯一标识数)，
+        结果通过 AutoUpdater(resolved=...) 分发回各文件的条目。
+        规划结果同时记录查询时被熔断跳过的数据源与离线模式下被拦截的请求，
+        由 _resolve_entry 回放到引用该标识的每个条目的报告中。
+        """
+        unique = {}
+        total = 0
+        for entry in entries:
+            if not self._is_arxiv_only(entry):
+                continue
+            total += 1
+            unique.setdefault(self._plan_key(entry), entry)
+        if not unique:
+            return {}, total, 0
+
+        self._prefetch(list(unique.values()))
+        self._open_source_pools()
+        resolved = {}
+        try:
+            with ThreadPoolExecutor(max_workers=max(self.max_workers or 1, 1)) as executor:
+                futures = {
+                    executor.submit(self._plan_query, entry): key
+                    for key, entry in unique.items()
+                }
+                for future in tqdm(as_completed(futures), total=len(futures), desc="解析标识", unit="个"):
+                    resolved[futures[future]] = future.result()
+        finally:
+            self._close_source_pools()
+        return resolved, total, len(unique)
+
+    def _plan_query(self, entry):
+        """规划阶段查询一个唯一标识，记录熔断跳过与离线拦截"""
+        with CircuitBreaker.track() as skipped, OfflineSession.track() as blocked:
+            results = self._query_sources(*self._entry_query(entry))
+        return {'results': results, 'skipped': sorted(skipped), 'blocked': list(blocked)}
+
+    def _entry_query(self, entry):
+        """条目的查询参数 (title, arxiv_id, doi)"""
+        title = entry.get('title', '').replace('{', '').replace('}', '')
+        return title, self._extract_arxiv_id(entry), entry.get('doi', '')
+
+    def _plan_key(self, entry):
+        """批量规划的去重键：规范化后的全部标识"""
+        title, arxiv_id, doi = self._entry_query(entry)
+        return tuple(identity_keys(title=title, doi=doi, arxiv_id=arxiv_id))
+
+    def _prefetch(self, arxiv_entries):
+        """批量预取可合并查询的数据源
+
+        每个数据源只预取解析策略一定会查询到它的条目（见 _reachable_sources），
+        批量请求计入数据源调用次数。
+        """
+        reachable = {source: [] for source in self.apis}
+        for entry in arxiv_entries:
+            for source in self._reachable_sources(entry):
+                reachable[source].append(entry)
+        requests_before = self._batch_requests()
+
+        crossref = self.apis.get('crossref')
+        entries = reachable.get('crossref', [])
+        if crossref and entries:
+            dois = [entry['doi'] for entry in entries if entry.get('doi')]
+            threshold = int(self.config.get('sources', {}).get('crossref', {}).get('batch_threshold', 10))
+            if dois and len(dois) >= threshold:
+                print(f"{Fore.GREEN}[信息] 批量解析 {len(dois)} 个 DOI (Crossref){Style.RESET_ALL}")
+                crossref.resolve_dois(dois)
+
+        semantic = self.apis.get('semantic-scholar')
+        entries = reachable.get('semantic-scholar', [])
+        if semantic and entries:
+            # search_paper 优先按 arXiv ID 查询，无 arXiv ID 时才使用 DOI
+            arxiv_ids = [arxiv_id for arxiv_id in map(self._extract_arxiv_id, entries) if arxiv_id]
+            dois = [entry['doi'] for entry in entries
+                    if entry.get('doi') and not self._extract_arxiv_id(entry)]
+            if len(arxiv_ids) + len(dois) > 1:
+                print(f"{Fore.GREEN}[信息] 批量查询 {len(arxiv_ids) + len(dois)} 篇论文 (Semantic Scholar){Style.RESET_ALL}")
+                semantic.fetch_batch(arxiv_ids=arxiv_ids, dois=dois)
+
+        arxiv = self.apis.get('arxiv')
+        entries = reachable.get('arxiv', [])
+        if arxiv and entries:
+            arxiv_ids = [arxiv_id for arxiv_id in map(self._extract_arxiv_id, entries) if arxiv_id]
+            if len(arxiv_ids) > 1:
+                print(f"{Fore.GREEN}[信息] 批量查询 {len(arxiv_ids)} 个 arXiv ID{Style.RESET_ALL}")
+                arxiv.fetch_by_ids(arxiv_ids)
+
+        pubmed = self.apis.get('pubmed')
+        entries = reachable.get('pubmed', [])
+        if pubmed and entries:
+            titles = [entry.get('title', '').replace('{', '').replace('}', '') for entry in entries]
+            titles = [title for title in titles if title.strip()]
+            if len(titles) > 1:
+                print(f"{Fore.GREEN}[信息] 批量检索 {len(titles)} 个标题 (PubMed){Style.RESET_ALL}")
+                pubmed.search_titles(titles)
+
+        self._record_calls(self._batch_requests() - requests_before, 0)
+
+    def _reachable_sources(self, entry):
+        """条目一定会查询的数据源：并行模式为全部，顺序模式为解析策略满足前必然查询的前几个"""
+        title, arxiv_id, doi = self._entry_query(entry)
+        sources = [source for source in self.priority if source in self.apis]
+        if self.scheduler is not None:
+            sources = self.scheduler.preview(sources, query_kind(title, arxiv_id, doi))
+        if self.fanout == 'parallel':
+            return sources
+        return self.policy.reach(sources)
+
+    def _batch_requests(self):
+        return sum(getattr(api, 'batch_requests', 0) for api in self.apis.values())
+
+    def _open_source_pools(self):
+        """并行模式下每个数据源使用独立的有界线程池"""
+        if self.fanout != 'parallel':
+            return
+        self._source_pools = {
+            source: ThreadPoolExecutor(max_workers=self._source_workers(source),
+                                       thread_name_prefix=f"bib-check-{source}")
+            for source in self.apis
+        }
+
+    def _close_source_pools(self):
+        for pool in self._source_pools.values():
+            pool.shutdown(wait=True)
+        self._source_pools = {}
+
+    def _finish_run(self, updated_count):
+        """输出统计并写入报告"""
+        print(f"{Fore.GREEN}[成功] 成功更新 {updated_count} 个条目{Style.RESET_ALL}")
+        if self.stale_served:
+            print(f"{Fore.GREEN}[信息] 返回 {self.stale_served} 个过期缓存结果，已在后台刷新"
+                  f"（{self.revalidator.pending()} 个仍在进行）{Style.RESET_ALL}")
+        if self.policy.name != 'all':
+            print(f"{Fore.GREEN}[信息] 解析策略 {self.policy}: 实际查询 {self.source_calls} 次，"
+                  f"节省 {self.source_calls_saved} 次数据源调用{Style.RESET_ALL}")
+        self.report.set_performance('resolution', {
+            'policy': str(self.policy),
+            'source_calls': self.source_calls,
+            'source_calls_saved': self.source_calls_saved,
+            'identity_hits': self.identity.hits,
+            'stale_served': self.stale_served,
+            'coalesced': self.coalesced
+        })
+        self.report.set_performance('rate_limit', limiter_metrics(list(self.apis)))
+        self.report.set_performance('circuit_breaker', breaker_metrics(list(self.apis)))
+        if self.scheduler is not None:
+            self.scheduler.save()
+            self.report.set_performance('scheduler', self.scheduler.metrics())
+        if self.config.get('hedging', {}).get('enabled', False):
+            self.report.set_performance('hedging', hedge_metrics(list(self.apis)))
+        if self.adaptive and not self.offline:
+            self.report.set_performance('concurrency', aimd_metrics(list(self.apis)))
     
     def _find_arxiv_entries(self, bib_database):
         """查找 arXiv-only 条目"""
@@ -103,30 +364,36 @@ class AutoUpdater:
         return False
     
     def _update_entry(self, entry):
-        """更新单个条目"""
+        """更新单个条目（记录因熔断跳过的数据源；离线模式下记录快照未覆盖的条目）"""
+        with CircuitBreaker.track() as skipped:
+            if not self.offline:
+                updated = self._resolve_entry(entry)
+            else:
+                with OfflineSession.track() as blocked:
+                    updated = self._resolve_entry(entry)
+                if blocked:
+                    self.report.add_snapshot_miss(entry.get('ID', 'unknown'), 'auto-update', blocked)
+        if skipped:
+            self.report.add_source_skip(entry.get('ID', 'unknown'), sorted(skipped))
+        return updated
+
+    def _resolve_entry(self, entry):
+        """查询数据源并更新条目"""
         # 提取信息
-        title = entry.get('title', '').replace('{', '').replace('}', '')
-        arxiv_id = self._extract_arxiv_id(entry)
-        doi_hint = entry.get('doi', '')
-        
-        # 查询所有来源，优先用 DBLP 的 BibTeX
-        results = {}
-        for source in self.priority:
-            api = self.apis.get(source)
-            if api:
-                result = api.search_paper(title=title, arxiv_id=arxiv_id, doi=doi_hint)
-                if result:
-                    results[source] = result
-        if not doi_hint:
-            doi_hint = results.get('semantic-scholar', {}).get('doi', '') or results.get('crossref', {}).get('doi', '')
+        title, arxiv_id, doi_hint = self._entry_query(entry)
 
-        # 若 DBLP 未命中，尝试用 DOI 再查一次
-        if 'dblp' not in results and doi_hint:
-            dblp_api = self.apis.get('dblp')
-            if dblp_api:
-                dblp_result = dblp_api.search_paper(doi=doi_hint)
-                if dblp_result:
-                    results['dblp'] = dblp_result
+        planned = self.resolved.get(self._plan_key(entry))
+        if planned is not None:
+            results = dict(planned['results'])
+            # 回放规划查询时的熔断跳过与离线拦截，由 _update_entry 记录到本条目
+            skipped = CircuitBreaker.current_scope()
+            if skipped is not None:
+                skipped.update(planned['skipped'])
+            blocked = OfflineSession.current_scope()
+            if blocked is not None:
+                blocked.extend(planned['blocked'])
+        else:
+            results = self._query_sources(title, arxiv_id, doi_hint)
         
         if not results:
             self.report.add_update_miss(
@@ -136,9 +403,11 @@ class AutoUpdater:
             )
             return False
 
-        preferred_result = results.get('dblp') or results.get('semantic-scholar') or next(iter(results.values()))
-        if 'dblp' in results and results['dblp'].get('bibtex'):
-            preferred_result = results['dblp']
+        preferred_source = next(
+            (source for source in ('dblp', 'semantic-scholar') if source in results),
+            next(iter(results))
+        )
+        preferred_result = results[preferred_source]
 
         self.report.add_update_candidate(
             entry.get('ID', 'unknown'),
@@ -151,11 +420,17 @@ class AutoUpdater:
                 'dblp': results.get('dblp', {}).get('url', '')
             },
             list(results.keys()),
-            arxiv_id or ''
+            arxiv_id or '',
+            bibtex_source=preferred_source if has_bibtex(preferred_result) else ''
         )
 
+        # BibTeX 延迟获取；dry-run 不下载 BibTeX，实际运行会用其整体替换条目，
+        # 因此只记录候选，不走字段级回退（否则预览的改动与实际不符）
+        if self.dry_run and has_bibtex(preferred_result):
+            return True
+
         # 若获取到 BibTeX，优先用其完全替换条目（保留原 ID）
-        bibtex = preferred_result.get('bibtex', '')
+        bibtex = self._fetch_bibtex(preferred_source, preferred_result)
         if bibtex:
             parser = BibParser()
             return self._replace_with_bibtex(entry, parser, bibtex)
@@ -216,6 +491,147 @@ class AutoUpdater:
         
         return True
 
+    def _query_sources(self, title, arxiv_id, doi_hint):
+        """按优先级查询数据源，满足解析策略后停止"""
+        sources = [source for source in self.priority if source in self.apis]
+        if self.scheduler is not None:
+            sources = self.scheduler.order(sources, query_kind(title, arxiv_id, doi_hint))
+        if self._source_pools:
+            results, calls, saved = self._fan_out_parallel(sources, title, arxiv_id, doi_hint)
+        else:
+            results, calls, saved = self._fan_out_sequential(sources, title, arxiv_id, doi_hint)
+        if self.policy.is_satisfied(results):
+            self._record_calls(calls, saved)
+            return results
+
+        if not doi_hint:
+            doi_hint = results.get('semantic-scholar', {}).get('doi', '') or results.get('crossref', {}).get('doi', '')
+
+        # 若 DBLP 未命中，尝试用 DOI 再查一次
+        if 'dblp' not in results and doi_hint:
+            dblp_api = self.apis.get('dblp')
+            if dblp_api:
+                dblp_result = self._search_source('dblp', None, None, doi_hint)
+                calls += 1
+                if dblp_result:
+                    results['dblp'] = dblp_result
+        self._record_calls(calls, saved)
+        return results
+
+    def _fan_out_sequential(self, sources, title, arxiv_id, doi_hint):
+        """依次查询数据源"""
+        results = {}
+        for index, source in enumerate(sources):
+            result = self._search_source(source, title, arxiv_id, doi_hint)
+            if result:
+                results[source] = result
+            if self.policy.is_satisfied(results):
+                return results, index + 1, len(sources) - index - 1
+        return results, len(sources), 0
+
+    def _fan_out_parallel(self, sources, title, arxiv_id, doi_hint):
+        """同时向所有数据源提交查询，满足策略后取消尚未开始的请求"""
+        scope = CircuitBreaker.current_scope()
+        futures = {
+            self._source_pools[source].submit(
+                self._search_in_scope, scope, source, title, arxiv_id, doi_hint
+            ): source
+            for source in sources
+        }
+        results = {}
+        pending = set(futures)
+        saved = 0
+        for future in as_completed(futures):
+            pending.discard(future)
+            result = future.result()
+            if result:
+                results[futures[future]] = result
+            if self.policy.is_satisfied(results):
+                saved = sum(1 for f in pending if f.cancel())
+                break
+
+        # 按优先级排序，保证合并结果与顺序模式一致
+        ordered = {source: results[source] for source in sources if source in results}
+        return ordered, len(sources) - saved, saved
+
+    def _search_source(self, source, title, arxiv_id, doi_hint):
+        """查询单个数据源，先经身份索引复用其他标识已解析的结果"""
+        keys = identity_keys(title=title, doi=doi_hint, arxiv_id=arxiv_id)
+        with track_stale() as stale:
+            result = self.identity.lookup(source, keys)
+            if result is MISSING:
+                # 其他线程正在查询同一论文时等待其结果，不重复请求
+                result, shared = self.flight.do(('search', source, *keys), self._lookup_source,
+                                                source, keys, title, arxiv_id, doi_hint)
+                if shared:
+                    self._count_coalesced()
+        if stale and self.revalidator is not None:
+            with self._stats_lock:
+                self.stale_served += 1
+            self.revalidator.submit((source, title, arxiv_id, doi_hint), self._refresh_source,
+                                    source, title, arxiv_id, doi_hint)
+        return result
+
+    def _search_in_scope(self, scope, source, title, arxiv_id, doi_hint):
+        """在数据源线程池中查询，熔断跳过记录到条目线程的作用域"""
+        with CircuitBreaker.track(scope):
+            return self._search_source(source, title, arxiv_id, doi_hint)
+
+    def _lookup_source(self, source, keys, title, arxiv_id, doi_hint):
+        """查询数据源并登记到身份索引（熔断期间直接跳过）"""
+        breaker = self.breakers.get(source)
+        if breaker is not None and breaker.is_open():
+            breaker.skip()
+            return None
+        start = time.monotonic()
+        with TrackedSession.track() as outcomes:
+            result = self.apis[source].search_paper(title=title, arxiv_id=arxiv_id, doi=doi_hint)
+        # 只统计经网络请求得到的结果（缓存命中不计）；最后一个请求失败时不算作"未找到"
+        if self.scheduler is not None and outcomes:
+            self.scheduler.record(source, query_kind(title, arxiv_id, doi_hint), result,
+                                  time.monotonic() - start, failed=outcomes[-1])
+        self.identity.record(source, keys, result)
+        return result
+
+    def _count_coalesced(self):
+        with self._stats_lock:
+            self.coalesced += 1
+
+    def _refresh_source(self, source, title, arxiv_id, doi_hint):
+        """后台刷新过期的数据源结果（在 bypass_cache() 中执行）"""
+        keys = identity_keys(title=title, doi=doi_hint, arxiv_id=arxiv_id)
+        result = self.apis[source].search_paper(title=title, arxiv_id=arxiv_id, doi=doi_hint)
+        self.identity.record(source, keys, result)
+
+    def _source_workers(self, source):
+        """根据 sources.<name>.rate_limit 计算该数据源的并发上限（自适应并发时由 AIMD 上限控制）"""
+        if self.adaptive:
+            return self.max_workers
+        source_config = self.config.get('sources', {}).get(source.replace('-', '_'), {})
+        if source_config.get('max_workers'):
+            return max(1, int(source_config['max_workers']))
+        rate_limit = source_config.get('rate_limit') or 60
+        return max(1, min(self.max_workers or 1, math.ceil(rate_limit / 60)))
+
+    def _record_calls(self, calls, saved):
+        """累计数据源调用次数"""
+        with self._stats_lock:
+            self.source_calls += calls
+            self.source_calls_saved += saved
+
+    def _fetch_bibtex(self, source, result):
+        """按需获取首选结果的 BibTeX"""
+        api = self.apis.get(source)
+        if api is not None and hasattr(api, 'fetch_bibtex'):
+            paper = result.get('url') or result.get('doi') or result.get('title')
+            if not paper:
+                return api.fetch_bibtex(result)
+            bibtex, shared = self.flight.do(('bibtex', source, paper), api.fetch_bibtex, result)
+            if shared:
+                self._count_coalesced()
+            return bibtex
+        return result.get('bibtex', '')
+
     def _replace_with_bibtex(self, entry, parser, bibtex):
         """使用 API 返回的 BibTeX 完整替换条目内容"""
         parsed_db = parser.parse_string(bibtex)
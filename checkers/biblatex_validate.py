@@ -5,14 +5,21 @@ import datetime
 from colorama import Fore, Style
 from tqdm import tqdm
 
+from sources.aio import is_offline
+from sources.crossref import CrossrefAPI
+from utils.cache import create_cache
+from utils.identity import normalize_doi
+
 
 class BibLaTeXValidator:
     """BibLaTeX 校验器"""
     
-    def __init__(self, config, report):
+    def __init__(self, config, report, cache=None):
         """初始化"""
         self.config = config
         self.report = report
+        self.cache = cache
+        self.offline = is_offline(config)
         self.validation_config = config.get('validation', {})
         
         # 必需字段定义
@@ -31,6 +38,7 @@ class BibLaTeXValidator:
         self.check_unique_ids = self.validation_config.get('check_unique_ids', True)
         self.check_type_consistency = self.validation_config.get('check_type_consistency', True)
         self.check_doi_format = self.validation_config.get('check_doi_format', True)
+        self.check_doi_exists = self.validation_config.get('check_doi_exists', False)
         self.check_isbn_issn_format = self.validation_config.get('check_isbn_issn_format', True)
         self.check_year_range = self.validation_config.get('check_year_range', True)
         self.check_pages_format = self.validation_config.get('check_pages_format', True)
@@ -45,6 +53,9 @@ class BibLaTeXValidator:
         
         # 已见过的 ID 集合
         self.seen_ids = set()
+
+        # DOI 批量解析结果（check_doi_exists）
+        self.doi_lookup = {}
     
     def _default_required_fields(self):
         """默认必需字段定义"""
@@ -99,6 +110,10 @@ class BibLaTeXValidator:
         
         # 重置 ID 集合
         self.seen_ids.clear()
+
+        # 批量解析 DOI，避免逐条请求
+        if self.check_doi_exists:
+            self.doi_lookup = self._resolve_dois(entries_to_check)
         
         # 遍历检查
         for entry in tqdm(entries_to_check, desc="校验条目", unit="条目"):
@@ -120,6 +135,13 @@ class BibLaTeXValidator:
         
         return bib_database
     
+    def validate_batch(self, entries):
+        """流式模式：校验一批条目，重复 ID 检测跨批次保留"""
+        if self.check_doi_exists:
+            self.doi_lookup = self._resolve_dois(entries)
+        for entry in entries:
+            self._validate_entry(entry)
+
     def _validate_entry(self, entry):
         """校验单个条目"""
         entry_id = entry.get('ID', 'unknown')
@@ -156,6 +178,10 @@ class BibLaTeXValidator:
         if self.check_doi_format and 'doi' in entry:
             self._check_doi_format(entry, entry_id)
 
+        # 6.1 DOI 是否可在 Crossref 解析
+        if self.check_doi_exists and 'doi' in entry:
+            self._check_doi_exists(entry, entry_id)
+
         # 7. ISBN/ISSN 格式检查
         if self.check_isbn_issn_format:
             self._check_isbn_issn(entry, entry_id)
@@ -292,6 +318,37 @@ class BibLaTeXValidator:
                 f"DOI 格式可能不正确: '{entry.get('doi', '')}'"
             )
 
+    def _normalize_doi(self, doi):
+        return normalize_doi(doi)
+
+    def _resolve_dois(self, entries):
+        """通过 Crossref 批量接口解析条目中的 DOI"""
+        dois = []
+        for entry in entries:
+            doi = self._normalize_doi(entry.get('doi', ''))
+            if doi and self.doi_pattern.match(doi):
+                dois.append(doi)
+        if not dois:
+            return {}
+        print(f"{Fore.GREEN}[信息] 批量解析 {len(dois)} 个 DOI (Crossref){Style.RESET_ALL}")
+        cache = self.cache if self.cache is not None else create_cache(self.config.get('cache', {}))
+        crossref = CrossrefAPI(self.config, cache=cache)
+        return crossref.resolve_dois(dois)
+
+    def _check_doi_exists(self, entry, entry_id):
+        """检查 DOI 是否能在 Crossref 中解析（请求失败的 DOI 不报告）"""
+        doi = self._normalize_doi(entry.get('doi', ''))
+        if (self.offline and doi and ',' not in doi and doi not in self.doi_lookup
+                and self.doi_pattern.match(doi)):
+            self.report.add_snapshot_miss(entry_id, 'doi', [f"crossref:doi:{doi}"])
+            return
+        if doi in self.doi_lookup and self.doi_lookup[doi] is None:
+            self.report.add_validation_issue(
+                'doi_unresolved',
+                entry_id,
+                f"DOI 无法在 Crossref 中解析: '{entry.get('doi', '')}'"
+            )
+
     def _check_isbn_issn(self, entry, entry_id):
         """检查 ISBN/ISSN 格式"""
         isbn = entry.get('isbn', '')
@@ -1,17 +1,23 @@
 """检查链接可用性"""
 
+import threading
+from itertools import zip_longest
+
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from colorama import Fore, Style
 from tqdm import tqdm
 
-from utils.cache import FileCache
+from sources.aio import create_session, is_offline
+from utils.aimd import AdaptiveSession, adaptive_enabled, aimd_metrics, get_aimd, link_host, max_concurrency
+from utils.cache import create_cache
+from utils.singleflight import get_flight
 
 
 class LinkChecker:
     """链接检查器"""
     
-    def __init__(self, config, report):
+    def __init__(self, config, report, cache=None):
         """初始化"""
         self.config = config
         self.report = report
@@ -20,27 +26,25 @@ class LinkChecker:
         self.retry = self.link_config.get('retry', 2)
         self.user_agent = self.link_config.get('user_agent', 
                                                'Mozilla/5.0 (Windows NT 10.0; Win64; x64)')
-        self.session = requests.Session()
+        self.session = create_session(config)
         self.session.headers.update({'User-Agent': self.user_agent})
-        self.max_workers = config.get('concurrency', {}).get('max_workers', 4)
-        self.cache = FileCache(config.get('cache', {}))
+        # 自适应并发：每个链接主机独立的 AIMD 上限，线程数取 adaptive.max_limit
+        self.adaptive = adaptive_enabled(config) and not is_offline(config)
+        if self.adaptive:
+            self.session = AdaptiveSession(self.session, lambda url: get_aimd(link_host(url), config))
+        self.max_workers = max_concurrency(config)
+        self.cache = cache if cache is not None else create_cache(config.get('cache', {}))
+        self.flight = get_flight()
+        self._stats_lock = threading.Lock()
+        self.coalesced = 0
+        self.checked = 0
     
     def check_entries(self, bib_database):
         """检查条目"""
         print(f"{Fore.GREEN}[信息] 开始检查链接可用性{Style.RESET_ALL}")
         
         # 收集所有链接
-        links_to_check = []
-        for entry in bib_database.entries:
-            entry_id = entry.get('ID', 'unknown')
-            
-            # 检查 url 字段
-            if 'url' in entry:
-                links_to_check.append((entry_id, 'url', entry['url']))
-            
-            # 检查 pdf 字段
-            if 'pdf' in entry:
-                links_to_check.append((entry_id, 'pdf', entry['pdf']))
+        links_to_check = self.collect_links(bib_database.entries)
         
         if not links_to_check:
             print(f"{Fore.YELLOW}[信息] 没有找到需要检查的链接{Style.RESET_ALL}")
@@ -49,17 +53,7 @@ class LinkChecker:
         print(f"{Fore.GREEN}[信息] 找到 {len(links_to_check)} 个链接需要检查{Style.RESET_ALL}")
         
         # 遍历检查
-        if self.max_workers and self.max_workers > 1:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = [
-                    executor.submit(self._check_link, entry_id, field, url)
-                    for entry_id, field, url in links_to_check
-                ]
-                for _ in tqdm(as_completed(futures), total=len(futures), desc="检查链接", unit="链接"):
-                    pass
-        else:
-            for entry_id, field, url in tqdm(links_to_check, desc="检查链接", unit="链接"):
-                self._check_link(entry_id, field, url)
+        self.check_links(links_to_check)
         
         dead_count = len(self.report.dead_links)
         if dead_count > 0:
@@ -69,18 +63,68 @@ class LinkChecker:
         
         return bib_database
     
+    def collect_links(self, entries):
+        """收集条目中的 url / pdf 链接，返回 (条目 ID, 字段, 链接) 列表"""
+        links = []
+        for entry in entries:
+            entry_id = entry.get('ID', 'unknown')
+            for field in ('url', 'pdf'):
+                if field in entry:
+                    links.append((entry_id, field, entry[field]))
+        return links
+
+    def check_links(self, links, progress=True):
+        """检查一组链接（流式模式按批调用，不显示进度条）"""
+        if self.max_workers and self.max_workers > 1:
+            if self.adaptive:
+                links = self._interleave_hosts(links)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._check_link, entry_id, field, url)
+                    for entry_id, field, url in links
+                ]
+                for _ in tqdm(as_completed(futures), total=len(futures), desc="检查链接", unit="链接",
+                              disable=not progress):
+                    pass
+        else:
+            for entry_id, field, url in tqdm(links, desc="检查链接", unit="链接", disable=not progress):
+                self._check_link(entry_id, field, url)
+        self.checked += len(links)
+        self.report.set_performance('link_check', {'links': self.checked, 'coalesced': self.coalesced})
+        if self.adaptive:
+            self.report.set_performance('link_concurrency', {
+                name[len('link:'):]: metrics for name, metrics in aimd_metrics(prefix='link:').items()
+            })
+
+    def _interleave_hosts(self, links):
+        """按主机轮流排列链接，避免同一主机的链接占满线程池而阻塞其他主机"""
+        by_host = {}
+        for link in links:
+            by_host.setdefault(link_host(link[2] or ''), []).append(link)
+        return [link for group in zip_longest(*by_host.values()) for link in group if link is not None]
+
     def _check_link(self, entry_id, field, url):
         """检查单个链接"""
         if not url or not url.startswith('http'):
             self.report.add_dead_link(entry_id, field, url, '无效的 URL 格式')
             return
 
+        # 多个条目引用同一链接时并发的检查合并为一次请求，各条目分别记录结果
+        status, shared = self.flight.do(('link', url), self._link_status, url)
+        if shared:
+            with self._stats_lock:
+                self.coalesced += 1
+
+        # 如果仍然失败，记录
+        if status != 'OK':
+            self.report.add_dead_link(entry_id, field, url, status)
+
+    def _link_status(self, url):
+        """检查链接状态（优先读取缓存）"""
         cache_key = f"link:{url}"
         cached_status = self.cache.get(cache_key)
         if cached_status is not None:
-            if cached_status != 'OK':
-                self.report.add_dead_link(entry_id, field, url, cached_status)
-            return
+            return cached_status
         
         # 尝试 HEAD 请求
         status = self._try_request(url, 'HEAD')
@@ -88,12 +132,9 @@ class LinkChecker:
         # 如果 HEAD 失败，尝试 GET
         if status != 'OK':
             status = self._try_request(url, 'GET')
-        
-        # 如果仍然失败，记录
-        if status != 'OK':
-            self.report.add_dead_link(entry_id, field, url, status)
 
         self.cache.set(cache_key, status)
+        return status
     
     def _try_request(self, url, method='HEAD'):
         """尝试请求"""
@@ -0,0 +1,320 @@
+"""asyncio HTTP 后端（基于 aiohttp，可选依赖）
+
+所有数据源共享一个后台事件循环和一个 aiohttp ClientSession，
+连接按主机复用（HTTP/1.1 keep-alive）并按主机限制连接数。
+AsyncSession 提供与 requests.Session 相同的 get/head/post 接口，
+数据源适配器无需改动解析与重试逻辑即可切换后端。
+"""
+
+import asyncio
+import atexit
+import json
+import threading
+from contextlib import contextmanager
+
+import requests
+
+from utils.aimd import AdaptiveSession, get_aimd
+from utils.circuit_breaker import get_breaker
+from utils.hedging import HedgedSession, get_window
+from utils.rate_limit import get_limiter
+
+
+class AsyncResponse:
+    """与 requests.Response 兼容的最小响应对象"""
+
+    def __init__(self, status_code, text, headers, url):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+        self.url = url
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncHTTPClient:
+    """在后台线程运行的事件循环 + 连接池"""
+
+    def __init__(self, pool_size=100, pool_per_host=8, keepalive_timeout=30):
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        self.pool_size = pool_size
+        self.pool_per_host = pool_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='bib-check-aio', daemon=True)
+        self._thread.start()
+        self._session = asyncio.run_coroutine_threadsafe(self._create_session(), self.loop).result()
+
+    async def _create_session(self):
+        connector = self._aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_per_host,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        return self._aiohttp.ClientSession(connector=connector)
+
+    async def request(self, method, url, params=None, headers=None, timeout=None,
+                      allow_redirects=True, json_body=None):
+        """发送请求（协程），异常映射为 requests 的异常类型"""
+        if params:
+            params = {key: str(value) for key, value in params.items()}
+        client_timeout = self._aiohttp.ClientTimeout(total=timeout) if timeout else None
+        try:
+            async with self._session.request(method, url, params=params, headers=headers,
+                                             timeout=client_timeout, allow_redirects=allow_redirects,
+                                             json=json_body) as response:
+                text = await response.text(errors='replace')
+                return AsyncResponse(response.status, text, dict(response.headers), str(response.url))
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.Timeout(str(e) or 'timeout') from e
+        except self._aiohttp.ClientConnectionError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def run(self, coroutine):
+        """在后台事件循环上执行协程并阻塞等待结果"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        try:
+            self.run(self._session.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            self.loop.close()
+
+
+class AsyncSession:
+    """requests.Session 风格的同步外观，请求在共享事件循环上执行"""
+
+    def __init__(self, client):
+        self.client = client
+        self.headers = {}
+
+    def request(self, method, url, params=None, timeout=None, allow_redirects=True, json=None, headers=None):
+        merged = dict(self.headers)
+        if headers:
+            merged.update(headers)
+        return self.client.run(self.client.request(
+            method, url, params=params, headers=merged, timeout=timeout,
+            allow_redirects=allow_redirects, json_body=json
+        ))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+class OfflineSession:
+    """离线模式会话：不发出任何请求，统一返回 503 并记录被拦截的 URL
+
+    track() 在当前线程内收集被拦截的请求，用于判断某个条目是否未被快照覆盖。
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self.headers = {}
+
+    def request(self, method, url, params=None, **kwargs):
+        scope = getattr(OfflineSession._local, 'scope', None)
+        if scope is not None:
+            scope.append(url)
+        return AsyncResponse(503, '', {}, url)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    @classmethod
+    @contextmanager
+    def track(cls):
+        """收集当前线程在 with 块内被拦截的请求 URL"""
+        previous = getattr(cls._local, 'scope', None)
+        scope = []
+        cls._local.scope = scope
+        try:
+            yield scope
+        finally:
+            cls._local.scope = previous
+            if previous is not None:
+                previous.extend(scope)
+
+    @classmethod
+    def current_scope(cls):
+        return getattr(cls._local, 'scope', None)
+
+
+class BreakerSession:
+    """经熔断器转发请求的会话包装
+
+    熔断器打开时不发出请求，直接返回 503（适配器按普通失败处理，不再重试）；
+    连接异常、超时与 5xx 计为失败，其余响应（含 404）计为成功；429 由限速器处理，
+    但探测请求收到 429 时重新打开熔断器。
+    """
+
+    def __init__(self, session, breaker):
+        self.session = session
+        self.breaker = breaker
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def request(self, method, url, **kwargs):
+        if not self.breaker.allow():
+            return AsyncResponse(503, '', {}, url)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        elif response.status_code == 429:
+            self.breaker.record_throttled()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+class TrackedSession:
+    """记录数据源请求结果的会话包装（最外层）
+
+    track() 在当前线程内收集每个请求是否失败：连接异常、超时、429、5xx
+    （含熔断器打开时返回的 503）为失败，其余响应（含 404）为成功。
+    用于区分"数据源确认未找到"与"请求失败"，以及结果是否来自网络请求。
+    """
+
+    _local = threading.local()
+
+    def __init__(self, session):
+        self.session = session
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def request(self, method, url, **kwargs):
+        scope = getattr(TrackedSession._local, 'scope', None)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            if scope is not None:
+                scope.append(True)
+            raise
+        if scope is not None:
+            scope.append(response.status_code == 429 or response.status_code >= 500)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    @classmethod
+    @contextmanager
+    def track(cls):
+        """收集当前线程在 with 块内发出的请求是否失败（True 为失败）"""
+        previous = getattr(cls._local, 'scope', None)
+        scope = []
+        cls._local.scope = scope
+        try:
+            yield scope
+        finally:
+            cls._local.scope = previous
+            if previous is not None:
+                previous.extend(scope)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(config):
+    """获取共享的 AsyncHTTPClient，未安装 aiohttp 时返回 None"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            concurrency = config.get('concurrency', {})
+            try:
+                _client = AsyncHTTPClient(
+                    pool_size=concurrency.get('pool_size', 100),
+                    pool_per_host=concurrency.get('pool_per_host', 8)
+                )
+            except ImportError:
+                return None
+            atexit.register(_client.close)
+        return _client
+
+
+def use_asyncio(config):
+    """配置是否选择了 asyncio 后端"""
+    return config.get('concurrency', {}).get('backend', 'threads') == 'asyncio'
+
+
+def is_offline(config):
+    """是否处于离线快照模式（cache.offline）"""
+    return bool(config.get('cache', {}).get('offline'))
+
+
+def create_session(config, source=None):
+    """按 concurrency.backend 创建 HTTP 会话；离线模式下返回不联网的 OfflineSession
+
+    指定 source 时按配置依次包装对冲（hedging）、自适应并发（concurrency.adaptive）
+    与熔断器（circuit_breaker），熔断判断在调用线程中进行，一次对冲请求只计一次成功或失败，
+    熔断跳过的请求不占用并发名额；最外层的 TrackedSession 记录请求成败（自适应调度使用）。
+    """
+    if is_offline(config):
+        return OfflineSession()
+    session = None
+    if use_asyncio(config):
+        client = get_client(config)
+        if client is not None:
+            session = AsyncSession(client)
+    if session is None:
+        session = requests.Session()
+    hedging = config.get('hedging', {})
+    if source and hedging.get('enabled', False):
+        source_config = config.get('sources', {}).get(source.replace('-', '_'), {})
+        limiter = get_limiter(source, source_config.get('rate_limit', 60), source_config.get('burst', 1))
+        session = HedgedSession(
+            session, get_window(source), limiter,
+            percentile=hedging.get('percentile', 95),
+            min_samples=hedging.get('min_samples', 20),
+            min_delay=hedging.get('min_delay', 0.05)
+        )
+    aimd = get_aimd(source, config) if source else None
+    if aimd is not None:
+        session = AdaptiveSession(session, lambda url: aimd)
+    breaker = get_breaker(source, config) if source else None
+    if breaker is not None:
+        session = BreakerSession(session, breaker)
+    return TrackedSession(session) if source else session
@@ -1,22 +1,37 @@
 """arXiv API 适配器"""
 
+import re
+import threading
 import time
-import requests
 import xml.etree.ElementTree as ET
 
+from sources.aio import create_session
+from utils.cache import MISSING
+from utils.identity import normalize_arxiv_id, normalize_title
+from utils.rate_limit import get_limiter
+
 
 class ArxivAPI:
     """arXiv API 客户端"""
 
+    NS = {
+        'atom': 'http://www.w3.org/2005/Atom',
+        'arxiv': 'http://arxiv.org/schemas/atom'
+    }
+
     def __init__(self, config, cache=None):
         self.config = config.get('sources', {}).get('arxiv', {})
         self.base_url = self.config.get('base_url', 'http://export.arxiv.org/api/query')
         self.timeout = self.config.get('timeout', 10)
         self.retry = self.config.get('retry', 3)
         self.rate_limit = self.config.get('rate_limit', 30)
+        self.batch_size = int(self.config.get('batch_size', 100))
         self.cache = cache
-        self.session = requests.Session()
-        self._last_request_ts = 0.0
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self.batch_requests = 0  # 批量接口的请求次数（计入数据源调用统计）
+        self.session = create_session(config, 'arxiv')
+        self.limiter = get_limiter('arxiv', self.rate_limit, self.config.get('burst', 1))
 
     def search_paper(self, title=None, arxiv_id=None, doi=None):
         if arxiv_id:
@@ -27,43 +42,92 @@ class ArxivAPI:
 
     def _search_by_arxiv_id(self, arxiv_id):
         arxiv_id = arxiv_id.replace('arXiv:', '').strip()
-        cache_key = f"arxiv:id:{arxiv_id}"
+        cache_key = f"arxiv:id:{normalize_arxiv_id(arxiv_id)}"
+        if cache_key in self._prefetched:
+            return self._prefetched[cache_key]
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         params = {
             'id_list': arxiv_id,
             'max_results': 1
         }
-        result = self._query(params)
-        self._set_cache(cache_key, result)
-        return result
+        return self._query(params, cache_key)
+
+    def fetch_by_ids(self, arxiv_ids):
+        """批量查询 arXiv ID，返回 {arxiv_id: result}
+
+        每次请求以逗号分隔的 id_list 查询 batch_size 个 ID，一次解析整个 Atom feed，
+        并为每个 ID 写入缓存。请求失败的 ID 不会出现在返回值中。
+        """
+        resolved = {}
+        pending = []
+        for arxiv_id in arxiv_ids:
+            arxiv_id = (arxiv_id or '').replace('arXiv:', '').strip()
+            if not arxiv_id or arxiv_id in resolved or arxiv_id in pending:
+                continue
+            cache_key = f"arxiv:id:{normalize_arxiv_id(arxiv_id)}"
+            if cache_key in self._prefetched:
+                resolved[arxiv_id] = self._prefetched[cache_key]
+                continue
+            cached = self._get_cache(cache_key)
+            if cached is not MISSING:
+                resolved[arxiv_id] = cached
+                continue
+            pending.append(arxiv_id)
+
+        batch_size = max(self.batch_size, 1)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            self.batch_requests += 1
+            feed = self._query_feed({
+                'id_list': ','.join(chunk),
+                'max_results': len(chunk)
+            })
+            if feed is None:
+                continue
+            for arxiv_id in chunk:
+                result = feed.get(self._strip_version(arxiv_id))
+                resolved[arxiv_id] = result
+                cache_key = f"arxiv:id:{normalize_arxiv_id(arxiv_id)}"
+                with self._prefetch_lock:
+                    self._prefetched[cache_key] = result
+                self._set_cache(cache_key, result)
+        return resolved
 
     def _search_by_title(self, title):
         query = title.strip().replace('"', '')
-        cache_key = f"arxiv:title:{query.lower()}"
+        cache_key = f"arxiv:title:{normalize_title(query)}"
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         params = {
             'search_query': f'ti:"{query}"',
             'max_results': 1
         }
-        result = self._query(params)
+        return self._query(params, cache_key)
+
+    def _query(self, params, cache_key):
+        feed = self._query_feed(params, first_only=True)
+        if feed is None:
+            # 请求失败不写入负缓存，下次运行重新查询
+            return None
+        result = next(iter(feed.values()), None)
         self._set_cache(cache_key, result)
         return result
 
-    def _query(self, params):
+    def _query_feed(self, params, first_only=False):
+        """请求 API 并解析 Atom feed，失败时返回 None"""
         for attempt in range(self.retry):
             try:
                 self._rate_limit()
                 response = self.session.get(self.base_url, params=params, timeout=self.timeout)
                 if response.status_code == 200:
-                    return self._parse_response(response.text)
+                    return self._parse_feed(response.text, first_only)
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return None
             except Exception as e:
@@ -73,17 +137,26 @@ class ArxivAPI:
                 time.sleep(1)
         return None
 
-    def _parse_response(self, xml_text):
+    def _parse_feed(self, xml_text, first_only=False):
+        """解析 Atom feed，返回 {不带版本号的 arXiv ID: result}"""
         try:
             root = ET.fromstring(xml_text)
-            ns = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
-            entry = root.find('atom:entry', ns)
-            if entry is None:
-                return None
+        except Exception as e:
+            print(f"arXiv 解析错误: {e}")
+            return None
+
+        feed = {}
+        for entry in root.findall('atom:entry', self.NS):
+            entry_id = entry.findtext('atom:id', default='', namespaces=self.NS) or ''
+            arxiv_id = self._strip_version(entry_id.split('/abs/')[-1].strip())
+            feed[arxiv_id] = self._parse_entry(entry)
+            if first_only:
+                break
+        return feed
 
+    def _parse_entry(self, entry):
+        try:
+            ns = self.NS
             title = (entry.findtext('atom:title', default='', namespaces=ns) or '').strip().replace('\n', ' ')
             published = entry.findtext('atom:published', default='', namespaces=ns)
             year = published[:4] if published else ''
@@ -125,19 +198,17 @@ class ArxivAPI:
             print(f"arXiv 解析错误: {e}")
             return None
 
+    def _strip_version(self, arxiv_id):
+        return re.sub(r'v\d+$', '', arxiv_id)
+
     def _rate_limit(self):
-        if not self.rate_limit:
-            return
-        min_interval = 60.0 / max(self.rate_limit, 1)
-        elapsed = time.time() - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        self.limiter.acquire()
 
     def _get_cache(self, key):
+        """读取缓存；未缓存时返回 MISSING（None 表示已缓存的"未找到"结果）"""
         if not self.cache:
-            return None
-        return self.cache.get(key)
+            return MISSING
+        return self.cache.get(key, MISSING)
 
     def _set_cache(self, key, value):
         if not self.cache:
@@ -1,7 +1,12 @@
 """Crossref API 适配器"""
 
+import threading
 import time
-import requests
+
+from sources.aio import create_session
+from utils.cache import MISSING
+from utils.identity import normalize_doi, normalize_title
+from utils.rate_limit import get_limiter
 
 
 class CrossrefAPI:
@@ -14,9 +19,13 @@ class CrossrefAPI:
         self.retry = self.config.get('retry', 3)
         self.rate_limit = self.config.get('rate_limit', 60)
         self.mailto = self.config.get('mailto', '')
+        self.batch_size = int(self.config.get('batch_size', 50))
         self.cache = cache
-        self.session = requests.Session()
-        self._last_request_ts = 0.0
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self.batch_requests = 0  # 批量接口的请求次数（计入数据源调用统计）
+        self.session = create_session(config, 'crossref')
+        self.limiter = get_limiter('crossref', self.rate_limit, self.config.get('burst', 1))
 
     def search_paper(self, title=None, doi=None, arxiv_id=None):
         if doi:
@@ -26,10 +35,12 @@ class CrossrefAPI:
         return None
 
     def _search_by_doi(self, doi):
-        doi = doi.strip().lower()
+        doi = normalize_doi(doi)
         cache_key = f"crossref:doi:{doi}"
+        if cache_key in self._prefetched:
+            return self._prefetched[cache_key]
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         url = f"{self.base_url}/works/{doi}"
@@ -42,15 +53,79 @@ class CrossrefAPI:
                 if response.status_code == 200:
                     data = response.json().get('message', {})
                     result = self._format_item(data)
-                    if result:
-                        result['bibtex'] = self._fetch_bibtex(doi)
                     self._set_cache(cache_key, result)
                     return result
                 if response.status_code == 404:
                     self._set_cache(cache_key, None)
                     return None
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
+                    continue
+                return None
+            except Exception as e:
+                if attempt == self.retry - 1:
+                    print(f"Crossref API 错误: {e}")
+                    return None
+                time.sleep(1)
+        return None
+
+    def resolve_dois(self, dois):
+        """批量解析 DOI，返回 {doi: result}
+
+        使用 /works?filter=doi:...,doi:... 每次请求解析 batch_size 个 DOI，
+        结果写入缓存供 search_paper 复用（BibTeX 延迟到 fetch_bibtex 时获取）。
+        请求失败的 DOI 不会出现在返回值中；确认不存在的 DOI 对应 None。
+        """
+        resolved = {}
+        pending = []
+        for doi in dois:
+            doi = normalize_doi(doi)
+            # 逗号会破坏 filter 语法，交给逐条查询
+            if not doi or ',' in doi or doi in resolved or doi in pending:
+                continue
+            cache_key = f"crossref:doi:{doi}"
+            if cache_key in self._prefetched:
+                resolved[doi] = self._prefetched[cache_key]
+                continue
+            cached = self._get_cache(cache_key)
+            if cached is not MISSING:
+                resolved[doi] = cached
+                continue
+            pending.append(doi)
+
+        for start in range(0, len(pending), max(self.batch_size, 1)):
+            chunk = pending[start:start + max(self.batch_size, 1)]
+            self.batch_requests += 1
+            items = self._fetch_by_filter(chunk)
+            if items is None:
+                continue
+            by_doi = {(item.get('DOI') or '').lower(): item for item in items}
+            for doi in chunk:
+                result = self._format_item(by_doi.get(doi))
+                resolved[doi] = result
+                cache_key = f"crossref:doi:{doi}"
+                with self._prefetch_lock:
+                    self._prefetched[cache_key] = result
+                self._set_cache(cache_key, result)
+        return resolved
+
+    def _fetch_by_filter(self, dois):
+        """一次请求获取多个 DOI 的元数据，失败时返回 None"""
+        url = f"{self.base_url}/works"
+        params = self._build_params()
+        params.update({
+            'filter': ','.join(f"doi:{doi}" for doi in dois),
+            'rows': len(dois)
+        })
+
+        for attempt in range(self.retry):
+            try:
+                self._rate_limit()
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code == 200:
+                    return response.json().get('message', {}).get('items', [])
+                if response.status_code == 429:
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return None
             except Exception as e:
@@ -62,9 +137,9 @@ class CrossrefAPI:
 
     def _search_by_title(self, title):
         query = title.strip()
-        cache_key = f"crossref:title:{query.lower()}"
+        cache_key = f"crossref:title:{normalize_title(query)}"
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         url = f"{self.base_url}/works"
@@ -84,13 +159,10 @@ class CrossrefAPI:
                         self._set_cache(cache_key, None)
                         return None
                     result = self._format_item(items[0])
-                    doi = result.get('doi', '') if result else ''
-                    if doi:
-                        result['bibtex'] = self._fetch_bibtex(doi)
                     self._set_cache(cache_key, result)
                     return result
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return None
             except Exception as e:
@@ -136,7 +208,8 @@ class CrossrefAPI:
             'number': item.get('issue', ''),
             'publication_type': publication_type,
             'is_published': True,
-            'bibtex': ''
+            'bibtex': '',
+            'bibtex_pending': bool(doi)
         }
 
         return result
@@ -155,6 +228,21 @@ class CrossrefAPI:
             return f"{family}, {given}"
         return family or given or ''
 
+    def fetch_bibtex(self, result):
+        """按需获取结果的 BibTeX（延迟加载，仅在需要替换条目时调用）"""
+        if not result or not result.get('bibtex_pending'):
+            return (result or {}).get('bibtex', '')
+        doi = result.get('doi', '')
+        cache_key = f"crossref:bibtex:{doi}"
+        bibtex = self._get_cache(cache_key)
+        if bibtex is MISSING:
+            bibtex = self._fetch_bibtex(doi)
+            if bibtex:
+                self._set_cache(cache_key, bibtex)
+        result['bibtex'] = bibtex
+        result['bibtex_pending'] = False
+        return bibtex
+
     def _fetch_bibtex(self, doi):
         if not doi:
             return ''
@@ -167,7 +255,7 @@ class CrossrefAPI:
                 if response.status_code == 200:
                     return response.text
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return ''
             except Exception:
@@ -177,18 +265,13 @@ class CrossrefAPI:
         return ''
 
     def _rate_limit(self):
-        if not self.rate_limit:
-            return
-        min_interval = 60.0 / max(self.rate_limit, 1)
-        elapsed = time.time() - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        self.limiter.acquire()
 
     def _get_cache(self, key):
+        """读取缓存；未缓存时返回 MISSING（None 表示已缓存的"未找到"结果）"""
         if not self.cache:
-            return None
-        return self.cache.get(key)
+            return MISSING
+        return self.cache.get(key, MISSING)
 
     def _set_cache(self, key, value):
         if not self.cache:
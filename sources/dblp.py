@@ -1,9 +1,13 @@
 """DBLP API 适配器"""
 
-import requests
 import time
 import xml.etree.ElementTree as ET
 
+from sources.aio import create_session
+from utils.cache import MISSING
+from utils.identity import normalize_arxiv_id, normalize_doi, normalize_title
+from utils.rate_limit import get_limiter
+
 
 class DBLPAPI:
     """DBLP API 客户端"""
@@ -16,26 +20,25 @@ class DBLPAPI:
         self.retry = self.config.get('retry', 3)
         self.rate_limit = self.config.get('rate_limit', 60)
         self.cache = cache
-        self.session = requests.Session()
-        self._last_request_ts = 0.0
+        self.session = create_session(config, 'dblp')
+        self.limiter = get_limiter('dblp', self.rate_limit, self.config.get('burst', 1))
     
     def search_paper(self, title=None, arxiv_id=None, doi=None):
         """搜索论文"""
         if doi:
-            return self._search(f"doi:{doi}")
+            return self._search(f"doi:{doi}", f"dblp:doi:{normalize_doi(doi)}")
         if arxiv_id:
             # DBLP 也索引了 arXiv 论文
             arxiv_id = arxiv_id.replace('arXiv:', '').strip()
-            return self._search(f"arxiv:{arxiv_id}")
+            return self._search(f"arxiv:{arxiv_id}", f"dblp:arxiv:{normalize_arxiv_id(arxiv_id)}")
         elif title:
-            return self._search(title)
+            return self._search(title, f"dblp:title:{normalize_title(title)}")
         return None
     
-    def _search(self, query):
+    def _search(self, query, cache_key):
         """执行搜索"""
-        cache_key = f"dblp:query:{query}"
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         params = {
@@ -51,10 +54,13 @@ class DBLPAPI:
                 
                 if response.status_code == 200:
                     result = self._parse_result(response.text)
+                    if result is MISSING:
+                        # 响应无法解析视为请求失败，不写入负缓存
+                        return None
                     self._set_cache(cache_key, result)
                     return result
                 elif response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 else:
                     return None
@@ -67,7 +73,7 @@ class DBLPAPI:
         return None
     
     def _parse_result(self, xml_text):
-        """解析 XML 结果"""
+        """解析 XML 结果；没有正式出版的结果时返回 None，XML 无法解析时返回 MISSING"""
         try:
             root = ET.fromstring(xml_text)
             
@@ -109,7 +115,6 @@ class DBLPAPI:
                 return None
             
             dblp_key = key.text if key is not None else ''
-            bibtex = self._fetch_bibtex(dblp_key) if dblp_key else ''
 
             dblp_url = url.text if url is not None else ''
             if not dblp_url and dblp_key:
@@ -127,14 +132,30 @@ class DBLPAPI:
                 'number': number.text if number is not None else '',
                 'publication_type': 'conference' if is_conference else 'journal',
                 'is_published': True,
-                'bibtex': bibtex,
+                'bibtex': '',
+                'bibtex_pending': bool(dblp_key),
                 'dblp_key': dblp_key
             }
             
             return result
         except Exception as e:
             print(f"DBLP XML 解析错误: {e}")
-            return None
+            return MISSING
+
+    def fetch_bibtex(self, result):
+        """按需获取结果的 BibTeX（延迟加载，仅在需要替换条目时调用）"""
+        if not result or not result.get('bibtex_pending'):
+            return (result or {}).get('bibtex', '')
+        dblp_key = result.get('dblp_key', '')
+        cache_key = f"dblp:bibtex:{dblp_key}"
+        bibtex = self._get_cache(cache_key)
+        if bibtex is MISSING:
+            bibtex = self._fetch_bibtex(dblp_key)
+            if bibtex:
+                self._set_cache(cache_key, bibtex)
+        result['bibtex'] = bibtex
+        result['bibtex_pending'] = False
+        return bibtex
 
     def _fetch_bibtex(self, dblp_key):
         """通过 DBLP key 获取 BibTeX"""
@@ -149,7 +170,7 @@ class DBLPAPI:
                 if response.status_code == 200:
                     return response.text
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return ''
             except Exception as e:
@@ -161,18 +182,13 @@ class DBLPAPI:
         return ''
 
     def _rate_limit(self):
-        if not self.rate_limit:
-            return
-        min_interval = 60.0 / max(self.rate_limit, 1)
-        elapsed = time.time() - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        self.limiter.acquire()
 
     def _get_cache(self, key):
+        """读取缓存；未缓存时返回 MISSING（None 表示已缓存的"未找到"结果）"""
         if not self.cache:
-            return None
-        return self.cache.get(key)
+            return MISSING
+        return self.cache.get(key, MISSING)
 
     def _set_cache(self, key, value):
         if not self.cache:
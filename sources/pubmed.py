@@ -1,7 +1,12 @@
 """PubMed API 适配器"""
 
+import threading
 import time
-import requests
+
+from sources.aio import create_session
+from utils.cache import MISSING
+from utils.identity import normalize_title
+from utils.rate_limit import get_limiter
 
 
 class PubMedAPI:
@@ -15,9 +20,14 @@ class PubMedAPI:
         self.rate_limit = self.config.get('rate_limit', 60)
         self.email = self.config.get('email', '')
         self.tool = self.config.get('tool', 'bib-check')
+        self.batch_size = int(self.config.get('batch_size', 200))
+        self.title_batch_size = int(self.config.get('title_batch_size', 20))
         self.cache = cache
-        self.session = requests.Session()
-        self._last_request_ts = 0.0
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self.batch_requests = 0  # 批量接口的请求次数（计入数据源调用统计）
+        self.session = create_session(config, 'pubmed')
+        self.limiter = get_limiter('pubmed', self.rate_limit, self.config.get('burst', 1))
 
     def search_paper(self, title=None, doi=None, arxiv_id=None, pmid=None):
         if pmid:
@@ -28,9 +38,11 @@ class PubMedAPI:
 
     def _search_by_title(self, title):
         query = title.strip()
-        cache_key = f"pubmed:title:{query.lower()}"
+        cache_key = f"pubmed:title:{normalize_title(query)}"
+        if cache_key in self._prefetched:
+            return self._prefetched[cache_key]
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         params = {
@@ -55,10 +67,12 @@ class PubMedAPI:
                         self._set_cache(cache_key, None)
                         return None
                     result = self._fetch_summary(id_list[0])
-                    self._set_cache(cache_key, result)
+                    if result is not None:
+                        # esummary 失败时同样返回 None，不能当作"未找到"写入负缓存
+                        self._set_cache(cache_key, result)
                     return result
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return None
             except Exception as e:
@@ -71,8 +85,10 @@ class PubMedAPI:
     def _fetch_summary(self, pmid):
         pmid = str(pmid).strip()
         cache_key = f"pubmed:pmid:{pmid}"
+        if cache_key in self._prefetched:
+            return self._prefetched[cache_key]
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         params = {
@@ -96,7 +112,7 @@ class PubMedAPI:
                     self._set_cache(cache_key, result)
                     return result
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return None
             except Exception as e:
@@ -106,6 +122,125 @@ class PubMedAPI:
                 time.sleep(1)
         return None
 
+    def search_titles(self, titles):
+        """批量按标题检索，返回 {title: result}
+
+        每次 esearch 用 OR 合并 title_batch_size 个 "标题"[Title] 短语查询，
+        命中的 PMID 再通过 fetch_summaries 批量获取摘要，并按规范化标题匹配回各条目。
+        短语查询比逐条查询（自由文本、取第一条）严格，未精确匹配的标题只在本次运行内记为 None
+        （_search_by_title 不再重复查询），不写入磁盘负缓存，之后的运行仍会逐条查询；
+        请求失败的标题不出现在返回值中。
+        """
+        resolved = {}
+        pending = []
+        for title in titles:
+            query = (title or '').strip()
+            if not query or query in resolved or query in pending:
+                continue
+            cached = self._lookup(f"pubmed:title:{normalize_title(query)}")
+            if cached is not MISSING:
+                resolved[query] = cached
+                continue
+            pending.append(query)
+
+        batch_size = max(self.title_batch_size, 1)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            term = ' OR '.join(f'"{query.replace(chr(34), "")}"[Title]' for query in chunk)
+            self.batch_requests += 1
+            data = self._get_json('esearch.fcgi', {
+                'db': 'pubmed',
+                'term': term,
+                'retmax': len(chunk) * 3
+            })
+            if data is None:
+                continue
+            id_list = data.get('esearchresult', {}).get('idlist', [])
+            summaries = self.fetch_summaries(id_list) if id_list else {}
+            if id_list and not summaries:
+                continue
+
+            by_title = {}
+            for result in summaries.values():
+                if result:
+                    by_title.setdefault(normalize_title(result.get('title', '')), result)
+            for query in chunk:
+                cache_key = f"pubmed:title:{normalize_title(query)}"
+                result = by_title.get(normalize_title(query))
+                resolved[query] = result
+                if result is None:
+                    with self._prefetch_lock:
+                        self._prefetched[cache_key] = None
+                    continue
+                self._store(cache_key, result)
+        return resolved
+
+    def fetch_summaries(self, pmids):
+        """批量获取 esummary，返回 {pmid: result}"""
+        resolved = {}
+        pending = []
+        for pmid in pmids:
+            pmid = str(pmid).strip()
+            if not pmid or pmid in resolved or pmid in pending:
+                continue
+            cached = self._lookup(f"pubmed:pmid:{pmid}")
+            if cached is not MISSING:
+                resolved[pmid] = cached
+                continue
+            pending.append(pmid)
+
+        batch_size = max(self.batch_size, 1)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            self.batch_requests += 1
+            data = self._get_json('esummary.fcgi', {
+                'db': 'pubmed',
+                'id': ','.join(chunk)
+            })
+            if data is None:
+                continue
+            items = data.get('result', {})
+            for pmid in chunk:
+                result = self._format_item(items.get(pmid, {}), pmid)
+                resolved[pmid] = result
+                self._store(f"pubmed:pmid:{pmid}", result)
+        return resolved
+
+    def _get_json(self, endpoint, params):
+        """请求 E-utilities 并返回 JSON，失败时返回 None"""
+        params = dict(params)
+        params.update({'retmode': 'json', 'tool': self.tool})
+        if self.email:
+            params['email'] = self.email
+
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.retry):
+            try:
+                self._rate_limit()
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code == 429:
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
+                    continue
+                return None
+            except Exception as e:
+                if attempt == self.retry - 1:
+                    print(f"PubMed API 错误: {e}")
+                    return None
+                time.sleep(1)
+        return None
+
+    def _lookup(self, cache_key):
+        if cache_key in self._prefetched:
+            return self._prefetched[cache_key]
+        return self._get_cache(cache_key)
+
+    def _store(self, cache_key, result):
+        with self._prefetch_lock:
+            self._prefetched[cache_key] = result
+        self._set_cache(cache_key, result)
+
     def _format_item(self, item, pmid):
         if not item:
             return None
@@ -143,18 +278,13 @@ class PubMedAPI:
         return result
 
     def _rate_limit(self):
-        if not self.rate_limit:
-            return
-        min_interval = 60.0 / max(self.rate_limit, 1)
-        elapsed = time.time() - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        self.limiter.acquire()
 
     def _get_cache(self, key):
+        """读取缓存；未缓存时返回 MISSING（None 表示已缓存的"未找到"结果）"""
         if not self.cache:
-            return None
-        return self.cache.get(key)
+            return MISSING
+        return self.cache.get(key, MISSING)
 
     def _set_cache(self, key, value):
         if not self.cache:
@@ -1,11 +1,21 @@
 """Semantic Scholar API 适配器"""
 
-import requests
+import threading
 import time
 
+from sources.aio import create_session
+from utils.cache import MISSING
+from utils.identity import normalize_arxiv_id, normalize_doi, normalize_title
+from utils.rate_limit import get_limiter
+
 
 class SemanticScholarAPI:
     """Semantic Scholar API 客户端"""
+
+    FIELDS = (
+        'paperId,title,authors,year,venue,publicationVenue,externalIds,publicationTypes,'
+        'journal,openAccessPdf,url'
+    )
     
     def __init__(self, config, cache=None):
         """初始化"""
@@ -14,35 +24,45 @@ class SemanticScholarAPI:
         self.timeout = self.config.get('timeout', 10)
         self.retry = self.config.get('retry', 3)
         self.rate_limit = self.config.get('rate_limit', 100)
+        self.batch_size = min(int(self.config.get('batch_size', 500)), 500)
         self.cache = cache
-        self.session = requests.Session()
-        self._last_request_ts = 0.0
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self.batch_requests = 0  # 批量接口的请求次数（计入数据源调用统计）
+        self.session = create_session(config, 'semantic-scholar')
+        self.limiter = get_limiter('semantic-scholar', self.rate_limit, self.config.get('burst', 1))
     
     def search_paper(self, title=None, arxiv_id=None, doi=None):
         """搜索论文"""
         if arxiv_id:
             return self._search_by_arxiv_id(arxiv_id)
+        elif doi:
+            return self._search_by_doi(doi)
         elif title:
             return self._search_by_title(title)
         return None
     
     def _search_by_arxiv_id(self, arxiv_id):
         """通过 arXiv ID 搜索"""
-        # 清理 arXiv ID
+        # 清理 arXiv ID（缓存键忽略版本号）
         arxiv_id = arxiv_id.replace('arXiv:', '').strip()
+        return self._search_by_external_id(f"arXiv:{arxiv_id}", f"semantic:arxiv:{normalize_arxiv_id(arxiv_id)}")
 
-        cache_key = f"semantic:arxiv:{arxiv_id}"
+    def _search_by_doi(self, doi):
+        """通过 DOI 搜索"""
+        doi = normalize_doi(doi)
+        return self._search_by_external_id(f"DOI:{doi}", f"semantic:doi:{doi}")
+
+    def _search_by_external_id(self, external_id, cache_key):
+        """通过外部 ID（arXiv:xxx / DOI:xxx）查询单篇论文"""
+        if cache_key in self._prefetched:
+            return self._prefetched[cache_key]
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
         
-        url = f"{self.base_url}/paper/arXiv:{arxiv_id}"
-        params = {
-            'fields': (
-                'paperId,title,authors,year,venue,publicationVenue,externalIds,publicationTypes,'
-                'journal,openAccessPdf,url'
-            )
-        }
+        url = f"{self.base_url}/paper/{external_id}"
+        params = {'fields': self.FIELDS}
         
         for attempt in range(self.retry):
             try:
@@ -59,7 +79,7 @@ class SemanticScholarAPI:
                     return None
                 elif response.status_code == 429:
                     # 速率限制，等待后重试
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 else:
                     return None
@@ -73,19 +93,16 @@ class SemanticScholarAPI:
     
     def _search_by_title(self, title):
         """通过标题搜索"""
-        cache_key = f"semantic:title:{title.strip().lower()}"
+        cache_key = f"semantic:title:{normalize_title(title)}"
         cached = self._get_cache(cache_key)
-        if cached is not None:
+        if cached is not MISSING:
             return cached
 
         url = f"{self.base_url}/paper/search"
         params = {
             'query': title,
             'limit': 1,
-            'fields': (
-                'paperId,title,authors,year,venue,publicationVenue,externalIds,publicationTypes,'
-                'journal,openAccessPdf,url'
-            )
+            'fields': self.FIELDS
         }
         
         for attempt in range(self.retry):
@@ -102,7 +119,7 @@ class SemanticScholarAPI:
                     self._set_cache(cache_key, None)
                     return None
                 elif response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 else:
                     return None
@@ -114,6 +131,81 @@ class SemanticScholarAPI:
         
         return None
     
+    def fetch_batch(self, arxiv_ids=None, dois=None):
+        """通过 POST /paper/batch 批量查询，返回 {缓存键: result}
+
+        fields 中包含 citationStyles，BibTeX 随元数据一并返回，无需再次请求。
+        每次请求最多 batch_size（≤500）个 ID；请求失败的 ID 不会出现在返回值中。
+        """
+        requested = []
+        for arxiv_id in arxiv_ids or []:
+            arxiv_id = (arxiv_id or '').replace('arXiv:', '').strip()
+            if arxiv_id:
+                requested.append((f"arXiv:{arxiv_id}", f"semantic:arxiv:{normalize_arxiv_id(arxiv_id)}"))
+        for doi in dois or []:
+            doi = normalize_doi(doi)
+            if doi:
+                requested.append((f"DOI:{doi}", f"semantic:doi:{doi}"))
+
+        resolved = {}
+        pending = []
+        queued = set()
+        for external_id, cache_key in requested:
+            # 同一论文的不同写法（如带版本号的 arXiv ID）只请求一次
+            if cache_key in resolved or cache_key in queued:
+                continue
+            if cache_key in self._prefetched:
+                resolved[cache_key] = self._prefetched[cache_key]
+                continue
+            cached = self._get_cache(cache_key)
+            if cached is not MISSING:
+                resolved[cache_key] = cached
+                continue
+            pending.append((external_id, cache_key))
+            queued.add(cache_key)
+
+        batch_size = max(self.batch_size, 1)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            self.batch_requests += 1
+            papers = self._post_batch([external_id for external_id, _ in chunk])
+            if papers is None:
+                continue
+            for (_, cache_key), data in zip(chunk, papers):
+                result = self._format_result(data)
+                resolved[cache_key] = result
+                with self._prefetch_lock:
+                    self._prefetched[cache_key] = result
+                self._set_cache(cache_key, result)
+        return resolved
+
+    def _post_batch(self, external_ids):
+        """请求 /paper/batch，返回与 external_ids 对齐的列表，失败时返回 None"""
+        url = f"{self.base_url}/paper/batch"
+        params = {'fields': f"{self.FIELDS},citationStyles"}
+
+        for attempt in range(self.retry):
+            try:
+                self._rate_limit()
+                response = self.session.post(url, params=params, json={'ids': external_ids},
+                                             timeout=self.timeout)
+                if response.status_code == 200:
+                    papers = response.json()
+                    if isinstance(papers, list) and len(papers) == len(external_ids):
+                        return papers
+                    return None
+                if response.status_code == 429:
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
+                    continue
+                return None
+            except Exception as e:
+                if attempt == self.retry - 1:
+                    print(f"Semantic Scholar API 错误: {e}")
+                    return None
+                time.sleep(1)
+
+        return None
+
     def _format_result(self, data):
         """格式化结果"""
         if not data:
@@ -154,7 +246,10 @@ class SemanticScholarAPI:
             publication_type = 'journal'
 
         paper_id = data.get('paperId', '')
-        bibtex = self._fetch_bibtex(paper_id) if paper_id else ''
+        # 批量接口已包含 citationStyles；否则延迟到需要时再获取 BibTeX
+        citation_styles = data.get('citationStyles')
+        bibtex = (citation_styles or {}).get('bibtex', '')
+        bibtex_pending = citation_styles is None and bool(paper_id)
 
         ss_url = data.get('url', '')
         if not ss_url and paper_id:
@@ -173,11 +268,27 @@ class SemanticScholarAPI:
             'number': journal.get('issue', '') or journal.get('number', ''),
             'publication_type': publication_type,
             'is_published': is_published,
-            'bibtex': bibtex
+            'bibtex': bibtex,
+            'bibtex_pending': bibtex_pending
         }
         
         return result if is_published else None
 
+    def fetch_bibtex(self, result):
+        """按需获取结果的 BibTeX（延迟加载，仅在需要替换条目时调用）"""
+        if not result or not result.get('bibtex_pending'):
+            return (result or {}).get('bibtex', '')
+        paper_id = result.get('paper_id', '')
+        cache_key = f"semantic:bibtex:{paper_id}"
+        bibtex = self._get_cache(cache_key)
+        if bibtex is MISSING:
+            bibtex = self._fetch_bibtex(paper_id)
+            if bibtex:
+                self._set_cache(cache_key, bibtex)
+        result['bibtex'] = bibtex
+        result['bibtex_pending'] = False
+        return bibtex
+
     def _fetch_bibtex(self, paper_id):
         """获取 BibTeX"""
         if not paper_id:
@@ -195,7 +306,7 @@ class SemanticScholarAPI:
                     citation_styles = data.get('citationStyles') or {}
                     return citation_styles.get('bibtex', '')
                 if response.status_code == 429:
-                    time.sleep(2 ** attempt)
+                    self.limiter.backoff(response.headers.get('Retry-After'), attempt)
                     continue
                 return ''
             except Exception as e:
@@ -207,18 +318,13 @@ class SemanticScholarAPI:
         return ''
 
     def _rate_limit(self):
-        if not self.rate_limit:
-            return
-        min_interval = 60.0 / max(self.rate_limit, 1)
-        elapsed = time.time() - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        self.limiter.acquire()
 
     def _get_cache(self, key):
+        """读取缓存；未缓存时返回 MISSING（None 表示已缓存的"未找到"结果）"""
         if not self.cache:
-            return None
-        return self.cache.get(key)
+            return MISSING
+        return self.cache.get(key, MISSING)
 
     def _set_cache(self, key, value):
         if not self.cache:
@@ -17,6 +17,10 @@ fi
 # 创建测试输出目录
 mkdir -p test_output
 
+echo "[测试 0] 单元测试（离线）"
+python -m unittest discover -s tests -t .
+echo
+
 echo "[测试 1] 仅链接检查"
 python bib_check.py examples/sample.bib --check-links
 echo
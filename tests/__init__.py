@@ -0,0 +1 @@
+"""Bib-Check 离线单元测试（不访问网络）"""
@@ -0,0 +1,121 @@
+"""AIMDLimiter 自适应并发与 AdaptiveSession"""
+
+import threading
+import unittest
+
+import requests
+
+from sources.aio import AsyncResponse
+from utils.aimd import AdaptiveSession, AIMDLimiter, link_host
+
+
+class AIMDLimiterTest(unittest.TestCase):
+
+    def run_round(self, limiter, congested=False):
+        """占满当前上限后全部释放"""
+        tickets = [limiter.acquire() for _ in range(limiter.limit)]
+        for ticket in tickets:
+            limiter.release(ticket, congested)
+
+    def test_additive_increase_when_saturated(self):
+        limiter = AIMDLimiter('test', initial=2, max_limit=4)
+        self.run_round(limiter)
+        self.assertEqual(limiter.limit, 3)
+        self.run_round(limiter)
+        self.run_round(limiter)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_no_increase_without_saturation(self):
+        limiter = AIMDLimiter('test', initial=4)
+        for _ in range(20):
+            limiter.release(limiter.acquire(), False)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_multiplicative_decrease_once_per_window(self):
+        limiter = AIMDLimiter('test', initial=8, decrease_factor=0.5)
+        tickets = [limiter.acquire() for _ in range(8)]
+        for ticket in tickets:
+            limiter.release(ticket, True)
+        # 同一波在途请求的拥塞信号只降低一次
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.decreases, 1)
+        self.assertEqual(limiter.congested, 8)
+        limiter.release(limiter.acquire(), True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_bounds(self):
+        limiter = AIMDLimiter('test', initial=50, min_limit=2, max_limit=8)
+        self.assertEqual(limiter.limit, 8)
+        for _ in range(5):
+            limiter.release(limiter.acquire(), True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_neutral_release_does_not_adjust(self):
+        limiter = AIMDLimiter('test', initial=1)
+        for _ in range(5):
+            limiter.release(limiter.acquire(), None)
+        self.assertEqual(limiter.limit, 1)
+        self.assertEqual(limiter.inflight, 0)
+
+    def test_trajectory(self):
+        limiter = AIMDLimiter('test', initial=2)
+        self.run_round(limiter)
+        limiter.release(limiter.acquire(), True)
+        metrics = limiter.metrics()
+        self.assertEqual([limit for _, limit in metrics['trajectory']], [2, 3, 1])
+        self.assertEqual(metrics['peak'], 3)
+        self.assertEqual(metrics['limit'], 1)
+
+    def test_acquire_blocks_at_limit(self):
+        limiter = AIMDLimiter('test', initial=1)
+        ticket = limiter.acquire()
+        acquired = threading.Event()
+
+        def worker():
+            limiter.release(limiter.acquire(), None)
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        limiter.release(ticket, None)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+
+class FakeSession:
+
+    def __init__(self, outcome):
+        self.headers = {}
+        self.outcome = outcome
+
+    def request(self, method, url, **kwargs):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return AsyncResponse(self.outcome, '', {}, url)
+
+
+class AdaptiveSessionTest(unittest.TestCase):
+
+    def test_signals(self):
+        cases = [
+            (429, 1), (503, 1), (404, 0), (200, 0),
+            (requests.exceptions.Timeout('slow'), 1),
+            (requests.exceptions.ConnectionError('refused'), 0),
+        ]
+        for outcome, congested in cases:
+            limiter = AIMDLimiter('test', initial=4)
+            session = AdaptiveSession(FakeSession(outcome), lambda url: limiter)
+            try:
+                session.get('http://example.org/a')
+            except requests.exceptions.RequestException:
+                pass
+            self.assertEqual(limiter.congested, congested, outcome)
+            self.assertEqual(limiter.inflight, 0)
+
+    def test_link_host(self):
+        self.assertEqual(link_host('https://Example.org/a?b=1'), 'link:example.org')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""asyncio HTTP 后端（本地回环 HTTP 服务）与 update_entries_async"""
+
+import asyncio
+import io
+import json
+import socket
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from checkers.auto_update import AutoUpdater
+from sources.aio import AsyncSession, create_session
+from utils.report import Report
+
+try:
+    from sources.aio import AsyncHTTPClient
+    import aiohttp  # noqa: F401
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """返回请求的路径、参数与请求头；/status/<code> 返回指定状态码，/slow 延迟响应"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == '/slow':
+            time.sleep(1)
+        status = int(parsed.path.rsplit('/', 1)[1]) if parsed.path.startswith('/status/') else 200
+        body = json.dumps({
+            'path': parsed.path,
+            'query': parse_qs(parsed.query),
+            'agent': self.headers.get('User-Agent', '')
+        }).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(HAS_AIOHTTP, '未安装 aiohttp')
+class AsyncSessionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.client = AsyncHTTPClient(pool_size=4, pool_per_host=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_get_with_params_and_headers(self):
+        session = AsyncSession(self.client)
+        session.headers['User-Agent'] = 'bib-check-test'
+        response = session.get(f"{self.base}/search", params={'q': 'title', 'rows': 5}, timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'path': '/search', 'query': {'q': ['title'], 'rows': ['5']}, 'agent': 'bib-check-test'
+        })
+
+    def test_status_passed_through(self):
+        response = AsyncSession(self.client).get(f"{self.base}/status/503", timeout=5)
+        self.assertEqual(response.status_code, 503)
+
+    def test_concurrent_requests_share_loop(self):
+        session = AsyncSession(self.client)
+        results = []
+
+        def worker(index):
+            results.append(session.get(f"{self.base}/item/{index}", timeout=5).json()['path'])
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(sorted(results), sorted(f"/item/{index}" for index in range(8)))
+
+    def test_errors_mapped_to_requests_exceptions(self):
+        session = AsyncSession(self.client)
+        with self.assertRaises(requests.exceptions.Timeout):
+            session.get(f"{self.base}/slow", timeout=0.2)
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.get(f"http://127.0.0.1:{port}/", timeout=5)
+
+
+class CreateSessionTest(unittest.TestCase):
+
+    def test_threads_backend(self):
+        self.assertIsInstance(create_session({}), requests.Session)
+
+
+class FakeAPI:
+
+    def __init__(self, result=None):
+        self.result = result
+        self.batch_requests = 0
+
+    def search_paper(self, title=None, arxiv_id=None, doi=None):
+        return dict(self.result) if self.result else None
+
+
+class FakeDatabase:
+
+    def __init__(self, entries):
+        self.entries = entries
+
+
+class UpdateEntriesAsyncTest(unittest.TestCase):
+
+    def test_entries_updated(self):
+        config = {
+            'sources': {'priority': ['dblp', 'crossref']},
+            'concurrency': {'async_limit': 2},
+            'circuit_breaker': {'enabled': False}
+        }
+        updater = AutoUpdater(config, Report())
+        updater.apis = {
+            'dblp': FakeAPI({'title': 'Found', 'venue': 'ICML', 'publication_type': 'conference',
+                             'year': '2021'}),
+            'crossref': FakeAPI()
+        }
+        entries = [
+            {'ID': f"p{index}", 'ENTRYTYPE': 'article', 'title': f"Async Paper {index}",
+             'journal': 'arXiv preprint', 'year': '2020'}
+            for index in range(5)
+        ]
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            asyncio.run(updater.update_entries_async(FakeDatabase(entries)))
+        for entry in entries:
+            self.assertEqual(entry['ENTRYTYPE'], 'inproceedings')
+            self.assertEqual(entry['booktitle'], 'ICML')
+            self.assertEqual(entry['year'], '2021')
+        self.assertEqual(updater.source_calls, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
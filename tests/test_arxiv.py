@@ -0,0 +1,92 @@
+"""arXiv 批量 id_list 查询"""
+
+import re
+import unittest
+from unittest import mock
+from urllib.parse import quote
+
+from sources.aio import AsyncResponse
+from sources.arxiv import ArxivAPI
+from utils.cache import MISSING, FileCache, MemoryCache, TieredCache
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+class FakeSession:
+
+    def __init__(self, handler):
+        self.headers = {}
+        self.handler = handler
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requests.append(dict(params or {}))
+        status, body = self.handler(params or {})
+        return AsyncResponse(status, body, {}, url)
+
+
+def atom_entry(arxiv_id, journal_ref=''):
+    ref = f"<arxiv:journal_ref>{journal_ref}</arxiv:journal_ref>" if journal_ref else ''
+    return (
+        f"<entry><id>http://arxiv.org/abs/{arxiv_id}v2</id>"
+        f"<title>Paper {arxiv_id}</title><published>2021-01-01T00:00:00Z</published>"
+        f"<author><name>Jane Doe</name></author>"
+        f"<link rel=\"alternate\" href=\"http://arxiv.org/abs/{quote(arxiv_id)}v2\"/>{ref}</entry>"
+    )
+
+
+def feed_handler(params):
+    arxiv_ids = [re.sub(r'v\d+$', '', arxiv_id) for arxiv_id in params['id_list'].split(',')]
+    entries = ''.join(atom_entry(arxiv_id, '' if arxiv_id.endswith('9') else 'NeurIPS 2021')
+                      for arxiv_id in arxiv_ids)
+    return 200, ('<feed xmlns="http://www.w3.org/2005/Atom" '
+                 'xmlns:arxiv="http://arxiv.org/schemas/atom">' + entries + '</feed>')
+
+
+class FetchByIdsTest(unittest.TestCase):
+
+    def create(self, handler, batch_size=2):
+        cache = TieredCache(MemoryCache(100), FileCache({'enabled': False}))
+        api = ArxivAPI({'sources': {'arxiv': {'batch_size': batch_size, 'retry': 1}},
+                        'circuit_breaker': {'enabled': False}}, cache=cache)
+        api.session = FakeSession(handler)
+        api.limiter = NoLimit()
+        return api, cache
+
+    def test_one_feed_per_chunk(self):
+        api, cache = self.create(feed_handler)
+        resolved = api.fetch_by_ids(['2101.00001', 'arXiv:2101.00002v1', '2101.00009', '2101.00001'])
+        self.assertEqual(api.batch_requests, 2)
+        self.assertEqual([params['id_list'] for params in api.session.requests],
+                         ['2101.00001,2101.00002v1', '2101.00009'])
+        self.assertEqual(resolved['2101.00001']['venue'], 'NeurIPS 2021')
+        # 带版本号的 ID 按去掉版本号后的 feed 条目匹配
+        self.assertEqual(resolved['2101.00002v1']['title'], 'Paper 2101.00002')
+        # 未正式发表（无 DOI / journal_ref）的条目结果为 None
+        self.assertIsNone(resolved['2101.00009'])
+        self.assertIsNone(cache.get('arxiv:id:2101.00009', MISSING))
+
+        self.assertEqual(api.search_paper(arxiv_id='2101.00002')['year'], '2021')
+        self.assertEqual(len(api.session.requests), 2)
+
+    def test_failed_request_not_cached(self):
+        api, cache = self.create(lambda params: (503, ''))
+        self.assertEqual(api.fetch_by_ids(['2101.00001', '2101.00002']), {})
+        self.assertIs(cache.get('arxiv:id:2101.00001', MISSING), MISSING)
+
+    def test_malformed_feed_not_cached(self):
+        api, cache = self.create(lambda params: (200, '<feed'))
+        with mock.patch('builtins.print'):
+            self.assertEqual(api.fetch_by_ids(['2101.00001']), {})
+        self.assertIs(cache.get('arxiv:id:2101.00001', MISSING), MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""BibStream 流式解析与记录扫描"""
+
+import os
+import tempfile
+import unittest
+
+from utils.bib_stream import BibStream, entry_spans, scan_records
+
+
+SAMPLE = (
+    b'% leading comment\n'
+    b'@string{icml = "International Conference on Machine Learning"}\n'
+    b'\n'
+    b'@preamble{"\\newcommand{\\noop}[1]{}"}\n'
+    b'@article{alpha,\n'
+    b'  title   = {Alpha {Nested} Title},\n'
+    b'  author  = {Doe, Jane},\n'
+    b'  year    = {2020},\n'
+    b'}\n'
+    b'\n'
+    b'@comment{ignored @article{not, an = entry} }\n'
+    b'@inproceedings(beta,\n'
+    b'    title = "Beta Title",\n'
+    b'    booktitle = icml,\n'
+    b'    year = 2021)\n'
+    b'trailing text\n'
+)
+
+
+class ScanRecordsTest(unittest.TestCase):
+
+    def test_record_kinds_and_spans(self):
+        records = list(scan_records(SAMPLE))
+        self.assertEqual([record.kind for record in records],
+                         ['string', 'preamble', 'article', 'comment', 'inproceedings'])
+        article = records[2]
+        self.assertTrue(SAMPLE[article.start:article.end].startswith(b'@article{alpha'))
+        self.assertTrue(SAMPLE[article.start:article.end].endswith(b'}'))
+        beta = records[4]
+        self.assertTrue(SAMPLE[beta.start:beta.end].endswith(b'year = 2021)'))
+
+    def test_entry_spans_requires_matching_ids(self):
+        spans = entry_spans(SAMPLE, [{'ID': 'alpha'}, {'ID': 'beta'}])
+        self.assertEqual(len(spans), 2)
+        self.assertIsNone(entry_spans(SAMPLE, [{'ID': 'alpha'}, {'ID': 'gamma'}]))
+        self.assertIsNone(entry_spans(SAMPLE, [{'ID': 'alpha'}]))
+
+
+class BibStreamTest(unittest.TestCase):
+
+    def test_entries(self):
+        with BibStream(SAMPLE) as stream:
+            items = list(stream)
+            self.assertEqual([item.entry['ID'] for item in items], ['alpha', 'beta'])
+            self.assertEqual(items[0].entry['title'], 'Alpha {Nested} Title')
+            # @string 宏在后续条目中插值
+            self.assertEqual(items[1].entry['booktitle'], 'International Conference on Machine Learning')
+            self.assertIn('icml', stream.strings)
+            self.assertEqual(len(stream.preambles), 1)
+            self.assertEqual(stream.comments, 1)
+            self.assertEqual(stream.errors, 0)
+            for item in items:
+                self.assertEqual(bytes(SAMPLE[item.start:item.start + 1]), b'@')
+
+    def test_malformed_entry_skipped(self):
+        buffer = (b'@article{ok1,\n title = {A}\n}\n'
+                  b'@article{broken title = {x}\n}\n'
+                  b'@article{ok2,\n title = {B}\n}\n')
+        with BibStream(buffer) as stream:
+            self.assertEqual([item.entry['ID'] for item in stream], ['ok1', 'ok2'])
+            self.assertEqual(stream.errors, 1)
+
+    def test_file_source(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'refs.bib')
+            with open(path, 'wb') as f:
+                f.write(SAMPLE)
+            with BibStream(path) as stream:
+                self.assertEqual([item.entry['ID'] for item in stream], ['alpha', 'beta'])
+            empty = os.path.join(tmpdir, 'empty.bib')
+            open(empty, 'wb').close()
+            with BibStream(empty) as stream:
+                self.assertEqual(list(stream), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+"""缓存后端：SQLiteCache、内存 LRU 与分层缓存，负缓存的独立 TTL 与 stale-while-revalidate"""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from checkers.auto_update import AutoUpdater
+from utils.cache import (
+    MISSING, MemoryCache, Revalidator, SQLiteCache, TieredCache, bypass_cache, track_stale
+)
+from utils.report import Report
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+class SQLiteCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.cache.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def create(self, **config):
+        options = {'enabled': True, 'dir': self.tmpdir.name, 'ttl': 100, 'negative_ttl': 1000}
+        options.update(config)
+        cache = SQLiteCache(options)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_round_trip(self):
+        cache = self.create()
+        cache.set('dblp:doi:10.1/a', {'title': 'A', 'authors': ['X']})
+        self.assertEqual(cache.get('dblp:doi:10.1/a'), {'title': 'A', 'authors': ['X']})
+        self.assertIs(cache.get('missing', MISSING), MISSING)
+
+    def test_ttl_expiry(self):
+        cache = self.create()
+        cache.set('key', 'value')
+        self.clock.now += 100
+        self.assertEqual(cache.get('key'), 'value')
+        self.clock.now += 1
+        self.assertIs(cache.get('key', MISSING), MISSING)
+
+    def test_negative_entry(self):
+        cache = self.create()
+        cache.set('key', None)
+        # 负缓存返回 None，与未命中（default）区分
+        self.assertIsNone(cache.get('key', MISSING))
+        self.clock.now += 500
+        self.assertIsNone(cache.get('key', MISSING))
+        self.clock.now += 501
+        self.assertIs(cache.get('key', MISSING), MISSING)
+
+    def test_zero_ttl_never_expires(self):
+        cache = self.create(ttl=0)
+        cache.set('key', 'value')
+        self.clock.now += 10 ** 8
+        self.assertEqual(cache.get('key'), 'value')
+
+    def test_persisted_across_connections(self):
+        self.create().set('key', [1, 2])
+        cache = self.create()
+        self.assertEqual(cache.get('key'), [1, 2])
+        self.assertTrue(os.path.exists(cache.path))
+
+    def test_evicts_least_recently_accessed(self):
+        cache = self.create(max_size_mb=1)
+        blob = 'x' * (400 * 1024)
+        for key in ('a', 'b'):
+            cache.set(key, blob)
+            self.clock.now += 1
+        self.assertEqual(cache.get('a'), blob)
+        self.clock.now += 1
+        cache.set('c', blob)
+        self.assertIs(cache.get('b', MISSING), MISSING)
+        self.assertEqual(cache.get('a'), blob)
+        self.assertEqual(cache.get('c'), blob)
+
+    def test_stale_while_revalidate(self):
+        cache = self.create(stale_while_revalidate=True, max_stale=50)
+        cache.set('key', 'value')
+        self.clock.now += 120
+        with track_stale() as stale:
+            self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual(stale, ['key'])
+        self.clock.now += 40
+        self.assertIs(cache.get('key', MISSING), MISSING)
+
+    def test_bypass(self):
+        cache = self.create()
+        cache.set('key', 'value')
+        with bypass_cache():
+            self.assertIs(cache.get('key', MISSING), MISSING)
+        self.assertEqual(cache.get('key'), 'value')
+
+    def test_disabled(self):
+        cache = SQLiteCache({'enabled': False, 'dir': self.tmpdir.name})
+        cache.set('key', 'value')
+        self.assertIs(cache.get('key', MISSING), MISSING)
+
+
+class MemoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.cache.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_items=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIs(cache.get('b', MISSING), MISSING)
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=10)
+        cache.set('key', 'value')
+        self.clock.now += 10
+        self.assertEqual(cache.get('key'), 'value')
+        self.clock.now += 1
+        self.assertIs(cache.get('key', MISSING), MISSING)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_negative_ttl(self):
+        cache = MemoryCache(ttl=10, negative_ttl=100)
+        cache.set('key', None)
+        self.clock.now += 50
+        self.assertIsNone(cache.get('key', MISSING))
+        self.clock.now += 51
+        self.assertIs(cache.get('key', MISSING), MISSING)
+
+
+class TieredCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.disk = SQLiteCache({'enabled': True, 'dir': self.tmpdir.name})
+        self.addCleanup(self.disk.close)
+
+    def test_disk_hit_fills_memory(self):
+        self.disk.set('key', 'value')
+        cache = TieredCache(MemoryCache(10), self.disk)
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        stats = cache.stats()
+        self.assertEqual(stats['disk']['hits'], 1)
+        self.assertEqual(stats['memory']['hits'], 1)
+        self.assertEqual(stats['memory']['items'], 1)
+
+    def test_set_writes_both_tiers(self):
+        cache = TieredCache(MemoryCache(10), self.disk)
+        cache.set('key', {'a': 1})
+        self.assertEqual(self.disk.get('key'), {'a': 1})
+        self.assertEqual(cache.memory.get('key'), {'a': 1})
+
+    def test_memory_only_when_disk_disabled(self):
+        cache = TieredCache(MemoryCache(10), SQLiteCache({'enabled': False}))
+        self.assertIs(cache.get('key', MISSING), MISSING)
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual(cache.stats()['disk']['misses'], 0)
+
+
+class RevalidateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.cache.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.disk = SQLiteCache({'enabled': True, 'dir': tmpdir.name, 'ttl': 100,
+                                 'stale_while_revalidate': True, 'max_stale': 0})
+        self.addCleanup(self.disk.close)
+
+    def test_stale_disk_hit_not_promoted_to_memory(self):
+        cache = TieredCache(MemoryCache(10), self.disk)
+        self.disk.set('key', 'old')
+        self.clock.now += 200
+        with track_stale() as stale:
+            self.assertEqual(cache.get('key'), 'old')
+        self.assertEqual(stale, ['key'])
+        self.assertIs(cache.memory.get('key', MISSING), MISSING)
+        self.assertEqual(cache.stats()['disk']['stale'], 1)
+
+    def test_revalidator_deduplicates_and_bypasses_cache(self):
+        revalidator = Revalidator(workers=1)
+        self.addCleanup(revalidator.shutdown)
+        release = threading.Event()
+        seen = []
+
+        def refresh(key):
+            release.wait(5)
+            seen.append(self.disk.get(key, MISSING))
+
+        self.disk.set('key', 'value')
+        self.assertTrue(revalidator.submit('key', refresh, 'key'))
+        self.assertFalse(revalidator.submit('key', refresh, 'key'))
+        release.set()
+        revalidator.shutdown()
+        # 刷新在 bypass_cache() 中执行，读取一律未命中
+        self.assertEqual(seen, [MISSING])
+        self.assertEqual((revalidator.submitted, revalidator.refreshed, revalidator.pending()), (1, 1, 0))
+
+    def test_updater_serves_stale_and_refreshes(self):
+        class FakeAPI:
+            batch_requests = 0
+            calls = 0
+
+            def search_paper(self, title=None, arxiv_id=None, doi=None):
+                FakeAPI.calls += 1
+                return {'title': title, 'year': str(2020 + FakeAPI.calls)}
+
+        cache = TieredCache(MemoryCache(10), self.disk)
+        updater = AutoUpdater({'sources': {'priority': ['dblp']}, 'circuit_breaker': {'enabled': False}},
+                              Report(), cache=cache)
+        updater.apis = {'dblp': FakeAPI()}
+        updater.revalidator = Revalidator(workers=1)
+        self.addCleanup(updater.revalidator.shutdown)
+
+        self.assertEqual(updater._search_source('dblp', 'Stale Paper', '', '')['year'], '2021')
+        self.clock.now += 200
+        # 新的运行：内存层为空，磁盘条目已过期，先返回旧结果再在后台刷新
+        updater.identity = type(updater.identity)(TieredCache(MemoryCache(10), self.disk))
+        self.assertEqual(updater._search_source('dblp', 'Stale Paper', '', '')['year'], '2021')
+        updater.revalidator.shutdown()
+        self.assertEqual(updater.stale_served, 1)
+        self.assertEqual(FakeAPI.calls, 2)
+        self.assertEqual(self.disk.get('identity:dblp:title:stale paper')['year'], '2022')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""CircuitBreaker 状态转换与 BreakerSession"""
+
+import unittest
+from unittest import mock
+
+import requests
+
+from sources.aio import AsyncResponse, BreakerSession
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeSession:
+    """按顺序返回预设状态码（或抛出异常）的会话"""
+
+    def __init__(self, *outcomes):
+        self.headers = {}
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return AsyncResponse(outcome, '', {}, url)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.circuit_breaker.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_threshold=2, cooldown=10, probe_timeout=30)
+
+    def open_breaker(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertTrue(self.breaker.is_open())
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.metrics(), {'state': OPEN, 'opened': 1, 'skipped': 1})
+
+    def test_half_open_allows_single_probe(self):
+        self.open_breaker()
+        self.clock.now += 10
+        self.assertFalse(self.breaker.is_open())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_probe_success_closes(self):
+        self.open_breaker()
+        self.clock.now += 10
+        self.breaker.allow()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_probe_failure_reopens(self):
+        self.open_breaker()
+        self.clock.now += 10
+        self.breaker.allow()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.opened, 2)
+        self.clock.now += 5
+        self.assertFalse(self.breaker.allow())
+
+    def test_throttled_probe_reopens(self):
+        self.open_breaker()
+        self.clock.now += 10
+        self.breaker.allow()
+        self.breaker.record_throttled()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow())
+
+    def test_throttled_when_closed_is_neutral(self):
+        self.breaker.record_failure()
+        self.breaker.record_throttled()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_lost_probe_times_out(self):
+        self.open_breaker()
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow())
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 1
+        self.assertTrue(self.breaker.allow())
+
+    def test_track_collects_skips(self):
+        self.open_breaker()
+        with CircuitBreaker.track() as outer:
+            with CircuitBreaker.track() as inner:
+                self.breaker.allow()
+            self.assertEqual(inner, {'test'})
+        self.assertEqual(outer, {'test'})
+        self.assertIsNone(CircuitBreaker.current_scope())
+
+
+class BreakerSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.circuit_breaker.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_threshold=2, cooldown=10)
+
+    def test_failures_open_and_short_circuit(self):
+        session = FakeSession(500, requests.exceptions.Timeout('slow'))
+        wrapped = BreakerSession(session, self.breaker)
+        self.assertEqual(wrapped.get('http://x').status_code, 500)
+        with self.assertRaises(requests.exceptions.Timeout):
+            wrapped.get('http://x')
+        self.assertEqual(wrapped.get('http://x').status_code, 503)
+        self.assertEqual(session.calls, 2)
+
+    def test_not_found_counts_as_success(self):
+        session = FakeSession(500, 404, 500)
+        wrapped = BreakerSession(session, self.breaker)
+        for _ in range(3):
+            wrapped.get('http://x')
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_probe_429_does_not_wedge(self):
+        session = FakeSession(500, 500, 429, 200)
+        wrapped = BreakerSession(session, self.breaker)
+        wrapped.get('http://x')
+        wrapped.get('http://x')
+        self.clock.now += 10
+        self.assertEqual(wrapped.get('http://x').status_code, 429)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now += 10
+        self.assertEqual(wrapped.get('http://x').status_code, 200)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Crossref 批量 DOI 解析（/works?filter=doi:...）"""
+
+import json
+import unittest
+
+from sources.aio import AsyncResponse
+from sources.crossref import CrossrefAPI
+from utils.cache import MISSING, FileCache, MemoryCache, TieredCache
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+class FakeSession:
+    """按 handler(url, params) -> (status, body) 返回响应，记录请求"""
+
+    def __init__(self, handler):
+        self.headers = {}
+        self.handler = handler
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requests.append((url, dict(params or {})))
+        status, body = self.handler(url, params or {})
+        return AsyncResponse(status, body if isinstance(body, str) else json.dumps(body), {}, url)
+
+
+def work(doi, title):
+    return {'DOI': doi.upper(), 'title': [title], 'type': 'journal-article',
+            'container-title': ['Journal'], 'issued': {'date-parts': [[2020]]}}
+
+
+def filter_handler(url, params):
+    dois = [item[len('doi:'):] for item in params['filter'].split(',')]
+    items = [work(doi, f"Title {doi}") for doi in dois if not doi.endswith('missing')]
+    return 200, {'message': {'items': items}}
+
+
+class ResolveDoisTest(unittest.TestCase):
+
+    def create(self, handler, batch_size=2):
+        cache = TieredCache(MemoryCache(100), FileCache({'enabled': False}))
+        api = CrossrefAPI({'sources': {'crossref': {'batch_size': batch_size, 'retry': 1}},
+                           'circuit_breaker': {'enabled': False}}, cache=cache)
+        api.session = FakeSession(handler)
+        api.limiter = NoLimit()
+        return api, cache
+
+    def test_chunks_and_results(self):
+        api, cache = self.create(filter_handler)
+        resolved = api.resolve_dois(['10.1/A', 'https://doi.org/10.1/b', '10.1/missing', '10.1/a'])
+        self.assertEqual(api.batch_requests, 2)
+        self.assertEqual([params['filter'] for _, params in api.session.requests],
+                         ['doi:10.1/a,doi:10.1/b', 'doi:10.1/missing'])
+        self.assertEqual(resolved['10.1/a']['title'], 'Title 10.1/a')
+        self.assertTrue(resolved['10.1/b']['bibtex_pending'])
+        # 批量结果中缺失的 DOI 确认不存在，记为负缓存
+        self.assertIsNone(resolved['10.1/missing'])
+        self.assertIsNone(cache.get('crossref:doi:10.1/missing', MISSING))
+
+        # 单条查询复用预取结果，不再发请求
+        self.assertEqual(api.search_paper(doi='10.1/B')['doi'], '10.1/b')
+        self.assertEqual(len(api.session.requests), 2)
+
+    def test_cached_dois_not_requested(self):
+        api, cache = self.create(filter_handler)
+        cache.set('crossref:doi:10.1/a', {'title': 'Cached'})
+        resolved = api.resolve_dois(['10.1/a', '10.1/b'])
+        self.assertEqual(resolved['10.1/a'], {'title': 'Cached'})
+        self.assertEqual([params['filter'] for _, params in api.session.requests], ['doi:10.1/b'])
+
+    def test_failed_chunk_not_cached(self):
+        api, cache = self.create(lambda url, params: (500, ''))
+        self.assertEqual(api.resolve_dois(['10.1/a', '10.1/b']), {})
+        self.assertEqual(api.batch_requests, 1)
+        self.assertIs(cache.get('crossref:doi:10.1/a', MISSING), MISSING)
+
+    def test_comma_doi_left_for_single_lookup(self):
+        api, _ = self.create(filter_handler)
+        self.assertEqual(api.resolve_dois(['10.1/a,b']), {})
+        self.assertEqual(api.session.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""DBLP 查询结果的负缓存：确认未找到才缓存，请求失败与无法解析的响应不缓存"""
+
+import unittest
+from unittest import mock
+
+from sources.aio import AsyncResponse
+from sources.dblp import DBLPAPI
+from utils.cache import MISSING, FileCache, MemoryCache, TieredCache
+
+
+NO_HITS = '<result><hits total="0"></hits></result>'
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+class FakeSession:
+
+    def __init__(self, status, text):
+        self.headers = {}
+        self.status = status
+        self.text = text
+        self.requests = 0
+
+    def get(self, url, params=None, **kwargs):
+        self.requests += 1
+        return AsyncResponse(self.status, self.text, {}, url)
+
+
+class DBLPNegativeCacheTest(unittest.TestCase):
+
+    def search(self, status, text):
+        cache = TieredCache(MemoryCache(100), FileCache({'enabled': False}))
+        api = DBLPAPI({'sources': {'dblp': {'retry': 1}}, 'circuit_breaker': {'enabled': False}}, cache=cache)
+        api.session = FakeSession(status, text)
+        api.limiter = NoLimit()
+        with mock.patch('builtins.print'):
+            self.assertIsNone(api.search_paper(title='Unknown Paper'))
+        return cache.get('dblp:title:unknown paper', MISSING), api
+
+    def test_no_hits_cached_as_negative(self):
+        cached, api = self.search(200, NO_HITS)
+        self.assertIsNone(cached)
+        # 再次查询命中负缓存，不再请求
+        api.search_paper(title='Unknown Paper')
+        self.assertEqual(api.session.requests, 1)
+
+    def test_parse_failure_not_cached(self):
+        cached, _ = self.search(200, '<html>Service Unavailable')
+        self.assertIs(cached, MISSING)
+
+    def test_server_error_not_cached(self):
+        cached, _ = self.search(500, '')
+        self.assertIs(cached, MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""并行扇出：按优先级合并结果，策略满足后取消尚未开始的查询"""
+
+import threading
+import time
+import unittest
+
+from checkers.auto_update import AutoUpdater
+from utils.report import Report
+
+
+SOURCES = ['semantic-scholar', 'dblp', 'crossref']
+
+
+class SlowAPI:
+
+    def __init__(self, result=None, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+        self.batch_requests = 0
+
+    def search_paper(self, title=None, arxiv_id=None, doi=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return dict(self.result) if self.result else None
+
+
+class ParallelFanOutTest(unittest.TestCase):
+
+    def create(self, policy, apis):
+        config = {
+            'sources': {'priority': list(SOURCES), 'resolution': policy},
+            'concurrency': {'max_workers': 4, 'fanout': 'parallel'},
+            'circuit_breaker': {'enabled': False}
+        }
+        updater = AutoUpdater(config, Report())
+        updater.apis = apis
+        updater._open_source_pools()
+        self.addCleanup(updater._close_source_pools)
+        return updater
+
+    def test_results_follow_priority_order(self):
+        updater = self.create('all', {
+            'semantic-scholar': SlowAPI({'title': 'S2'}, delay=0.1),
+            'dblp': SlowAPI({'title': 'DBLP'}),
+            'crossref': SlowAPI({'title': 'Crossref'}, delay=0.05)
+        })
+        results = updater._query_sources('Ordered Title', '', '')
+        self.assertEqual(list(results), SOURCES)
+        self.assertEqual((updater.source_calls, updater.source_calls_saved), (3, 0))
+
+    def test_pending_queries_cancelled_once_satisfied(self):
+        crossref = SlowAPI({'title': 'Crossref'})
+        updater = self.create('first-bibtex-hit', {
+            'semantic-scholar': SlowAPI(delay=0.05),
+            'dblp': SlowAPI({'title': 'DBLP', 'bibtex_pending': True}),
+            'crossref': crossref
+        })
+        # 占满 crossref 线程池，使其查询停留在队列中
+        release = threading.Event()
+        blocker = updater._source_pools['crossref'].submit(release.wait, 5)
+        try:
+            results = updater._query_sources('Cancelled Title', '', '')
+        finally:
+            release.set()
+            blocker.result()
+        self.assertEqual(list(results), ['dblp'])
+        self.assertEqual(crossref.calls, 0)
+        self.assertEqual((updater.source_calls, updater.source_calls_saved), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
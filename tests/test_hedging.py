@@ -0,0 +1,99 @@
+"""对冲请求：延迟分位数、令牌约束与排队时间不计入对冲延迟"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from sources.aio import AsyncResponse
+from utils.hedging import HedgedSession, LatencyWindow
+
+
+class FakeLimiter:
+
+    def __init__(self, allow=True):
+        self.allow = allow
+
+    def try_acquire(self):
+        return self.allow
+
+
+class FakeSession:
+    """按调用顺序返回预设延迟的响应，响应正文为调用序号"""
+
+    def __init__(self, *delays):
+        self.headers = {}
+        self.delays = list(delays)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+        time.sleep(self.delays[index] if index < len(self.delays) else 0)
+        return AsyncResponse(200, str(index + 1), {}, url)
+
+
+def warm_window(name, seconds=0.02, count=20):
+    window = LatencyWindow(name)
+    for _ in range(count):
+        window.add(seconds)
+    return window
+
+
+class LatencyWindowTest(unittest.TestCase):
+
+    def test_percentile(self):
+        window = LatencyWindow('test')
+        for value in range(1, 11):
+            window.add(value / 10)
+        self.assertIsNone(window.percentile(95, min_samples=20))
+        self.assertEqual(window.percentile(90, min_samples=10), 0.9)
+        self.assertEqual(window.percentile(100, min_samples=10), 1.0)
+
+
+class HedgedSessionTest(unittest.TestCase):
+
+    def test_no_hedge_without_samples_or_for_post(self):
+        session = FakeSession(0.1, 0.0)
+        window = LatencyWindow('hedge-cold')
+        hedged = HedgedSession(session, window, FakeLimiter())
+        self.assertEqual(hedged.request('GET', 'http://example.org').text, '1')
+        hedged = HedgedSession(session, warm_window('hedge-post'), FakeLimiter())
+        self.assertEqual(hedged.request('POST', 'http://example.org').text, '2')
+        self.assertEqual(session.calls, 2)
+
+    def test_slow_primary_hedged(self):
+        window = warm_window('hedge-slow')
+        session = FakeSession(0.5, 0.0)
+        response = HedgedSession(session, window, FakeLimiter(), min_delay=0.01).request('GET', 'http://example.org')
+        self.assertEqual(response.text, '2')
+        self.assertEqual(window.metrics()['hedged'], 1)
+        self.assertEqual(window.metrics()['won'], 1)
+
+    def test_no_token_no_hedge(self):
+        window = warm_window('hedge-denied')
+        session = FakeSession(0.2)
+        response = HedgedSession(session, window, FakeLimiter(False), min_delay=0.01).request('GET', 'http://x')
+        self.assertEqual(response.text, '1')
+        self.assertEqual(session.calls, 1)
+        self.assertEqual(window.metrics()['denied'], 1)
+
+    def test_queueing_not_counted_toward_delay(self):
+        window = warm_window('hedge-queued')
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        # 线程池被占用，原请求排队远超对冲延迟，但开始执行后很快完成
+        executor.submit(time.sleep, 0.3)
+        session = FakeSession(0.0)
+        with mock.patch('utils.hedging._get_executor', return_value=executor):
+            response = HedgedSession(session, window, FakeLimiter(), min_delay=0.05).request('GET', 'http://x')
+        self.assertEqual(response.text, '1')
+        self.assertEqual(session.calls, 1)
+        self.assertEqual(window.metrics()['hedged'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
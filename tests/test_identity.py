@@ -0,0 +1,69 @@
+"""标识规范化与 IdentityIndex 别名解析"""
+
+import unittest
+
+from utils.cache import MISSING, MemoryCache
+from utils.identity import IdentityIndex, identity_keys, normalize_arxiv_id, normalize_doi, normalize_title
+
+
+class NormalizeTest(unittest.TestCase):
+
+    def test_title(self):
+        self.assertEqual(normalize_title(r'{Attention} Is All You Need!'), 'attention is all you need')
+        self.assertEqual(normalize_title(r'Schr\"{o}dinger  Bridges'), 'schrodinger bridges')
+        self.assertEqual(normalize_title('Schrödinger Bridges'), 'schrodinger bridges')
+
+    def test_doi(self):
+        self.assertEqual(normalize_doi('https://doi.org/10.1000/ABC'), '10.1000/abc')
+        self.assertEqual(normalize_doi('doi: 10.1000/abc'), '10.1000/abc')
+
+    def test_arxiv_id(self):
+        self.assertEqual(normalize_arxiv_id('arXiv:2101.00001v3'), '2101.00001')
+        self.assertEqual(normalize_arxiv_id('https://arxiv.org/pdf/2101.00001v1.pdf'), '2101.00001')
+
+    def test_identity_keys_order(self):
+        keys = identity_keys(title='A Paper', doi='10.1/X', arxiv_id='2101.00001')
+        self.assertEqual(keys, ['doi:10.1/x', 'arxiv:2101.00001', 'title:a paper'])
+
+
+class IdentityIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache(max_items=100)
+        self.index = IdentityIndex(self.cache)
+        self.result = {'title': 'Shared Title', 'doi': '10.1/a'}
+        self.index.record('dblp', identity_keys(title='Shared Title', arxiv_id='2001.00001'), self.result)
+
+    def test_lookup_by_any_identifier(self):
+        self.assertEqual(self.index.lookup('dblp', identity_keys(arxiv_id='2001.00001v2')), self.result)
+        # 结果自带的 DOI 也登记为别名
+        self.assertEqual(self.index.lookup('dblp', identity_keys(doi='10.1/A')), self.result)
+        self.assertEqual(self.index.lookup('dblp', identity_keys(title='shared title')), self.result)
+
+    def test_results_are_per_source(self):
+        self.assertIs(self.index.lookup('crossref', identity_keys(arxiv_id='2001.00001')), MISSING)
+
+    def test_title_alias_ignored_for_strong_identifiers(self):
+        keys = identity_keys(title='Shared Title', arxiv_id='2105.99999')
+        self.assertIs(self.index.lookup('dblp', keys), MISSING)
+        keys = identity_keys(title='Shared Title', doi='10.1/other')
+        self.assertIs(self.index.lookup('dblp', keys), MISSING)
+
+    def test_record_does_not_merge_by_title(self):
+        other = {'title': 'Shared Title', 'doi': '10.1/b'}
+        self.index.record('dblp', identity_keys(title='Shared Title', arxiv_id='2105.99999'), other)
+        self.assertEqual(self.index.lookup('dblp', identity_keys(arxiv_id='2105.99999')), other)
+        self.assertEqual(self.index.lookup('dblp', identity_keys(arxiv_id='2001.00001')), self.result)
+
+    def test_persisted_across_instances(self):
+        index = IdentityIndex(self.cache)
+        self.assertEqual(index.lookup('dblp', identity_keys(doi='10.1/a')), self.result)
+        self.assertEqual(index.hits, 1)
+
+    def test_empty_result_not_recorded(self):
+        self.index.record('arxiv', identity_keys(arxiv_id='2001.00002'), None)
+        self.assertIs(self.index.lookup('arxiv', identity_keys(arxiv_id='2001.00002')), MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""增量检查：条目指纹、运行签名与 IncrementalState 的跳过规则"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from bibtexparser.bibdatabase import BibDatabase
+
+from utils.incremental import IncrementalState, entry_fingerprint, run_signature
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+
+def database(*entries):
+    db = BibDatabase()
+    db.entries = [dict(entry) for entry in entries]
+    return db
+
+
+ALPHA = {'ID': 'alpha', 'ENTRYTYPE': 'article', 'title': 'Alpha', 'year': '2020'}
+BETA = {'ID': 'beta', 'ENTRYTYPE': 'inproceedings', 'title': 'Beta', 'year': '2021'}
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_insensitive_to_whitespace_case_and_order(self):
+        reordered = {'year': '2020', 'Title': '  Alpha\n', 'ENTRYTYPE': 'Article', 'ID': 'alpha'}
+        self.assertEqual(entry_fingerprint(ALPHA), entry_fingerprint(reordered))
+
+    def test_changes_with_content_id_and_citation(self):
+        base = entry_fingerprint(ALPHA)
+        self.assertNotEqual(base, entry_fingerprint(dict(ALPHA, year='2021')))
+        self.assertNotEqual(base, entry_fingerprint(dict(ALPHA, ID='alpha2')))
+        self.assertNotEqual(entry_fingerprint(ALPHA, True), entry_fingerprint(ALPHA, False))
+
+    def test_run_signature(self):
+        config = {'sources': {'priority': ['dblp']}}
+        self.assertEqual(run_signature(config, ['auto_update']), run_signature(dict(config), ['auto_update']))
+        self.assertNotEqual(run_signature(config, ['auto_update']), run_signature(config, ['link_check']))
+        self.assertNotEqual(run_signature(config, ['x']),
+                            run_signature({'sources': {'priority': ['crossref']}}, ['x']))
+
+
+class IncrementalStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.incremental.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'refs.state.json')
+
+    def first_run(self, findings=None, signature='sig', entries=(ALPHA, BETA)):
+        state = IncrementalState(self.path, signature)
+        db = database(*entries)
+        pending, skipped = state.select(db)
+        self.assertEqual(skipped, [])
+        state.record(pending.entries, findings or {})
+        state.save([entry['ID'] for entry in db.entries])
+
+    def test_unchanged_entries_skipped(self):
+        self.first_run({'alpha': {'warnings': ['w']}})
+        state = IncrementalState(self.path, 'sig')
+        pending, skipped = state.select(database(ALPHA, dict(BETA, year='2022')))
+        self.assertEqual(skipped, ['alpha'])
+        self.assertEqual([entry['ID'] for entry in pending.entries], ['beta'])
+        self.assertEqual(state.findings(skipped), {'alpha': {'warnings': ['w']}})
+
+    def test_signature_change_rechecks_everything(self):
+        self.first_run()
+        pending, skipped = IncrementalState(self.path, 'other').select(database(ALPHA, BETA))
+        self.assertEqual((len(pending.entries), skipped), (2, []))
+
+    def test_max_age(self):
+        self.first_run()
+        self.clock.now += 100
+        self.assertEqual(IncrementalState(self.path, 'sig', max_age=200).select(database(ALPHA))[1], ['alpha'])
+        self.assertEqual(IncrementalState(self.path, 'sig', max_age=50).select(database(ALPHA))[1], [])
+
+    def test_retry_and_modifying_findings(self):
+        self.first_run({'alpha': {'errors': ['timeout']}, 'beta': {'updates': ['venue']}})
+        state = IncrementalState(self.path, 'sig')
+        # 瞬时失败的条目始终重新检查；有修改的条目只在写回文件时重新检查
+        self.assertEqual(state.select(database(ALPHA, BETA))[1], ['beta'])
+        self.assertEqual(state.select(database(ALPHA, BETA), rewrite=True)[1], [])
+
+    def test_duplicate_ids_always_checked(self):
+        self.first_run(entries=(ALPHA,))
+        pending, skipped = IncrementalState(self.path, 'sig').select(database(ALPHA, ALPHA))
+        self.assertEqual((len(pending.entries), skipped), (2, []))
+
+    def test_pending_entries_share_dicts(self):
+        db = database(ALPHA)
+        pending, _ = IncrementalState(self.path, 'sig').select(db)
+        self.assertIs(pending.entries[0], db.entries[0])
+
+    def test_save_drops_removed_entries(self):
+        self.first_run()
+        state = IncrementalState(self.path, 'sig')
+        state.save(['alpha'])
+        self.assertEqual(list(IncrementalState(self.path, 'sig').entries), ['alpha'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""--jobs 多进程：spawn 工作进程共享限速器，离线运行端到端"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from bib_check import _parse_duration
+from utils.rate_limit import get_limiter, start_shared_limiters, use_shared_limiters
+from utils.snapshot import write_snapshot
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _acquire_shared(address, count):
+    """在工作进程中从共享限速器获取令牌"""
+    use_shared_limiters(address)
+    limiter = get_limiter('test-jobs', 60000, 100)
+    for _ in range(count):
+        limiter.acquire()
+
+
+class ParseDurationTest(unittest.TestCase):
+
+    def test_units(self):
+        self.assertEqual(_parse_duration('90'), 90)
+        self.assertEqual(_parse_duration('1.5m'), 90)
+        self.assertEqual(_parse_duration('12h'), 43200)
+        self.assertEqual(_parse_duration('7D'), 604800)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            _parse_duration('soon')
+
+
+class SharedLimiterTest(unittest.TestCase):
+
+    def test_spawned_workers_share_one_bucket(self):
+        ctx = multiprocessing.get_context('spawn')
+        manager = start_shared_limiters(ctx)
+        self.addCleanup(manager.shutdown)
+        workers = [ctx.Process(target=_acquire_shared, args=(manager.address, 5)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            self.assertEqual(worker.exitcode, 0)
+        limiter = manager.get_limiter('test-jobs', 60000, 100)
+        self.assertEqual(limiter.metrics()['tokens_granted'], 10)
+
+
+class OfflineJobsTest(unittest.TestCase):
+
+    def test_parallel_files_offline(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            snapshot = os.path.join(tmpdir, 'empty.snapshot.gz')
+            write_snapshot(snapshot, {})
+            files = []
+            for name in ('a', 'b'):
+                path = os.path.join(tmpdir, f"{name}.bib")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(f"@article{{{name},\n  title = {{Offline Paper {name}}},\n"
+                            f"  journal = {{arXiv preprint arXiv:2101.0000{len(files)}}},\n}}\n")
+                files.append(path)
+            output = os.path.join(tmpdir, 'out')
+            os.mkdir(output)
+
+            process = subprocess.run(
+                [sys.executable, os.path.join(ROOT, 'bib_check.py'), *files, '--auto-update', '--dry-run',
+                 '--offline', snapshot, '--jobs', '2', '-o', output, '-c', os.path.join(ROOT, 'config.yaml')],
+                cwd=tmpdir, capture_output=True, text=True, timeout=300
+            )
+            self.assertEqual(process.returncode, 0, process.stdout + process.stderr)
+            with open(os.path.join(output, 'bib-check.summary.json'), encoding='utf-8') as f:
+                summary = json.load(f)
+            self.assertEqual([item['file'] for item in summary['files']], files)
+            self.assertEqual(summary['total']['update_misses'], 2)
+            for name in ('a', 'b'):
+                with open(os.path.join(output, f"{name}.bib.report.json"), encoding='utf-8') as f:
+                    report = json.load(f)
+                self.assertTrue(report['snapshot_misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""BibTeX 延迟获取：查询阶段不下载，替换条目时按需获取一次"""
+
+import unittest
+
+from checkers.auto_update import AutoUpdater
+from sources.aio import AsyncResponse
+from sources.dblp import DBLPAPI
+from utils.cache import FileCache, MemoryCache, TieredCache
+from utils.report import Report
+
+
+HIT = (
+    '<result><hits><hit><info>'
+    '<title>Lazy Paper.</title><author>Jane Doe</author><year>2021</year><venue>ICML</venue>'
+    '<type>Conference and Workshop Papers</type><key>conf/icml/Doe21</key>'
+    '</info></hit></hits></result>'
+)
+BIBTEX = '@inproceedings{DBLP:conf/icml/Doe21,\n  title = {Lazy Paper},\n  booktitle = {ICML},\n  year = {2021}\n}\n'
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+class FakeDBLP:
+
+    def __init__(self):
+        self.headers = {}
+        self.urls = []
+
+    def get(self, url, params=None, **kwargs):
+        self.urls.append(url)
+        return AsyncResponse(200, BIBTEX if url.endswith('.bib') else HIT, {}, url)
+
+
+class DBLPLazyBibtexTest(unittest.TestCase):
+
+    def test_bibtex_fetched_on_demand_and_cached(self):
+        cache = TieredCache(MemoryCache(100), FileCache({'enabled': False}))
+        api = DBLPAPI({'circuit_breaker': {'enabled': False}}, cache=cache)
+        api.session = FakeDBLP()
+        api.limiter = NoLimit()
+
+        result = api.search_paper(title='Lazy Paper')
+        self.assertEqual(len(api.session.urls), 1)
+        self.assertTrue(result['bibtex_pending'])
+        self.assertEqual(result['bibtex'], '')
+
+        self.assertEqual(api.fetch_bibtex(result), BIBTEX)
+        self.assertEqual(api.session.urls[-1], 'https://dblp.org/rec/conf/icml/Doe21.bib')
+        self.assertFalse(result['bibtex_pending'])
+        # 已获取的结果与其他相同论文的结果都不再请求
+        self.assertEqual(api.fetch_bibtex(result), BIBTEX)
+        self.assertEqual(api.fetch_bibtex(dict(result, bibtex='', bibtex_pending=True)), BIBTEX)
+        self.assertEqual(len(api.session.urls), 2)
+
+
+class FakeAPI:
+
+    def __init__(self):
+        self.batch_requests = 0
+        self.fetched = 0
+
+    def search_paper(self, title=None, arxiv_id=None, doi=None):
+        return {'title': 'Lazy Paper', 'venue': 'ICML', 'year': '2021', 'url': 'https://dblp.org/rec/x',
+                'publication_type': 'conference', 'bibtex': '', 'bibtex_pending': True}
+
+    def fetch_bibtex(self, result):
+        self.fetched += 1
+        result['bibtex'] = BIBTEX
+        result['bibtex_pending'] = False
+        return BIBTEX
+
+
+class UpdaterLazyBibtexTest(unittest.TestCase):
+
+    def run_update(self, dry_run):
+        report = Report()
+        updater = AutoUpdater({'sources': {'priority': ['dblp']}, 'circuit_breaker': {'enabled': False}},
+                              report, dry_run=dry_run)
+        updater.apis = {'dblp': FakeAPI()}
+        entry = {'ID': 'doe2021', 'ENTRYTYPE': 'article', 'title': 'Lazy Paper',
+                 'journal': 'arXiv preprint arXiv:2101.00001'}
+        updated = updater._update_entry(entry)
+        return updated, entry, report, updater.apis['dblp']
+
+    def test_dry_run_does_not_download(self):
+        updated, entry, report, api = self.run_update(dry_run=True)
+        self.assertTrue(updated)
+        self.assertEqual(api.fetched, 0)
+        self.assertEqual(report.update_candidates[0]['bibtex_source'], 'dblp')
+        self.assertEqual(entry['journal'], 'arXiv preprint arXiv:2101.00001')
+
+    def test_update_replaces_entry_with_fetched_bibtex(self):
+        updated, entry, report, api = self.run_update(dry_run=False)
+        self.assertTrue(updated)
+        self.assertEqual(api.fetched, 1)
+        self.assertEqual(entry['ID'], 'doe2021')
+        self.assertEqual(entry['ENTRYTYPE'], 'inproceedings')
+        self.assertEqual(entry['booktitle'], 'ICML')
+        self.assertNotIn('journal', entry)
+
+
+if __name__ == '__main__':
+    unittest.main()
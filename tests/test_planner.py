@@ -0,0 +1,104 @@
+"""跨文件批量规划：唯一标识只查询一次，结果与熔断跳过 / 离线拦截回放到每个条目"""
+
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from checkers.auto_update import AutoUpdater
+from sources.aio import OfflineSession
+from utils.circuit_breaker import CircuitBreaker
+from utils.report import Report
+
+
+class FakeAPI:
+
+    def __init__(self, result=None, blocked_url=None):
+        self.result = result
+        self.blocked_url = blocked_url
+        self.calls = []
+        self.batch_requests = 0
+
+    def search_paper(self, title=None, arxiv_id=None, doi=None):
+        self.calls.append(arxiv_id or title)
+        if self.blocked_url:
+            # 模拟离线会话拦截请求
+            OfflineSession().get(self.blocked_url)
+            return None
+        return dict(self.result, title=title) if self.result else None
+
+
+def entry(entry_id, title, arxiv_id):
+    return {'ID': entry_id, 'ENTRYTYPE': 'article', 'title': title,
+            'journal': f"arXiv preprint arXiv:{arxiv_id}"}
+
+
+CONFIG = {
+    'sources': {'priority': ['dblp', 'crossref']},
+    'concurrency': {'max_workers': 2},
+    'circuit_breaker': {'enabled': False}
+}
+
+
+class PlannerTest(unittest.TestCase):
+
+    def create(self, resolved=None, **apis):
+        updater = AutoUpdater(CONFIG, Report(), resolved=resolved)
+        updater.apis = apis
+        return updater
+
+    def plan(self, updater, entries):
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            return updater.resolve_identities(entries)
+
+    def test_unique_identities_queried_once(self):
+        dblp = FakeAPI({'venue': 'ICML', 'publication_type': 'conference', 'year': '2021'})
+        crossref = FakeAPI()
+        planner = self.create(dblp=dblp, crossref=crossref)
+        file_a = [entry('a1', 'Shared Paper', '2101.00001'), entry('a2', 'Only In A', '2101.00002')]
+        file_b = [entry('b1', 'Shared Paper', '2101.00001'), {'ID': 'b2', 'ENTRYTYPE': 'book', 'title': 'Book'}]
+        resolved, total, unique = self.plan(planner, file_a + file_b)
+        self.assertEqual((total, unique), (3, 2))
+        self.assertEqual(sorted(dblp.calls), ['2101.00001', '2101.00002'])
+
+        # 各文件的 AutoUpdater 复用规划结果，不再查询数据源
+        report = Report()
+        updater = AutoUpdater(CONFIG, report, resolved=resolved)
+        updater.apis = {'dblp': FakeAPI(), 'crossref': FakeAPI()}
+        shared = entry('b1', 'Shared Paper', '2101.00001')
+        self.assertTrue(updater._update_entry(shared))
+        self.assertEqual(shared['booktitle'], 'ICML')
+        self.assertFalse(updater.apis['dblp'].calls)
+
+    def test_breaker_skips_replayed_per_entry(self):
+        breaker = CircuitBreaker('crossref', failure_threshold=1, cooldown=600)
+        breaker.record_failure()
+        planner = self.create(dblp=FakeAPI(), crossref=FakeAPI())
+        planner.breakers = {'crossref': breaker}
+        entries = [entry('a1', 'Skipped Paper', '2101.00003'), entry('b1', 'Skipped Paper', '2101.00003')]
+        resolved, _, _ = self.plan(planner, entries)
+        self.assertFalse(planner.apis['crossref'].calls)
+
+        report = Report()
+        updater = AutoUpdater(CONFIG, report, resolved=resolved)
+        for item in entries:
+            updater._update_entry(item)
+        self.assertEqual([(skip['entry_id'], skip['sources']) for skip in report.source_skips],
+                         [('a1', ['crossref']), ('b1', ['crossref'])])
+
+    def test_offline_blocks_replayed_per_entry(self):
+        url = 'https://dblp.org/search/publ/api'
+        planner = self.create(dblp=FakeAPI(blocked_url=url), crossref=FakeAPI())
+        entries = [entry('a1', 'Blocked Paper', '2101.00004'), entry('b1', 'Blocked Paper', '2101.00004')]
+        resolved, _, _ = self.plan(planner, entries)
+
+        report = Report()
+        updater = AutoUpdater(CONFIG, report, resolved=resolved)
+        updater.offline = True
+        for item in entries:
+            self.assertFalse(updater._update_entry(item))
+        self.assertEqual([(miss['entry_id'], miss['requests']) for miss in report.snapshot_misses],
+                         [('a1', [url]), ('b1', [url])])
+
+
+if __name__ == '__main__':
+    unittest.main()
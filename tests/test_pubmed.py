@@ -0,0 +1,99 @@
+"""PubMed 批量 esearch / esummary 流水线"""
+
+import json
+import unittest
+
+from sources.aio import AsyncResponse
+from sources.pubmed import PubMedAPI
+from utils.cache import MISSING, FileCache, MemoryCache, TieredCache
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+class FakeEutils:
+    """esearch 按标题短语返回 PMID，esummary 返回对应摘要"""
+
+    def __init__(self, papers, fail=()):
+        self.headers = {}
+        self.papers = papers
+        self.fail = set(fail)
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        endpoint = url.rsplit('/', 1)[-1]
+        self.requests.append((endpoint, dict(params)))
+        if endpoint in self.fail:
+            return AsyncResponse(500, '', {}, url)
+        if endpoint == 'esearch.fcgi':
+            ids = [pmid for pmid, title in self.papers.items() if f'"{title}"[Title]' in params['term']]
+            body = {'esearchresult': {'idlist': ids}}
+        else:
+            body = {'result': {
+                pmid: {'title': self.papers[pmid] + '.', 'pubdate': '2019 Mar', 'source': 'Nature',
+                       'articleids': [{'idtype': 'doi', 'value': f"10.1/{pmid}"}]}
+                for pmid in params['id'].split(',') if pmid in self.papers
+            }}
+        return AsyncResponse(200, json.dumps(body), {}, url)
+
+
+class PubMedBatchTest(unittest.TestCase):
+
+    def create(self, session, **config):
+        options = {'retry': 1}
+        options.update(config)
+        cache = TieredCache(MemoryCache(100), FileCache({'enabled': False}))
+        api = PubMedAPI({'sources': {'pubmed': options}, 'circuit_breaker': {'enabled': False}}, cache=cache)
+        api.session = session
+        api.limiter = NoLimit()
+        return api, cache
+
+    def test_search_titles(self):
+        session = FakeEutils({'11': 'Protein Folding', '12': 'Gene Editing'})
+        api, cache = self.create(session)
+        resolved = api.search_titles(['Protein Folding', 'Gene Editing', 'Unknown Paper', 'Protein Folding'])
+        self.assertEqual([endpoint for endpoint, _ in session.requests], ['esearch.fcgi', 'esummary.fcgi'])
+        self.assertEqual(api.batch_requests, 2)
+        self.assertEqual(resolved['Protein Folding']['doi'], '10.1/11')
+        self.assertEqual(resolved['Gene Editing']['venue'], 'Nature')
+        self.assertIsNone(resolved['Unknown Paper'])
+
+        # 单条查询复用批量结果；批量未命中的标题本次运行内不再查询
+        self.assertEqual(api.search_paper(title='gene editing')['year'], '2019')
+        self.assertIsNone(api.search_paper(title='Unknown Paper'))
+        self.assertEqual(len(session.requests), 2)
+        # 批量短语查询未命中不写入磁盘负缓存，之后的运行仍逐条查询
+        self.assertIs(cache.get('pubmed:title:unknown paper', MISSING), MISSING)
+        self.assertEqual(cache.get('pubmed:title:protein folding')['doi'], '10.1/11')
+
+    def test_title_chunks(self):
+        session = FakeEutils({})
+        api, _ = self.create(session, title_batch_size=2)
+        api.search_titles(['A', 'B', 'C'])
+        terms = [params['term'] for endpoint, params in session.requests]
+        self.assertEqual(terms, ['"A"[Title] OR "B"[Title]', '"C"[Title]'])
+
+    def test_failed_summary_leaves_titles_unresolved(self):
+        session = FakeEutils({'11': 'Protein Folding'}, fail={'esummary.fcgi'})
+        api, cache = self.create(session)
+        self.assertEqual(api.search_titles(['Protein Folding', 'Other']), {})
+        self.assertIs(cache.get('pubmed:title:protein folding', MISSING), MISSING)
+
+    def test_fetch_summaries_chunks(self):
+        session = FakeEutils({'1': 'One', '2': 'Two', '3': 'Three'})
+        api, cache = self.create(session, batch_size=2)
+        resolved = api.fetch_summaries(['1', '2', '3', '4', '2'])
+        self.assertEqual([params['id'] for _, params in session.requests], ['1,2', '3,4'])
+        self.assertEqual(resolved['3']['title'], 'Three.')
+        self.assertIsNone(resolved['4'])
+        self.assertIsNone(cache.get('pubmed:pmid:4', MISSING))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""TokenBucket 限速与 429 退避"""
+
+import unittest
+from unittest import mock
+
+from utils.rate_limit import TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    """可手动推进的时钟，sleep 不实际等待"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        pass
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('utils.rate_limit.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket('test', 120, burst=2)
+        waits = [bucket.acquire() for _ in range(4)]
+        self.assertEqual(waits, [0.0, 0.0, 0.5, 1.0])
+
+    def test_refill_after_idle(self):
+        bucket = TokenBucket('test', 60, burst=1)
+        bucket.acquire()
+        self.clock.now += 5
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_backoff_keeps_rate_for_queued_callers(self):
+        bucket = TokenBucket('test', 120, burst=1)
+        bucket.acquire()
+        bucket.backoff('3')
+        waits = [bucket.acquire() for _ in range(8)]
+        # 退避结束后仍按 2 次/秒的间隔发出，而不是同时放行
+        self.assertEqual(waits, [3.5, 4.0, 4.5, 5.0, 5.5, 6.0, 6.5, 7.0])
+        self.assertEqual(bucket.metrics()['retry_after_honored'], 1)
+
+    def test_backoff_without_retry_after_is_exponential(self):
+        bucket = TokenBucket('test', 120, burst=1)
+        bucket.acquire()
+        bucket.backoff(None, attempt=2)
+        self.assertEqual(bucket.acquire(), 4.5)
+        self.assertEqual(bucket.metrics()['throttled'], 1)
+
+    def test_no_refill_during_backoff(self):
+        bucket = TokenBucket('test', 120, burst=4)
+        bucket.backoff('2')
+        self.clock.now += 1
+        self.assertFalse(bucket.try_acquire())
+        self.clock.now += 1
+        self.assertFalse(bucket.try_acquire())
+        self.clock.now += 0.5
+        self.assertTrue(bucket.try_acquire())
+
+    def test_unlimited(self):
+        bucket = TokenBucket('test', 0)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('7'), 7.0)
+        self.assertEqual(parse_retry_after('-3'), 0.0)
+
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after(''))
+        self.assertIsNone(parse_retry_after('soon'))
+
+    def test_http_date_in_past(self):
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""解析策略 ResolutionPolicy 与 AutoUpdater 的提前停止、批量预取范围"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from checkers.auto_update import AutoUpdater
+from utils.report import Report
+from utils.resolution import ResolutionPolicy, has_bibtex
+
+
+SOURCES = ['semantic-scholar', 'dblp', 'crossref', 'arxiv', 'pubmed']
+
+
+class ResolutionPolicyTest(unittest.TestCase):
+
+    def test_names(self):
+        self.assertEqual(ResolutionPolicy(None).name, 'all')
+        self.assertEqual(ResolutionPolicy(' Quorum-3 ').quorum, 3)
+        for name in ('quorum-0', 'first-hit', 'any'):
+            with self.assertRaises(ValueError):
+                ResolutionPolicy(name)
+
+    def test_is_satisfied(self):
+        bibtex = {'bibtex_pending': True}
+        published = {'is_published': True}
+        plain = {'title': 'A'}
+        self.assertFalse(ResolutionPolicy('all').is_satisfied({'dblp': bibtex, 'crossref': published}))
+        self.assertFalse(ResolutionPolicy('first-bibtex-hit').is_satisfied({'crossref': plain}))
+        self.assertTrue(ResolutionPolicy('first-bibtex-hit').is_satisfied({'crossref': plain, 'dblp': bibtex}))
+        self.assertFalse(ResolutionPolicy('first-published-hit').is_satisfied({'dblp': bibtex}))
+        self.assertTrue(ResolutionPolicy('first-published-hit').is_satisfied({'crossref': published}))
+        self.assertFalse(ResolutionPolicy('quorum-2').is_satisfied({'dblp': plain}))
+        self.assertTrue(ResolutionPolicy('quorum-2').is_satisfied({'dblp': plain, 'crossref': plain}))
+
+    def test_reach(self):
+        self.assertEqual(ResolutionPolicy('all').reach(SOURCES), SOURCES)
+        self.assertEqual(ResolutionPolicy('first-bibtex-hit').reach(SOURCES), SOURCES[:1])
+        self.assertEqual(ResolutionPolicy('quorum-2').reach(SOURCES), SOURCES[:2])
+        self.assertEqual(ResolutionPolicy('quorum-9').reach(SOURCES), SOURCES)
+
+    def test_has_bibtex(self):
+        self.assertTrue(has_bibtex({'bibtex': '@misc{a}'}))
+        self.assertTrue(has_bibtex({'bibtex_pending': True}))
+        self.assertFalse(has_bibtex({'title': 'A'}))
+        self.assertFalse(has_bibtex(None))
+
+
+class FakeAPI:
+    """按预设结果返回的数据源，记录查询与批量调用"""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.calls = []
+        self.batches = []
+        self.batch_requests = 0
+
+    def search_paper(self, title=None, arxiv_id=None, doi=None):
+        self.calls.append(title)
+        return dict(self.result) if self.result else None
+
+    def batch(self, items):
+        self.batches.append(list(items))
+        self.batch_requests += 1
+
+    resolve_dois = search_titles = fetch_by_ids = batch
+
+    def fetch_batch(self, arxiv_ids=(), dois=()):
+        self.batch(list(arxiv_ids) + list(dois))
+
+
+def create_updater(policy, results=None):
+    config = {
+        'sources': {'priority': list(SOURCES), 'resolution': policy, 'crossref': {'batch_threshold': 1}},
+        'concurrency': {'max_workers': 1},
+        'circuit_breaker': {'enabled': False}
+    }
+    updater = AutoUpdater(config, Report())
+    results = results or {}
+    updater.apis = {source: FakeAPI(results.get(source)) for source in SOURCES}
+    return updater
+
+
+def arxiv_entry(index):
+    return {
+        'ID': f"paper{index}",
+        'ENTRYTYPE': 'article',
+        'title': f"Paper Number {index}",
+        'journal': f"arXiv preprint arXiv:2101.0000{index}",
+        'doi': f"10.1000/p{index}"
+    }
+
+
+class EarlyStopTest(unittest.TestCase):
+
+    def test_first_bibtex_hit_stops_after_hit(self):
+        updater = create_updater('first-bibtex-hit', {
+            'dblp': {'title': 'A', 'bibtex_pending': True},
+            'crossref': {'title': 'A', 'bibtex_pending': True}
+        })
+        results = updater._query_sources('Stop Early', '', '')
+        self.assertEqual(list(results), ['dblp'])
+        self.assertEqual([source for source, api in updater.apis.items() if api.calls],
+                         ['semantic-scholar', 'dblp'])
+        self.assertEqual((updater.source_calls, updater.source_calls_saved), (2, 3))
+
+    def test_quorum(self):
+        updater = create_updater('quorum-2', {
+            'semantic-scholar': {'title': 'A'}, 'crossref': {'title': 'A'}, 'pubmed': {'title': 'A'}
+        })
+        results = updater._query_sources('Quorum Title', '', '10.1/q')
+        self.assertEqual(list(results), ['semantic-scholar', 'crossref'])
+        self.assertEqual((updater.source_calls, updater.source_calls_saved), (3, 2))
+
+    def test_all_queries_every_source(self):
+        updater = create_updater('all', {'dblp': {'title': 'A', 'bibtex_pending': True}})
+        updater._query_sources('Everything', '', '10.1/all')
+        self.assertTrue(all(api.calls for api in updater.apis.values()))
+        self.assertEqual((updater.source_calls, updater.source_calls_saved), (5, 0))
+
+
+class PrefetchReachTest(unittest.TestCase):
+
+    def prefetch(self, policy):
+        updater = create_updater(policy)
+        with redirect_stdout(io.StringIO()):
+            updater._prefetch([arxiv_entry(1), arxiv_entry(2)])
+        return updater, [source for source, api in updater.apis.items() if api.batches]
+
+    def test_all_prefetches_every_batch_source(self):
+        updater, batched = self.prefetch('all')
+        self.assertEqual(batched, ['semantic-scholar', 'crossref', 'arxiv', 'pubmed'])
+        # 批量请求计入数据源调用次数
+        self.assertEqual(updater.source_calls, 4)
+
+    def test_first_hit_prefetches_first_source_only(self):
+        updater, batched = self.prefetch('first-bibtex-hit')
+        self.assertEqual(batched, ['semantic-scholar'])
+        self.assertEqual(updater.source_calls, 1)
+
+    def test_unreachable_sources_not_prefetched(self):
+        updater = create_updater('quorum-2')
+        updater.priority = ['dblp', 'pubmed', 'crossref']
+        with redirect_stdout(io.StringIO()):
+            updater._prefetch([arxiv_entry(1), arxiv_entry(2)])
+        self.assertEqual(len(updater.apis['pubmed'].batches), 1)
+        self.assertFalse(updater.apis['crossref'].batches)
+        self.assertFalse(updater.apis['semantic-scholar'].batches)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""自适应数据源调度：排序、跳过与探测、失败统计与持久化"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from checkers.auto_update import AutoUpdater
+from sources.aio import AsyncResponse, TrackedSession
+from utils.report import Report
+from utils.scheduler import SourceScheduler, query_kind
+
+
+HIT = {'title': 'A', 'is_published': True}
+BIBTEX_HIT = {'title': 'A', 'bibtex_pending': True}
+
+
+def feed(scheduler, source, count, result=None, latency=0.1, failed=False, kind='title'):
+    for _ in range(count):
+        scheduler.record(source, kind, result, latency, failed=failed)
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def test_query_kind(self):
+        self.assertEqual(query_kind('T', '2101.00001', '10.1/a'), 'doi')
+        self.assertEqual(query_kind('T', '2101.00001', ''), 'arxiv')
+        self.assertEqual(query_kind('T'), 'title')
+
+    def test_priority_order_without_stats(self):
+        scheduler = SourceScheduler()
+        self.assertEqual(scheduler.order(['dblp', 'crossref', 'arxiv'], 'title'), ['dblp', 'crossref', 'arxiv'])
+
+    def test_orders_by_latency_over_probability(self):
+        scheduler = SourceScheduler()
+        feed(scheduler, 'slow', 10, HIT, latency=3.0)
+        feed(scheduler, 'fast', 10, HIT, latency=0.1)
+        feed(scheduler, 'missing', 10, None, latency=0.1)
+        self.assertEqual(scheduler.order(['slow', 'missing', 'fast'], 'title'), ['fast', 'missing', 'slow'])
+        # 统计按标识类型分开
+        self.assertEqual(scheduler.order(['slow', 'fast'], 'doi'), ['slow', 'fast'])
+
+    def test_policy_selects_usable_results(self):
+        scheduler = SourceScheduler(policy='first-bibtex-hit')
+        feed(scheduler, 'published', 10, HIT)
+        feed(scheduler, 'bibtex', 10, BIBTEX_HIT)
+        self.assertEqual(scheduler.order(['published', 'bibtex'], 'title')[0], 'bibtex')
+
+    def test_skip_with_periodic_exploration(self):
+        scheduler = SourceScheduler(min_samples=10, skip_below=0.2, explore_every=3)
+        feed(scheduler, 'dead', 20, None)
+        orders = [scheduler.order(['dead', 'live'], 'title') for _ in range(6)]
+        self.assertEqual([order.count('dead') for order in orders], [0, 0, 1, 0, 0, 1])
+        self.assertEqual(scheduler.skipped['dead'], 4)
+
+    def test_preview_has_no_side_effects(self):
+        scheduler = SourceScheduler(min_samples=10, skip_below=0.2, explore_every=1)
+        feed(scheduler, 'dead', 20, None)
+        for _ in range(3):
+            self.assertEqual(scheduler.preview(['dead', 'live'], 'title'), ['live'])
+        self.assertEqual((scheduler.skipped, scheduler._passes), ({}, {}))
+        # explore_every=1 时 order 每次都会探测
+        self.assertEqual(scheduler.order(['dead', 'live'], 'title'), ['live', 'dead'])
+
+    def test_failures_lower_availability(self):
+        scheduler = SourceScheduler(min_samples=10, skip_below=0.05)
+        feed(scheduler, 'flaky', 10, HIT)
+        feed(scheduler, 'flaky', 10, failed=True)
+        feed(scheduler, 'steady', 10, HIT)
+        self.assertEqual(scheduler.order(['flaky', 'steady'], 'title'), ['steady', 'flaky'])
+        # 持续失败（故障）的数据源被跳过，但失败不计为"未找到"
+        feed(scheduler, 'down', 30, failed=True)
+        self.assertEqual(scheduler.preview(['down', 'steady'], 'title'), ['steady'])
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics['flaky']['hit_rate'], 1.0)
+        self.assertEqual(metrics['flaky']['failures'], 10)
+        self.assertEqual(metrics['down'], {'requests': 0, 'failures': 30, 'skipped': 0})
+
+    def test_old_samples_decay(self):
+        scheduler = SourceScheduler(min_samples=5, max_samples=20)
+        feed(scheduler, 'dblp', 21, HIT)
+        self.assertEqual(scheduler.stats['dblp']['title']['requests'], 10.5)
+
+    def test_persisted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'nested', 'scheduler.json')
+            scheduler = SourceScheduler(path=path)
+            feed(scheduler, 'fast', 10, HIT, latency=0.1)
+            scheduler.save()
+            self.assertEqual(SourceScheduler(path=path).order(['slow', 'fast'], 'title'), ['fast', 'slow'])
+
+
+class FakeSession:
+
+    def __init__(self, status):
+        self.headers = {}
+        self.status = status
+
+    def request(self, method, url, **kwargs):
+        return AsyncResponse(self.status, '', {}, url)
+
+
+class FakeAPI:
+    """cached=True 时不发请求（模拟缓存命中）"""
+
+    def __init__(self, status=200, result=None, cached=False):
+        self.session = TrackedSession(FakeSession(status))
+        self.result = result
+        self.cached = cached
+        self.batch_requests = 0
+
+    def search_paper(self, title=None, arxiv_id=None, doi=None):
+        if not self.cached:
+            self.session.request('GET', 'http://example.org/search')
+        return self.result
+
+
+class UpdaterRecordTest(unittest.TestCase):
+
+    def lookup(self, api, title):
+        updater = AutoUpdater({'sources': {'priority': ['dblp']}, 'circuit_breaker': {'enabled': False}},
+                              Report())
+        updater.apis = {'dblp': api}
+        updater.scheduler = SourceScheduler()
+        updater._search_source('dblp', title, '', '')
+        return updater.scheduler.stats.get('dblp', {}).get('title')
+
+    def test_network_results_recorded(self):
+        stats = self.lookup(FakeAPI(result=HIT), 'Network Hit')
+        self.assertEqual((stats['requests'], stats['hits'], stats['failures']), (1, 1, 0))
+
+    def test_failed_request_recorded_as_failure(self):
+        stats = self.lookup(FakeAPI(status=503), 'Outage')
+        self.assertEqual((stats['requests'], stats['failures']), (0, 1))
+
+    def test_cache_hits_not_recorded(self):
+        self.assertIsNone(self.lookup(FakeAPI(result=HIT, cached=True), 'Cached Hit'))
+
+
+class BatchAPI:
+
+    def __init__(self):
+        self.batch_requests = 0
+        self.titles = []
+
+    def search_titles(self, titles):
+        self.batch_requests += 1
+        self.titles.extend(titles)
+
+
+class PrefetchPreviewTest(unittest.TestCase):
+
+    def test_skipped_source_not_prefetched(self):
+        config = {'sources': {'priority': ['pubmed']}, 'circuit_breaker': {'enabled': False}}
+        entries = [{'ID': f"e{index}", 'ENTRYTYPE': 'article', 'title': f"Prefetch Paper {index}",
+                    'journal': 'arXiv preprint'} for index in range(2)]
+        for dead, expected in ((False, 1), (True, 0)):
+            updater = AutoUpdater(config, Report())
+            updater.apis = {'pubmed': BatchAPI()}
+            updater.scheduler = SourceScheduler(min_samples=10, skip_below=0.2)
+            if dead:
+                feed(updater.scheduler, 'pubmed', 20, None)
+            with redirect_stdout(io.StringIO()):
+                updater._prefetch(entries)
+            self.assertEqual(updater.apis['pubmed'].batch_requests, expected)
+            # 预取使用 preview，不占用探测名额
+            self.assertEqual(updater.scheduler.skipped, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
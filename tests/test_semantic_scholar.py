@@ -0,0 +1,98 @@
+"""Semantic Scholar POST /paper/batch 批量查询"""
+
+import json
+import unittest
+
+from sources.aio import AsyncResponse
+from sources.semantic_scholar import SemanticScholarAPI
+from utils.cache import MISSING, FileCache, MemoryCache, TieredCache
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+def paper(external_id):
+    return {
+        'paperId': f"id-{external_id}",
+        'title': f"Paper {external_id}",
+        'year': 2022,
+        'venue': 'ICLR',
+        'publicationTypes': ['Conference'],
+        'externalIds': {'DOI': '10.1/' + external_id.split(':', 1)[1]},
+        'citationStyles': {'bibtex': f"@inproceedings{{{external_id}}}"}
+    }
+
+
+class FakeSession:
+    """/paper/batch 按请求顺序返回论文，未知 ID（以 0 结尾）返回 null"""
+
+    def __init__(self, status=200, truncate=False):
+        self.headers = {}
+        self.status = status
+        self.truncate = truncate
+        self.posts = []
+
+    def post(self, url, params=None, **kwargs):
+        ids = kwargs['json']['ids']
+        self.posts.append(list(ids))
+        papers = [None if external_id.endswith('0') else paper(external_id) for external_id in ids]
+        if self.truncate:
+            papers = papers[:-1]
+        return AsyncResponse(self.status, json.dumps(papers), {}, url)
+
+    def get(self, url, **kwargs):
+        raise AssertionError(f"unexpected GET {url}")
+
+
+class FetchBatchTest(unittest.TestCase):
+
+    def create(self, session, batch_size=2):
+        cache = TieredCache(MemoryCache(100), FileCache({'enabled': False}))
+        api = SemanticScholarAPI({'sources': {'semantic_scholar': {'batch_size': batch_size, 'retry': 1}},
+                                  'circuit_breaker': {'enabled': False}}, cache=cache)
+        api.session = session
+        api.limiter = NoLimit()
+        return api, cache
+
+    def test_batches_arxiv_ids_and_dois(self):
+        session = FakeSession()
+        api, cache = self.create(session)
+        resolved = api.fetch_batch(arxiv_ids=['2101.00001', 'arXiv:2101.00001v2', '2101.00010'],
+                                   dois=['10.1/ABC'])
+        self.assertEqual(session.posts, [['arXiv:2101.00001', 'arXiv:2101.00010'], ['DOI:10.1/abc']])
+        self.assertEqual(api.batch_requests, 2)
+        result = resolved['semantic:arxiv:2101.00001']
+        # 批量结果已带 BibTeX，无需延迟获取
+        self.assertEqual(result['bibtex'], '@inproceedings{arXiv:2101.00001}')
+        self.assertFalse(result['bibtex_pending'])
+        self.assertIsNone(resolved['semantic:arxiv:2101.00010'])
+        self.assertIsNone(cache.get('semantic:arxiv:2101.00010', MISSING))
+
+        # search_paper 复用批量结果（FakeSession 拒绝 GET）
+        self.assertEqual(api.search_paper(arxiv_id='2101.00001v1')['venue'], 'ICLR')
+        self.assertEqual(api.search_paper(doi='https://doi.org/10.1/abc')['year'], '2022')
+        self.assertEqual(api.fetch_bibtex(result), '@inproceedings{arXiv:2101.00001}')
+
+    def test_cached_ids_skipped(self):
+        session = FakeSession()
+        api, cache = self.create(session)
+        cache.set('semantic:doi:10.1/abc', None)
+        resolved = api.fetch_batch(dois=['10.1/abc', '10.1/def'])
+        self.assertEqual(session.posts, [['DOI:10.1/def']])
+        self.assertIsNone(resolved['semantic:doi:10.1/abc'])
+
+    def test_failed_or_misaligned_response_not_cached(self):
+        for session in (FakeSession(status=500), FakeSession(truncate=True)):
+            api, cache = self.create(session)
+            self.assertEqual(api.fetch_batch(arxiv_ids=['2101.00001', '2101.00002']), {})
+            self.assertIs(cache.get('semantic:arxiv:2101.00001', MISSING), MISSING)
+
+
+if __name__ == '__main__':
+    unittest.main()
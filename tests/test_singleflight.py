@@ -0,0 +1,132 @@
+"""SingleFlight 请求合并与并发的相同数据源查询"""
+
+import threading
+import unittest
+
+from checkers.auto_update import AutoUpdater
+from utils.report import Report
+from utils.singleflight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow(value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return value * 2
+
+        results = []
+
+        def worker():
+            results.append(flight.do('key', slow, 21))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        self.assertTrue(started.wait(5))
+        followers = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        # 等待跟随者进入等待状态后再放行
+        while flight.coalesced < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(calls, [21])
+        self.assertEqual(sorted(results), [(42, False), (42, True), (42, True), (42, True)])
+
+    def test_key_released_after_completion(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('key', lambda: 1), (1, False))
+        self.assertEqual(flight.do('key', lambda: 2), (2, False))
+        self.assertEqual(flight.coalesced, 0)
+
+    def test_different_keys_run_independently(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('a', lambda: 'a'), ('a', False))
+        self.assertEqual(flight.do('b', lambda: 'b'), ('b', False))
+
+    def test_error_propagates_to_waiters(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def failing():
+            started.set()
+            release.wait(5)
+            raise ValueError('boom')
+
+        def worker():
+            try:
+                flight.do('key', failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        self.assertTrue(started.wait(5))
+        follower = threading.Thread(target=worker)
+        follower.start()
+        while flight.coalesced < 1:
+            threading.Event().wait(0.01)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(errors, ['boom', 'boom'])
+        # 失败后键已释放，下一次调用重新执行
+        self.assertEqual(flight.do('key', lambda: 'ok'), ('ok', False))
+
+
+class CoalescedLookupTest(unittest.TestCase):
+
+    def test_concurrent_identical_lookups_query_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowAPI:
+            batch_requests = 0
+            calls = 0
+
+            def search_paper(self, title=None, arxiv_id=None, doi=None):
+                SlowAPI.calls += 1
+                started.set()
+                release.wait(5)
+                return {'title': title}
+
+        updater = AutoUpdater({'sources': {'priority': ['dblp']}, 'circuit_breaker': {'enabled': False}},
+                              Report())
+        updater.apis = {'dblp': SlowAPI()}
+        updater.flight = SingleFlight()
+        results = []
+
+        def worker():
+            results.append(updater._search_source('dblp', 'Coalesced Paper', '2101.00005', ''))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        while updater.flight.coalesced < 2:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(SlowAPI.calls, 1)
+        self.assertEqual(results, [{'title': 'Coalesced Paper'}] * 3)
+        self.assertEqual(updater.coalesced, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""离线快照：写入 / 读取往返、只读缓存与离线运行的未覆盖条目"""
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from checkers.auto_update import AutoUpdater
+from sources.aio import OfflineSession
+from utils.cache import MISSING, MemoryCache, create_cache
+from utils.report import Report
+from utils.snapshot import RecordingCache, SnapshotCache, read_snapshot, write_snapshot
+
+
+class NoLimit:
+
+    def acquire(self):
+        pass
+
+    def backoff(self, retry_after=None, attempt=0):
+        pass
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'cache.snapshot.gz')
+
+    def test_round_trip_deduplicates_objects(self):
+        records = {
+            'dblp:doi:10.1/a': {'title': 'A', 'year': '2020'},
+            'crossref:doi:10.1/a': {'year': '2020', 'title': 'A'},
+            'pubmed:title:missing': None
+        }
+        self.assertEqual(write_snapshot(self.path, records), (3, 2))
+        self.assertEqual(read_snapshot(self.path), records)
+
+    def test_unsupported_version(self):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump({'version': 99, 'keys': {}, 'objects': {}}, f)
+        with self.assertRaises(ValueError):
+            read_snapshot(self.path)
+
+    def test_snapshot_cache_is_read_only(self):
+        write_snapshot(self.path, {'key': 'value', 'negative': None})
+        cache = SnapshotCache(self.path)
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertIsNone(cache.get('negative', MISSING))
+        self.assertIs(cache.get('other', MISSING), MISSING)
+        cache.set('other', 'value')
+        self.assertIs(cache.get('other', MISSING), MISSING)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_recording_cache_collects_reads_and_writes(self):
+        backend = MemoryCache(10)
+        backend.set('existing', 'value')
+        cache = RecordingCache(backend)
+        cache.set('written', 1)
+        self.assertEqual(cache.get('written'), 1)
+        self.assertIsNone(cache.get('absent'))
+        self.assertEqual(cache.get('existing'), 'value')
+        self.assertEqual(cache.records, {'written': 1, 'existing': 'value'})
+
+    def test_offline_run_reports_uncovered_entries(self):
+        write_snapshot(self.path, {
+            'dblp:title:covered paper': {
+                'title': 'Covered Paper', 'venue': 'ICML', 'year': '2021', 'doi': '',
+                'publication_type': 'conference', 'bibtex': '', 'bibtex_pending': False
+            }
+        })
+        config = {
+            'sources': {'priority': ['dblp']},
+            'cache': {'offline': True, 'snapshot': self.path},
+            'circuit_breaker': {'enabled': False}
+        }
+        self.assertIsInstance(create_cache(config['cache']).backend, SnapshotCache)
+        report = Report()
+        updater = AutoUpdater(config, report)
+        updater.apis = {'dblp': updater.apis['dblp']}
+        updater.apis['dblp'].limiter = NoLimit()
+        self.assertIsInstance(updater.apis['dblp'].session, OfflineSession)
+
+        covered = {'ID': 'covered', 'ENTRYTYPE': 'article', 'title': 'Covered Paper', 'journal': 'arXiv'}
+        uncovered = {'ID': 'uncovered', 'ENTRYTYPE': 'article', 'title': 'Uncovered Paper', 'journal': 'arXiv'}
+        self.assertTrue(updater._update_entry(covered))
+        self.assertFalse(updater._update_entry(uncovered))
+
+        self.assertEqual(covered['booktitle'], 'ICML')
+        self.assertEqual([miss['entry_id'] for miss in report.snapshot_misses], ['uncovered'])
+        self.assertTrue(report.snapshot_misses[0]['requests'][0].startswith('https://dblp.org/'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""SpliceWriter 拼接写回：未修改的条目保留原始字节"""
+
+import io
+import os
+import tempfile
+import unittest
+
+from utils.bib_parser import BibParser
+from utils.bib_stream import BibStream, SpliceWriter, scan_records
+
+
+SAMPLE = (
+    b'% leading comment\n'
+    b'@string{icml = "International Conference on Machine Learning"}\n'
+    b'\n'
+    b'@preamble{"\\newcommand{\\noop}[1]{}"}\n'
+    b'@article{alpha,\n'
+    b'  title   = {Alpha {Nested} Title},\n'
+    b'  author  = {Doe, Jane},\n'
+    b'  year    = {2020},\n'
+    b'}\n'
+    b'\n'
+    b'@comment{ignored @article{not, an = entry} }\n'
+    b'@inproceedings(beta,\n'
+    b'    title = "Beta Title",\n'
+    b'    booktitle = icml,\n'
+    b'    year = 2021)\n'
+    b'trailing text\n'
+)
+
+
+class SpliceWriterTest(unittest.TestCase):
+
+    def splice(self, buffer, modify=None):
+        out = io.BytesIO()
+        writer = SpliceWriter(buffer, out, lambda entry: '@misc{%s,\n  note = {%s}\n}\n' % (
+            entry['ID'], entry.get('note', '')))
+        with BibStream(buffer) as stream:
+            for item in stream:
+                original = dict(item.entry)
+                if modify:
+                    modify(item.entry)
+                writer.write_entry(item.entry, original, item.start, item.end)
+        writer.finish()
+        return out.getvalue(), writer
+
+    def test_unmodified_is_byte_identical(self):
+        output, writer = self.splice(SAMPLE)
+        self.assertEqual(output, SAMPLE)
+        self.assertEqual((writer.copied, writer.rewritten), (2, 0))
+
+    def test_only_modified_entry_rewritten(self):
+        def modify(entry):
+            if entry['ID'] == 'beta':
+                entry['note'] = 'changed'
+
+        output, writer = self.splice(SAMPLE, modify)
+        self.assertEqual((writer.copied, writer.rewritten), (1, 1))
+        beta = list(scan_records(SAMPLE))[4]
+        self.assertEqual(output[:beta.start], SAMPLE[:beta.start])
+        self.assertEqual(output[beta.start:], b'@misc{beta,\n  note = {changed}\n}\ntrailing text\n')
+
+    def test_crlf_preserved(self):
+        crlf = SAMPLE.replace(b'\n', b'\r\n')
+
+        def modify(entry):
+            entry['note'] = 'x'
+
+        output, _ = self.splice(crlf, modify)
+        self.assertNotIn(b'\n', output.replace(b'\r\n', b''))
+        self.assertTrue(output.startswith(b'% leading comment\r\n@string'))
+
+
+class BibParserSpliceTest(unittest.TestCase):
+
+    def test_write_file_preserves_untouched_entries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'refs.bib')
+            with open(path, 'wb') as f:
+                f.write(SAMPLE)
+            parser = BibParser()
+            database = parser.parse_file(path)
+            self.assertEqual(len(database.entries), 2)
+
+            out_path = os.path.join(tmpdir, 'out.bib')
+            parser.write_file(database, out_path)
+            with open(out_path, 'rb') as f:
+                self.assertEqual(f.read(), SAMPLE)
+
+            database.entries[0]['year'] = '2022'
+            parser.write_file(database, out_path)
+            with open(out_path, 'rb') as f:
+                output = f.read()
+            alpha = list(scan_records(SAMPLE))[2]
+            self.assertEqual(output[:alpha.start], SAMPLE[:alpha.start])
+            self.assertIn(b'2022', output)
+            self.assertTrue(output.endswith(SAMPLE[alpha.end:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""AIMD 自适应并发：按数据源 / 链接主机根据 429、5xx 与超时调整同时在途的请求数"""
+
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+
+
+class AIMDLimiter:
+    """加性增、乘性减的并发上限（可调整的信号量）
+
+    每完成 limit 个成功请求且期间并发已达到上限时，上限加 1；
+    收到 429、5xx 或超时时上限乘以 decrease_factor（不低于 min_limit）。
+    一次降低之前已发出的请求再次失败时不重复降低，避免同一波拥塞被多次计入。
+    上限的每次变化记录在 trajectory 中（相对创建时间的秒数）。
+    """
+
+    def __init__(self, name, initial=4, min_limit=1, max_limit=32, decrease_factor=0.5, history=200):
+        self.name = name
+        self.min_limit = max(int(min_limit), 1)
+        self.max_limit = max(int(max_limit), self.min_limit)
+        self.limit = min(max(int(initial), self.min_limit), self.max_limit)
+        self.decrease_factor = min(max(float(decrease_factor), 0.1), 0.9)
+        self.inflight = 0
+        self.requests = 0
+        self.congested = 0
+        self.increases = 0
+        self.decreases = 0
+        self.wait_seconds = 0.0
+        self._issued = 0
+        self._recovery_ticket = 0
+        self._successes = 0
+        self._saturated = False
+        self._started = time.monotonic()
+        self.trajectory = deque([(0.0, self.limit)], maxlen=history)
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """占用一个并发名额（必要时等待），返回用于 release() 的请求序号"""
+        with self._cond:
+            start = time.monotonic()
+            while self.inflight >= self.limit:
+                self._cond.wait()
+            self.wait_seconds += time.monotonic() - start
+            self.inflight += 1
+            self.requests += 1
+            if self.inflight >= self.limit:
+                self._saturated = True
+            self._issued += 1
+            return self._issued
+
+    def release(self, ticket, congested=None):
+        """释放名额；congested 为 True 表示拥塞信号，False 表示成功，None 不参与调整"""
+        with self._cond:
+            self.inflight -= 1
+            if congested:
+                self.congested += 1
+                if ticket > self._recovery_ticket:
+                    self._decrease()
+            elif congested is not None:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self._successes = 0
+                    if self._saturated:
+                        self._increase()
+                    self._saturated = False
+            self._cond.notify_all()
+
+    def _increase(self):
+        if self.limit < self.max_limit:
+            self.limit += 1
+            self.increases += 1
+            self._record()
+
+    def _decrease(self):
+        self._recovery_ticket = self._issued
+        self._successes = 0
+        self._saturated = False
+        limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if limit < self.limit:
+            self.limit = limit
+            self.decreases += 1
+            self._record()
+
+    def _record(self):
+        self.trajectory.append((round(time.monotonic() - self._started, 3), self.limit))
+
+    def metrics(self):
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'peak': max(limit for _, limit in self.trajectory),
+                'requests': self.requests,
+                'congested': self.congested,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'wait_seconds': round(self.wait_seconds, 3),
+                'trajectory': [list(point) for point in self.trajectory]
+            }
+
+
+def is_congested(response):
+    """429 与 5xx 视为拥塞信号"""
+    return response.status_code == 429 or response.status_code >= 500
+
+
+class AdaptiveSession:
+    """按 AIMD 上限限制并发的会话包装
+
+    resolve(url) 返回该请求使用的 AIMDLimiter（数据源会话固定为同一个，
+    链接检查按主机区分）；超时计为拥塞，其他异常不参与调整。
+    """
+
+    def __init__(self, session, resolve):
+        self.session = session
+        self.resolve = resolve
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def request(self, method, url, **kwargs):
+        limiter = self.resolve(url)
+        ticket = limiter.acquire()
+        congested = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+            congested = is_congested(response)
+            return response
+        except requests.exceptions.Timeout:
+            congested = True
+            raise
+        finally:
+            limiter.release(ticket, congested)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def adaptive_enabled(config):
+    """是否启用自适应并发（concurrency.adaptive.enabled）"""
+    return bool(config.get('concurrency', {}).get('adaptive', {}).get('enabled', False))
+
+
+def max_concurrency(config):
+    """工作线程数：启用自适应并发时取 max_limit，否则为固定的 max_workers"""
+    concurrency = config.get('concurrency', {})
+    if adaptive_enabled(config):
+        return max(int(concurrency.get('adaptive', {}).get('max_limit', 32)), 1)
+    return concurrency.get('max_workers', 4)
+
+
+def get_aimd(name, config):
+    """获取（或创建）共享的 AIMD 并发上限；未启用时返回 None"""
+    if not adaptive_enabled(config):
+        return None
+    concurrency = config.get('concurrency', {})
+    adaptive = concurrency.get('adaptive', {})
+    with _registry_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = AIMDLimiter(
+                name,
+                initial=adaptive.get('initial') or concurrency.get('max_workers', 4),
+                min_limit=adaptive.get('min_limit', 1),
+                max_limit=adaptive.get('max_limit', 32),
+                decrease_factor=adaptive.get('decrease_factor', 0.5)
+            )
+        return limiter
+
+
+def link_host(url):
+    """链接检查的并发按主机区分"""
+    return f"link:{urlsplit(url).netloc.lower()}"
+
+
+def aimd_metrics(names=None, prefix=None):
+    """各 AIMD 上限的当前值、调整次数与轨迹"""
+    with _registry_lock:
+        limiters = dict(_limiters)
+    return {
+        name: limiter.metrics()
+        for name, limiter in limiters.items()
+        if (names is None or name in names) and (prefix is None or name.startswith(prefix))
+    }
@@ -5,31 +5,63 @@ from bibtexparser.bparser import BibTexParser
 from bibtexparser.bwriter import BibTexWriter
 from bibtexparser.bibdatabase import BibDatabase
 
+from utils.bib_stream import BibStream, SpliceWriter, entry_spans
+
+
+class BibSource:
+    """解析时记录的源文件信息，用于拼接写回
+
+    raw 为源文件字节，spans 为各条目的字节区间，entries 为解析得到的条目（引用），
+    originals 为解析时的条目副本，用于判断条目是否被修改。
+    """
+
+    def __init__(self, raw, spans, entries):
+        self.raw = raw
+        self.spans = spans
+        self.entries = list(entries)
+        self.originals = [dict(entry) for entry in entries]
+
+    def matches(self, bib_database):
+        """数据库的条目列表未增删、未替换时才能拼接写回"""
+        entries = bib_database.entries
+        return len(entries) == len(self.entries) and all(a is b for a, b in zip(entries, self.entries))
+
 
 class BibParser:
     """BibTeX 解析器"""
     
     def __init__(self):
         """初始化解析器"""
-        self.parser = BibTexParser(common_strings=True)
-        self.parser.ignore_nonstandard_types = False
-        self.parser.homogenize_fields = True
+        self.parser = self._create_parser()
         
         self.writer = BibTexWriter()
         self.writer.indent = '  '
         self.writer.order_entries_by = None
     
+    def _create_parser(self):
+        """创建 bibtexparser 解析器"""
+        parser = BibTexParser(common_strings=True)
+        parser.ignore_nonstandard_types = False
+        parser.homogenize_fields = True
+        return parser
+
     def parse_file(self, filepath):
-        """解析 BibTeX 文件"""
+        """解析 BibTeX 文件（.bib 文件同时记录各条目的源文件区间，供拼接写回）"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            # 与文本模式读取一致：统一换行符
+            content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             
             # 如果是 .tex 文件，提取其中的 .bib 内容
             if filepath.endswith('.tex'):
                 content = self._extract_bib_from_tex(content)
             
             bib_database = bibtexparser.loads(content, parser=self.parser)
+            if not filepath.endswith('.tex'):
+                spans = entry_spans(raw, bib_database.entries)
+                if spans is not None:
+                    bib_database.source = BibSource(raw, spans, bib_database.entries)
             return bib_database
         except Exception as e:
             print(f"解析文件出错: {e}")
@@ -42,6 +74,10 @@ class BibParser:
         # 这里假设用户会直接传入 .bib 文件
         return content
     
+    def stream_file(self, filepath):
+        """流式解析 BibTeX 文件，返回逐条目产出 StreamEntry 的 BibStream"""
+        return BibStream(filepath, parser=self._create_parser())
+    
     def parse_string(self, content):
         """解析 BibTeX 字符串"""
         try:
@@ -52,8 +88,21 @@ class BibParser:
             return None
     
     def write_file(self, bib_database, filepath):
-        """写入 BibTeX 文件"""
+        """写入 BibTeX 文件
+
+        由 parse_file 解析的数据库拼接写回：未修改的条目保留源文件原文，
+        只重新序列化修改过的条目；条目被增删时完整重写。
+        """
         try:
+            source = getattr(bib_database, 'source', None)
+            if source is not None and source.matches(bib_database):
+                with open(filepath, 'wb') as f:
+                    writer = SpliceWriter(source.raw, f, self.entry_to_string)
+                    for entry, original, (start, end) in zip(bib_database.entries, source.originals,
+                                                              source.spans):
+                        writer.write_entry(entry, original, start, end)
+                    writer.finish()
+                return True
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(self.writer.write(bib_database))
             return True
@@ -61,6 +110,12 @@ class BibParser:
             print(f"写入文件出错: {e}")
             return False
     
+    def entry_to_string(self, entry):
+        """序列化单个条目"""
+        bib_database = BibDatabase()
+        bib_database.entries = [entry]
+        return self.writer.write(bib_database)
+    
     def to_string(self, bib_database):
         """转换为字符串"""
         return self.writer.write(bib_database)
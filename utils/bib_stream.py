@@ -0,0 +1,199 @@
+"""流式 BibTeX 解析：逐条目产出，内存占用与文件大小无关"""
+
+import mmap
+import re
+from collections import namedtuple
+
+from bibtexparser.bparser import BibTexParser
+
+
+# 条目及其在源文件中的字节区间 [start, end)
+StreamEntry = namedtuple('StreamEntry', ['entry', 'start', 'end'])
+# 记录类型（小写，如 article / string / preamble / comment）及字节区间
+BibRecord = namedtuple('BibRecord', ['kind', 'start', 'end'])
+
+_RECORD_HEAD = re.compile(rb'@[ \t\r\n]*([A-Za-z][\w-]*)[ \t\r\n]*([{(])')
+_RECORD_KEY = re.compile(rb'[ \t\r\n]*([^,\s]*)')
+# 不产生条目的记录类型
+NON_ENTRY_KINDS = ('string', 'preamble', 'comment')
+_BRACES = re.compile(rb'[{}]')
+_BRACES_PARENS = re.compile(rb'[{})]')
+
+
+def scan_records(buffer, start=0):
+    """在 bytes / mmap 中按 @type{...} 切分记录，只扫描花括号，不构建任何对象
+
+    记录外的文本按 BibTeX 规则视为注释忽略；未闭合的记录延伸到文件末尾。
+    """
+    pos = start
+    size = len(buffer)
+    while pos < size:
+        at = buffer.find(b'@', pos)
+        if at < 0:
+            return
+        head = _RECORD_HEAD.match(buffer, at)
+        if head is None:
+            pos = at + 1
+            continue
+        end = _record_end(buffer, head.end(), head.group(2) == b'(')
+        yield BibRecord(head.group(1).decode('ascii').lower(), at, end)
+        pos = end
+
+
+def entry_spans(buffer, entries):
+    """将解析得到的条目与源文件中的记录区间一一对应
+
+    条目数或条目 ID 与源文件记录不一致（如部分记录解析失败）时返回 None。
+    """
+    spans = []
+    for record in scan_records(buffer):
+        if record.kind in NON_ENTRY_KINDS:
+            continue
+        if len(spans) >= len(entries):
+            return None
+        head = _RECORD_HEAD.match(buffer, record.start)
+        key = _RECORD_KEY.match(buffer, head.end()).group(1).decode('utf-8', 'replace')
+        if key != entries[len(spans)].get('ID', ''):
+            return None
+        spans.append((record.start, record.end))
+    return spans if len(spans) == len(entries) else None
+
+
+def _record_end(buffer, pos, paren):
+    """返回与开头定界符匹配的结束位置（之后一个字节）"""
+    depth = 0
+    pattern = _BRACES_PARENS if paren else _BRACES
+    for match in pattern.finditer(buffer, pos):
+        char = match.group()
+        if char == b'{':
+            depth += 1
+        elif char == b'}':
+            if depth == 0 and not paren:
+                return match.end()
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            return match.end()
+    return len(buffer)
+
+
+class BibStream:
+    """逐条目解析 BibTeX 文件
+
+    文件以 mmap 方式读取，entries() 每次产出一个 StreamEntry（条目 dict 与字节区间）。
+    @string 宏会累积并用于后续条目的插值，@preamble 保存在 preambles 中，
+    @comment 只计数不保存。也可直接传入 bytes / mmap 缓冲区。
+    """
+
+    def __init__(self, source, parser=None, encoding='utf-8'):
+        self.encoding = encoding
+        self.parser = parser or self._default_parser()
+        self.parser.expect_multiple_parse = True
+        self.preambles = []
+        self.comments = 0
+        self.errors = 0
+        self._file = None
+        self._mmap = None
+        if isinstance(source, (bytes, bytearray, mmap.mmap)):
+            self.buffer = source
+        else:
+            self._file = open(source, 'rb')
+            if self._file.seek(0, 2) == 0:
+                # 空文件无法 mmap
+                self.buffer = b''
+            else:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.buffer = self._mmap
+
+    @staticmethod
+    def _default_parser():
+        parser = BibTexParser(common_strings=True)
+        parser.ignore_nonstandard_types = False
+        parser.homogenize_fields = True
+        return parser
+
+    @property
+    def strings(self):
+        """已读取的 @string 宏"""
+        return self.parser.bib_database.strings
+
+    def records(self):
+        """逐个产出原始记录（不解析字段）"""
+        return scan_records(self.buffer)
+
+    def entries(self):
+        """逐个产出解析后的条目"""
+        database = self.parser.bib_database
+        for record in self.records():
+            if record.kind == 'comment':
+                self.comments += 1
+                continue
+            text = bytes(self.buffer[record.start:record.end]).decode(self.encoding)
+            try:
+                self.parser.parse(text, partial=True)
+            except Exception:
+                self.errors += 1
+                continue
+            if record.kind == 'preamble':
+                self.preambles.extend(database.preambles)
+            elif record.kind not in NON_ENTRY_KINDS:
+                if database.entries:
+                    yield StreamEntry(database.entries[-1], record.start, record.end)
+                else:
+                    self.errors += 1
+            # 解析结果不在解析器中累积，只保留 @string 宏
+            database.entries.clear()
+            database.preambles.clear()
+            database.comments.clear()
+
+    def __iter__(self):
+        return self.entries()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class SpliceWriter:
+    """拼接写回：未修改的条目原样复制源文件字节，只重新序列化修改过的条目
+
+    条目之间的注释、@string、空白等内容同样原样保留，写回后的 diff 只包含真正修改的条目。
+    条目需按源文件顺序依次写入，最后调用 finish() 复制剩余内容。
+    """
+
+    def __init__(self, buffer, out, serialize, encoding='utf-8'):
+        self.buffer = buffer
+        self.out = out
+        self.serialize = serialize
+        self.encoding = encoding
+        # 重新序列化的条目沿用源文件的换行符
+        self.newline = '\r\n' if buffer.find(b'\r\n') >= 0 else '\n'
+        self.position = 0
+        self.rewritten = 0
+        self.copied = 0
+
+    def write_entry(self, entry, original, start, end):
+        """写入 [position, start) 的原始内容，以及条目本身（未修改时为原始字节）"""
+        self.out.write(self.buffer[self.position:start])
+        if entry == original:
+            self.out.write(self.buffer[start:end])
+            self.copied += 1
+        else:
+            text = self.serialize(entry).rstrip('\n').replace('\n', self.newline)
+            self.out.write(text.encode(self.encoding))
+            self.rewritten += 1
+        self.position = end
+
+    def finish(self):
+        self.out.write(self.buffer[self.position:])
+        self.position = len(self.buffer)
@@ -1,10 +1,62 @@
 """简单文件缓存"""
 
+import atexit
 import json
 import os
 import time
 import hashlib
+import sqlite3
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+# get() 的默认哨兵：区分"未缓存"与"已缓存为 None（确认不存在）"
+MISSING = object()
+
+# 线程局部状态：过期条目跟踪与缓存绕过（后台刷新时使用）
+_state = threading.local()
+
+
+def _note_stale(key):
+    scope = getattr(_state, 'stale', None)
+    if scope is not None:
+        scope.append(key)
+
+
+def _bypassed():
+    return getattr(_state, 'bypass', False)
+
+
+@contextmanager
+def track_stale():
+    """收集当前线程在 with 块内读到的过期（stale）缓存键"""
+    previous = getattr(_state, 'stale', None)
+    scope = []
+    _state.stale = scope
+    try:
+        yield scope
+    finally:
+        _state.stale = previous
+        if previous is not None:
+            previous.extend(scope)
+
+
+@contextmanager
+def bypass_cache():
+    """with 块内当前线程的缓存读取一律未命中（写入照常），用于强制刷新"""
+    previous = _bypassed()
+    _state.bypass = True
+    try:
+        yield
+    finally:
+        _state.bypass = previous
+
+
+def _serve_stale(config):
+    """读取 stale-while-revalidate 配置：(是否启用, 允许的最大过期秒数)"""
+    return bool(config.get('stale_while_revalidate', False)), int(config.get('max_stale', 604800))
 
 
 class FileCache:
@@ -14,34 +66,50 @@ class FileCache:
         self.enabled = bool(config.get('enabled', False))
         self.cache_dir = config.get('dir', '.cache/bib-check')
         self.ttl = int(config.get('ttl', 86400))
+        self.negative_ttl = int(config.get('negative_ttl', 604800))
+        self.stale_while_revalidate, self.max_stale = _serve_stale(config)
         self.max_size_mb = int(config.get('max_size_mb', 200))
         self._lock = threading.Lock()
 
         if self.enabled:
             os.makedirs(self.cache_dir, exist_ok=True)
 
-    def get(self, key):
-        if not self.enabled:
-            return None
+    def get(self, key, default=None):
+        """读取缓存；未命中返回 default，负缓存条目返回 None
+
+        启用 stale_while_revalidate 时，过期不超过 max_stale 秒的条目照常返回，
+        并记录到 track_stale() 中，由调用方安排后台刷新。
+        """
+        if not self.enabled or _bypassed():
+            return default
         path = self._key_to_path(key)
         if not os.path.exists(path):
-            return None
+            return default
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             timestamp = data.get('ts', 0)
-            if self.ttl > 0 and (time.time() - timestamp) > self.ttl:
-                self._safe_remove(path)
-                return None
-            return data.get('value')
+            ttl = self.negative_ttl if data.get('negative') else self.ttl
+            age = time.time() - timestamp
+            if ttl > 0 and age > ttl:
+                if not self._within_max_stale(age - ttl):
+                    self._safe_remove(path)
+                    return default
+                _note_stale(key)
+            if 'value' not in data:
+                return default
+            return data['value']
         except Exception:
-            return None
+            return default
 
     def set(self, key, value):
+        """写入缓存；value 为 None 时写入负缓存条目（使用 negative_ttl）"""
         if not self.enabled:
             return
         path = self._key_to_path(key)
         payload = {'ts': time.time(), 'value': value}
+        if value is None:
+            payload['negative'] = True
         with self._lock:
             try:
                 os.makedirs(self.cache_dir, exist_ok=True)
@@ -51,6 +119,9 @@ class FileCache:
             except Exception:
                 return
 
+    def _within_max_stale(self, staleness):
+        return self.stale_while_revalidate and (self.max_stale <= 0 or staleness <= self.max_stale)
+
     def _key_to_path(self, key):
         digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
         return os.path.join(self.cache_dir, f"{digest}.json")
@@ -85,3 +156,330 @@ class FileCache:
             os.remove(path)
         except Exception:
             return
+
+
+class SQLiteCache:
+    """基于单个 SQLite 文件（WAL 模式）的缓存，接口与 FileCache 相同
+
+    过期时间与最近访问时间均建有索引：过期条目按索引批量清理，
+    超出容量时按最近访问时间增量淘汰，写入代价与缓存规模无关。
+    """
+
+    EVICT_BATCH = 64
+    PURGE_INTERVAL = 256
+
+    def __init__(self, config):
+        self.enabled = bool(config.get('enabled', False))
+        self.cache_dir = config.get('dir', '.cache/bib-check')
+        self.path = config.get('path') or os.path.join(self.cache_dir, 'cache.sqlite3')
+        self.ttl = int(config.get('ttl', 86400))
+        self.negative_ttl = int(config.get('negative_ttl', 604800))
+        self.stale_while_revalidate, self.max_stale = _serve_stale(config)
+        self.max_size_mb = int(config.get('max_size_mb', 200))
+        self._lock = threading.Lock()
+        self._conn = None
+        self._total_size = 0
+        self._writes = 0
+
+        if self.enabled:
+            self._open()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 连接在线程池间共享，由 self._lock 串行化访问
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, ts REAL NOT NULL, '
+            'expires REAL, accessed REAL NOT NULL, size INTEGER NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed)')
+        self._conn = conn
+        self._total_size = self._query_total_size()
+
+    def get(self, key, default=None):
+        """读取缓存；未命中返回 default，负缓存条目（存储为 JSON null）返回 None"""
+        if not self.enabled or self._conn is None or _bypassed():
+            return default
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    'SELECT value, expires FROM cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return default
+                value, expires = row
+                if expires is not None and expires < now:
+                    if not self._within_max_stale(now - expires):
+                        self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                        return default
+                    _note_stale(key)
+                self._conn.execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, key))
+                return json.loads(value)
+            except Exception:
+                return default
+
+    def set(self, key, value):
+        if not self.enabled or self._conn is None:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                payload = json.dumps(value, ensure_ascii=False)
+                size = len(key) + len(payload.encode('utf-8'))
+                ttl = self.negative_ttl if value is None else self.ttl
+                expires = now + ttl if ttl > 0 else None
+                old = self._conn.execute('SELECT size FROM cache WHERE key = ?', (key,)).fetchone()
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, value, ts, expires, accessed, size) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, payload, now, expires, now, size)
+                )
+                self._total_size += size - (old[0] if old else 0)
+                self._writes += 1
+                if self._writes % self.PURGE_INTERVAL == 0:
+                    self._purge_expired(now)
+                self._evict_if_needed()
+            except Exception:
+                return
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _query_total_size(self):
+        return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+
+    def _within_max_stale(self, staleness):
+        return self.stale_while_revalidate and (self.max_stale <= 0 or staleness <= self.max_stale)
+
+    def _purge_expired(self, now):
+        if self.stale_while_revalidate:
+            # 仍可作为过期条目返回的记录暂不清理
+            if self.max_stale <= 0:
+                return
+            now -= self.max_stale
+        self._conn.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?', (now,))
+        # 其他进程可能共享同一数据库，清理后重新统计容量
+        self._total_size = self._query_total_size()
+
+    def _evict_if_needed(self):
+        if self.max_size_mb <= 0:
+            return
+        max_bytes = self.max_size_mb * 1024 * 1024
+        while self._total_size > max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM cache ORDER BY accessed LIMIT ?', (self.EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                self._total_size = 0
+                return
+            for key, size in rows:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._total_size -= size
+                if self._total_size <= max_bytes:
+                    return
+
+
+class MemoryCache:
+    """进程内有界 LRU 缓存"""
+
+    def __init__(self, max_items=1024, ttl=0, negative_ttl=0):
+        self.max_items = max(int(max_items), 1)
+        self.ttl = int(ttl)
+        self.negative_ttl = int(negative_ttl)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        if _bypassed():
+            return default
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            timestamp, value = item
+            ttl = self.negative_ttl if value is None else self.ttl
+            if ttl > 0 and (time.time() - timestamp) > ttl:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache:
+    """内存 LRU 层 + 磁盘层（FileCache / SQLiteCache）
+
+    读取先查内存层，磁盘命中后回填内存层；写入同时写两层。
+    磁盘层未启用时内存层仍在单次运行内去重重复查询。
+    """
+
+    def __init__(self, memory, backend):
+        self.memory = memory
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.stale_hits = 0
+
+    @property
+    def enabled(self):
+        return self.backend.enabled
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        if not self.backend.enabled:
+            return default
+        with track_stale() as stale:
+            value = self.backend.get(key, MISSING)
+        with self._lock:
+            if value is MISSING:
+                self.disk_misses += 1
+            else:
+                self.disk_hits += 1
+        if value is MISSING:
+            return default
+        if stale:
+            # 过期条目不回填内存层，刷新完成后由 set() 写入新值
+            with self._lock:
+                self.stale_hits += 1
+            return value
+        self.memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self.backend.set(key, value)
+
+    def reset_stats(self):
+        with self._lock:
+            self.memory.hits = self.memory.misses = 0
+            self.disk_hits = self.disk_misses = self.stale_hits = 0
+
+    def stats(self):
+        """各层命中统计"""
+        with self._lock:
+            return {
+                'memory': {'hits': self.memory.hits, 'misses': self.memory.misses, 'items': len(self.memory)},
+                'disk': {'hits': self.disk_hits, 'misses': self.disk_misses, 'stale': self.stale_hits,
+                         'enabled': self.backend.enabled}
+            }
+
+
+def create_cache(config):
+    """按 cache.backend 创建缓存（file | sqlite），并在前面加一层内存 LRU
+
+    cache.offline 为真时改为只读快照（cache.snapshot），不读写本地磁盘缓存。
+    """
+    if config.get('offline'):
+        # 避免循环导入：snapshot 模块依赖本模块的 MISSING
+        from utils.snapshot import SnapshotCache
+        backend = SnapshotCache(config['snapshot'])
+    elif config.get('backend', 'file') == 'sqlite':
+        backend = SQLiteCache(config)
+    else:
+        backend = FileCache(config)
+    memory_items = int(config.get('memory_items', 1024))
+    if memory_items <= 0:
+        return backend
+    memory = MemoryCache(memory_items, config.get('ttl', 86400), config.get('negative_ttl', 604800))
+    return TieredCache(memory, backend)
+
+
+class Revalidator:
+    """后台刷新过期缓存条目的有界线程池
+
+    同一键只会排队一次；刷新在 bypass_cache() 中重新执行原查询，
+    请求仍经过各数据源的限速器，因此刷新速率受 rate_limit 约束。
+    """
+
+    def __init__(self, workers=2):
+        self._pool = ThreadPoolExecutor(max_workers=max(int(workers), 1),
+                                        thread_name_prefix='bib-check-revalidate')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    def submit(self, key, fn, *args, **kwargs):
+        """提交刷新任务，已在队列中的键不重复提交"""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            self.submitted += 1
+        self._pool.submit(self._run, key, fn, args, kwargs)
+        return True
+
+    def _run(self, key, fn, args, kwargs):
+        try:
+            with bypass_cache():
+                fn(*args, **kwargs)
+            with self._lock:
+                self.refreshed += 1
+        except Exception:
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self):
+        """等待已提交的刷新完成"""
+        self._pool.shutdown(wait=True)
+
+
+_revalidator = None
+_revalidator_lock = threading.Lock()
+
+
+def shutdown_revalidator():
+    """等待共享刷新线程池中已提交的刷新完成（工作进程退出前调用）"""
+    with _revalidator_lock:
+        revalidator = _revalidator
+    if revalidator is not None:
+        revalidator.shutdown()
+
+
+def get_revalidator(config):
+    """获取共享的后台刷新线程池；未启用 stale_while_revalidate 时返回 None"""
+    global _revalidator
+    if not config.get('stale_while_revalidate', False):
+        return None
+    with _revalidator_lock:
+        if _revalidator is None:
+            _revalidator = Revalidator(config.get('revalidate_workers', 2))
+            # 进程退出前等待刷新写回缓存
+            atexit.register(_revalidator.shutdown)
+        return _revalidator
@@ -0,0 +1,153 @@
+"""按数据源的熔断器：连续失败后在冷却期内跳过该数据源"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """三态熔断器
+
+    closed：正常请求；连续失败 failure_threshold 次后进入 open。
+    open：冷却期（cooldown 秒）内直接跳过请求；冷却期结束后进入 half_open。
+    half_open：只放行一个探测请求，成功则恢复 closed，失败或被限速（429）则重新 open；
+    探测请求超过 probe_timeout 秒仍未报告结果时，放行新的探测请求。
+    """
+
+    _local = threading.local()
+
+    def __init__(self, name, failure_threshold=5, cooldown=60, probe_timeout=60):
+        self.name = name
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.cooldown = float(cooldown)
+        self.probe_timeout = float(probe_timeout)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened = 0
+        self.skipped = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        """是否处于冷却期（不占用 half_open 的探测名额）"""
+        with self._lock:
+            self._check_cooldown()
+            return self.state == OPEN
+
+    def allow(self):
+        """是否放行请求；不放行时记为一次跳过"""
+        with self._lock:
+            self._check_cooldown()
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN:
+                now = time.monotonic()
+                if not self._probing or now - self._probe_started >= self.probe_timeout:
+                    self._probing = True
+                    self._probe_started = now
+                    return True
+        self.skip()
+        return False
+
+    def skip(self):
+        """记录一次跳过，并加入当前线程的 track() 作用域"""
+        with self._lock:
+            self.skipped += 1
+        scope = getattr(CircuitBreaker._local, 'scope', None)
+        if scope is not None:
+            scope.add(self.name)
+
+    def _check_cooldown(self):
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def record_throttled(self):
+        """收到 429：closed 状态下由限速器处理，不计入失败；探测请求被限速时重新 open"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open()
+
+    def _open(self):
+        if self.state != OPEN:
+            self.opened += 1
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._probing = False
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'opened': self.opened,
+                'skipped': self.skipped
+            }
+
+    @classmethod
+    @contextmanager
+    def track(cls, scope=None):
+        """收集当前线程在 with 块内因熔断被跳过的数据源
+
+        传入 current_scope() 的结果可在其他线程中继续记录到同一作用域。
+        """
+        previous = getattr(cls._local, 'scope', None)
+        shared = scope is not None
+        scope = scope if shared else set()
+        cls._local.scope = scope
+        try:
+            yield scope
+        finally:
+            cls._local.scope = previous
+            if previous is not None and not shared:
+                previous.update(scope)
+
+    @classmethod
+    def current_scope(cls):
+        return getattr(cls._local, 'scope', None)
+
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name, config):
+    """获取（或创建）数据源的共享熔断器；circuit_breaker.enabled 为 false 时返回 None"""
+    breaker_config = config.get('circuit_breaker', {})
+    if not breaker_config.get('enabled', True):
+        return None
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                breaker_config.get('failure_threshold', 5),
+                breaker_config.get('cooldown', 60),
+                breaker_config.get('probe_timeout', 60)
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_metrics(names):
+    """各数据源熔断器的状态与跳过次数"""
+    with _registry_lock:
+        return {name: _breakers[name].metrics() for name in names if name in _breakers}
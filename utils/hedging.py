@@ -0,0 +1,142 @@
+"""对冲请求：慢请求超过观测延迟的分位数后发送副本，取先返回的结果"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class LatencyWindow:
+    """数据源最近请求延迟的滑动窗口与对冲统计"""
+
+    def __init__(self, name, size=200):
+        self.name = name
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.won = 0
+        self.denied = 0
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile, min_samples=20):
+        """延迟分位数；样本不足时返回 None"""
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(round(percentile / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'samples': len(self._samples),
+                'hedged': self.hedged,
+                'won': self.won,
+                'denied': self.denied
+            }
+
+
+class HedgedSession:
+    """对 GET 请求做对冲的会话包装
+
+    延迟样本足够后，请求超过 percentile 分位延迟仍未返回时，若该数据源的限速器
+    还有空闲令牌（try_acquire，不等待），再发送一次相同请求，返回先完成的响应。
+    令牌不足时不对冲，继续等待原请求。请求在每个数据源独立的线程池中执行，
+    对冲延迟从原请求实际开始执行时计时，线程池排队时间不计入。
+    """
+
+    def __init__(self, session, window, limiter, percentile=95, min_samples=20, min_delay=0.05):
+        self.session = session
+        self.window = window
+        self.limiter = limiter
+        self.percentile = float(percentile)
+        self.min_samples = int(min_samples)
+        self.min_delay = float(min_delay)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def request(self, method, url, **kwargs):
+        delay = self.window.percentile(self.percentile, self.min_samples) if method == 'GET' else None
+        if delay is None:
+            return self._timed(method, url, **kwargs)
+
+        executor = _get_executor(self.window.name)
+        started = threading.Event()
+        primary = executor.submit(self._timed, method, url, started, **kwargs)
+        started.wait()
+        done, _ = wait([primary], timeout=max(delay, self.min_delay))
+        if done:
+            return primary.result()
+        if not self.limiter.try_acquire():
+            self.window.count('denied')
+            return primary.result()
+
+        self.window.count('hedged')
+        hedge = executor.submit(self._timed, method, url, None, **kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: f.exception() is not None):
+                # 一方失败时等待另一方；都失败时抛出最后的异常
+                if future.exception() is None or not pending:
+                    if future is hedge and future.exception() is None:
+                        self.window.count('won')
+                    return future.result()
+
+    def _timed(self, method, url, started=None, **kwargs):
+        if started is not None:
+            started.set()
+        start = time.monotonic()
+        response = self.session.request(method, url, **kwargs)
+        self.window.add(time.monotonic() - start)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+_windows = {}
+_executors = {}
+_registry_lock = threading.Lock()
+
+
+def get_window(name):
+    """获取（或创建）数据源共享的延迟窗口"""
+    with _registry_lock:
+        window = _windows.get(name)
+        if window is None:
+            window = _windows[name] = LatencyWindow(name)
+        return window
+
+
+def _get_executor(name):
+    """数据源独立的对冲线程池，其他数据源的排队不影响本数据源"""
+    with _registry_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix=f"bib-check-hedge-{name}"
+            )
+        return executor
+
+
+def hedge_metrics(names):
+    """各数据源的对冲统计"""
+    with _registry_lock:
+        return {name: _windows[name].metrics() for name in names if name in _windows}
@@ -0,0 +1,139 @@
+"""论文标识规范化与跨数据源身份索引"""
+
+import re
+import threading
+import unicodedata
+
+from utils.cache import MISSING
+
+
+# LaTeX 重音命令：\'e  \"{o}  {\"o}  \c{c}  \v s
+_LATEX_ACCENT = re.compile(r"\\(?:[`'^\"~=.]|[uvHtcdbrk](?=[\s{]))\s*\{?\s*([A-Za-z])\}?")
+_LATEX_LETTERS = {
+    r'\ss': 'ss', r'\ae': 'ae', r'\AE': 'ae', r'\oe': 'oe', r'\OE': 'oe',
+    r'\aa': 'a', r'\AA': 'a', r'\o': 'o', r'\O': 'o', r'\l': 'l', r'\L': 'l',
+    r'\i': 'i', r'\j': 'j'
+}
+_LATEX_COMMAND = re.compile(r'\\[A-Za-z]+\*?|\\.')
+_DOI_PREFIX = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+_ARXIV_PREFIX = re.compile(r'^(?:https?://arxiv\.org/(?:abs|pdf)/|arxiv:\s*)', re.IGNORECASE)
+_ARXIV_VERSION = re.compile(r'v\d+$')
+
+
+def normalize_title(title):
+    """规范化标题：去除花括号、LaTeX 命令与重音，忽略大小写、标点与空白差异"""
+    if not title:
+        return ''
+    text = _LATEX_ACCENT.sub(r'\1', title)
+    for command, letters in _LATEX_LETTERS.items():
+        text = re.sub(re.escape(command) + r'(?![A-Za-z])\s*', letters, text)
+    text = _LATEX_COMMAND.sub(' ', text)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r'[\W_]+', ' ', text.casefold()).strip()
+
+
+def normalize_doi(doi):
+    """规范化 DOI：去除 https://doi.org/、doi: 前缀并转为小写"""
+    if not doi:
+        return ''
+    return _DOI_PREFIX.sub('', doi.strip()).strip().lower()
+
+
+def normalize_arxiv_id(arxiv_id):
+    """规范化 arXiv ID：去除 arXiv: / URL 前缀、.pdf 后缀与版本号（v2 等）"""
+    if not arxiv_id:
+        return ''
+    arxiv_id = _ARXIV_PREFIX.sub('', arxiv_id.strip()).strip()
+    if arxiv_id.lower().endswith('.pdf'):
+        arxiv_id = arxiv_id[:-4]
+    return _ARXIV_VERSION.sub('', arxiv_id).lower()
+
+
+def identity_keys(title=None, doi=None, arxiv_id=None):
+    """生成规范化标识键，按可靠性排序：doi > arxiv > title"""
+    keys = []
+    doi = normalize_doi(doi)
+    if doi:
+        keys.append(f"doi:{doi}")
+    arxiv_id = normalize_arxiv_id(arxiv_id)
+    if arxiv_id:
+        keys.append(f"arxiv:{arxiv_id}")
+    title = normalize_title(title)
+    if title:
+        keys.append(f"title:{title}")
+    return keys
+
+
+class IdentityIndex:
+    """跨标识的解析结果索引
+
+    任意标识（DOI / arXiv ID / 标题）都指向同一篇论文的身份 ID，
+    各数据源的结果按 (数据源, 身份 ID) 只存一份。通过某个标识命中后，
+    结果自身携带的 DOI、标题也会登记为别名，之后经其他标识查询可直接复用。
+    标题可能重复，查询带有 DOI 或 arXiv ID 时不按标题别名解析，避免把同名的另一篇论文
+    的结果用于本条目。索引写入共享缓存（identity: 前缀），跨运行生效。
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._aliases = {}
+        self._records = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def lookup(self, source, keys):
+        """按任一标识查找数据源结果，未登记时返回 MISSING"""
+        identity = self._resolve(keys)
+        if identity is None:
+            return MISSING
+        record_key = f"identity:{source}:{identity}"
+        with self._lock:
+            result = self._records.get(record_key, MISSING)
+        if result is MISSING and self.cache is not None:
+            result = self.cache.get(record_key, MISSING)
+        if result is not MISSING:
+            with self._lock:
+                self._records[record_key] = result
+                self.hits += 1
+        return result
+
+    def record(self, source, keys, result):
+        """登记数据源返回的结果，并把结果中的 DOI / 标题加入别名"""
+        if not result:
+            return
+        keys = list(keys) + identity_keys(title=result.get('title'), doi=result.get('doi'))
+        identity = self._resolve(keys) or keys[0]
+        for key in dict.fromkeys(keys):
+            if self._alias(key) is None:
+                with self._lock:
+                    self._aliases[key] = identity
+                self._set_cache(f"identity:alias:{key}", identity)
+        record_key = f"identity:{source}:{identity}"
+        with self._lock:
+            self._records[record_key] = result
+        self._set_cache(record_key, result)
+
+    def _resolve(self, keys):
+        strong = any(not key.startswith('title:') for key in keys)
+        for key in keys:
+            if strong and key.startswith('title:'):
+                continue
+            identity = self._alias(key)
+            if identity is not None:
+                return identity
+        return None
+
+    def _alias(self, key):
+        with self._lock:
+            identity = self._aliases.get(key)
+        if identity is None and self.cache is not None:
+            identity = self.cache.get(f"identity:alias:{key}")
+            if identity is not None:
+                with self._lock:
+                    self._aliases[key] = identity
+        return identity
+
+    def _set_cache(self, key, value):
+        if self.cache is not None:
+            self.cache.set(key, value)
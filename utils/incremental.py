@@ -0,0 +1,145 @@
+"""增量检查：按条目内容指纹复用上次的检查结果"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+
+from bibtexparser.bibdatabase import BibDatabase
+from colorama import Fore, Style
+
+
+STATE_VERSION = 1
+
+# 结果中包含这些类别的条目需要重新检查（瞬时失败 / 离线未覆盖 / 数据源熔断）
+_RETRY_SECTIONS = ('errors', 'snapshot_misses', 'source_skips')
+# 结果中包含这些类别的条目在写回文件时需要重新检查，以便把修改真正应用到条目上
+_MODIFYING_SECTIONS = ('updates', 'author_truncations', 'fixes')
+
+
+def entry_fingerprint(entry, cited=None):
+    """条目指纹：字段名小写、字段值合并空白后按字段排序计算 sha256"""
+    fields = {}
+    for key, value in entry.items():
+        if key in ('ID', 'ENTRYTYPE'):
+            continue
+        fields[key.lower()] = re.sub(r'\s+', ' ', str(value)).strip()
+    payload = json.dumps({
+        'id': entry.get('ID', ''),
+        'type': entry.get('ENTRYTYPE', '').lower(),
+        'fields': fields,
+        'cited': cited
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def run_signature(config, features):
+    """运行签名：启用的功能与影响检查结果的配置，变化时上次结果全部作废"""
+    sources = config.get('sources', {})
+    payload = json.dumps({
+        'version': STATE_VERSION,
+        'features': features,
+        'priority': sources.get('priority'),
+        'resolution': sources.get('resolution'),
+        'validation': config.get('validation', {}),
+        'auto_fix': config.get('auto_fix', {}),
+        'link_check': config.get('link_check', {}),
+        'author_truncation': config.get('author_truncation', {})
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IncrementalState:
+    """保存在报告旁边的增量状态文件
+
+    每个条目记录指纹、上次检查时间与检查结果（按报告类别分组）。
+    指纹不变且未超过 max_age 的条目跳过检查，直接合并上次的结果。
+    """
+
+    def __init__(self, path, signature, max_age=0):
+        self.path = path
+        self.signature = signature
+        self.max_age = int(max_age or 0)
+        self.entries = {}
+        self._fingerprints = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != STATE_VERSION or data.get('signature') != self.signature:
+            # 功能或配置已变化，全部重新检查
+            return
+        self.entries = data.get('entries', {})
+
+    def select(self, bib_database, used_ids=None, rewrite=False):
+        """划分需要检查的条目，返回 (待检查的 BibDatabase, 跳过的条目 ID 列表)"""
+        counts = Counter(entry.get('ID', '') for entry in bib_database.entries)
+        # 重复 ID 无法按 ID 区分状态，始终重新检查（同时保证重复 ID 校验完整）
+        duplicated = {entry_id for entry_id, count in counts.items() if count > 1}
+        now = time.time()
+
+        pending = []
+        skipped = []
+        for entry in bib_database.entries:
+            entry_id = entry.get('ID', '')
+            cited = (entry_id in used_ids) if used_ids else None
+            fingerprint = entry_fingerprint(entry, cited)
+            self._fingerprints[entry_id] = fingerprint
+            if entry_id in duplicated or not self._is_fresh(entry_id, fingerprint, now, rewrite):
+                pending.append(entry)
+            else:
+                skipped.append(entry_id)
+
+        # 待检查的条目与原数据库共享同一个 dict，检查器的修改会直接反映到写回结果
+        subset = BibDatabase()
+        subset.entries = pending
+        subset.strings = bib_database.strings
+        subset.preambles = bib_database.preambles
+        subset.comments = bib_database.comments
+        return subset, skipped
+
+    def _is_fresh(self, entry_id, fingerprint, now, rewrite):
+        record = self.entries.get(entry_id)
+        if not record or record.get('fingerprint') != fingerprint:
+            return False
+        if self.max_age > 0 and now - record.get('checked', 0) > self.max_age:
+            return False
+        findings = record.get('findings', {})
+        if any(findings.get(section) for section in _RETRY_SECTIONS):
+            return False
+        if rewrite and any(findings.get(section) for section in _MODIFYING_SECTIONS):
+            return False
+        return True
+
+    def findings(self, entry_ids):
+        """上次保存的检查结果，按条目 ID 分组"""
+        return {entry_id: self.entries[entry_id].get('findings', {}) for entry_id in entry_ids}
+
+    def record(self, entries, findings):
+        """记录本次检查过的条目（指纹为检查前计算的值）"""
+        now = time.time()
+        for entry in entries:
+            entry_id = entry.get('ID', '')
+            self.entries[entry_id] = {
+                'fingerprint': self._fingerprints.get(entry_id, ''),
+                'checked': now,
+                'findings': findings.get(entry_id, {})
+            }
+
+    def save(self, entry_ids):
+        """写入状态文件，仅保留当前文件中仍存在的条目"""
+        entries = {entry_id: self.entries[entry_id] for entry_id in entry_ids if entry_id in self.entries}
+        data = {'version': STATE_VERSION, 'signature': self.signature, 'entries': entries}
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"{Fore.RED}[错误] 写入增量状态失败: {e}{Style.RESET_ALL}")
@@ -0,0 +1,175 @@
+"""线程安全的令牌桶限速器（各数据源共享）"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from multiprocessing.managers import BaseManager
+
+
+class TokenBucket:
+    """令牌桶限速器
+
+    rate_limit 为每分钟请求数，burst 为允许的突发请求数。
+    收到 429 时调用 backoff()，同一数据源的所有线程都会暂停到
+    Retry-After 指定的时间之后。
+    """
+
+    def __init__(self, name, rate_limit, burst=1):
+        self.name = name
+        self.rate_limit = rate_limit or 0
+        self.rate = self.rate_limit / 60.0
+        self.capacity = max(1, int(burst or 1))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.tokens_granted = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+        self.retry_after_honored = 0
+
+    def acquire(self):
+        """获取一个令牌，必要时阻塞等待"""
+        with self._lock:
+            self.tokens_granted += 1
+            if self.rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._refill(now)
+            # 预约令牌：余额为负表示需要等待补充
+            self._tokens -= 1
+            # 退避期内不补充令牌（_updated 位于退避结束时刻），等待时间为剩余退避加上令牌缺口
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            self.wait_seconds += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self):
+        """不等待地获取一个令牌（对冲请求使用），令牌不足或处于退避期时返回 False"""
+        with self._lock:
+            if self.rate <= 0:
+                self.tokens_granted += 1
+                return True
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens < 1 or now < self._blocked_until:
+                return False
+            self._tokens -= 1
+            self.tokens_granted += 1
+            return True
+
+    def backoff(self, retry_after=None, attempt=0):
+        """收到 429 后暂停该数据源，优先遵循 Retry-After，否则指数退避"""
+        delay = parse_retry_after(retry_after)
+        with self._lock:
+            self.throttled += 1
+            if delay is None:
+                delay = float(2 ** attempt)
+            else:
+                self.retry_after_honored += 1
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            # 令牌从退避结束时才开始补充，排队的请求在退避后仍按 rate_limit 间隔发出
+            self._updated = max(self._updated, self._blocked_until)
+
+    def metrics(self):
+        """导出统计信息"""
+        with self._lock:
+            return {
+                'rate_limit': self.rate_limit,
+                'burst': self.capacity,
+                'tokens_granted': self.tokens_granted,
+                'wait_seconds': round(self.wait_seconds, 3),
+                'throttled': self.throttled,
+                'retry_after_honored': self.retry_after_honored
+            }
+
+    def _refill(self, now):
+        if now <= self._updated:
+            return
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(float(self.capacity), self._tokens + elapsed * self.rate)
+
+
+def parse_retry_after(value):
+    """解析 Retry-After 头（秒数或 HTTP 日期），无法解析时返回 None"""
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+_limiters = {}
+_registry_lock = threading.Lock()
+_remote = None
+
+
+def get_limiter(name, rate_limit, burst=1):
+    """获取（或创建）指定数据源的共享限速器
+
+    工作进程调用 use_shared_limiters() 后，返回管理进程中同名限速器的代理，
+    所有进程共用同一个令牌桶。
+    """
+    with _registry_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            if _remote is not None:
+                limiter = _remote.get_limiter(name, rate_limit, burst)
+            else:
+                limiter = TokenBucket(name, rate_limit, burst)
+            _limiters[name] = limiter
+        return limiter
+
+
+class LimiterManager(BaseManager):
+    """跨进程共享限速器的管理进程（--jobs 多进程模式）"""
+
+
+# 在管理进程内执行 get_limiter，返回 TokenBucket 的代理
+LimiterManager.register('get_limiter', callable=get_limiter)
+
+
+def start_shared_limiters(ctx=None):
+    """启动限速器管理进程，返回已启动的 LimiterManager（调用方负责 shutdown）
+
+    ctx 为 multiprocessing 上下文（如 spawn），默认使用平台的启动方式。
+    """
+    manager = LimiterManager(ctx=ctx)
+    manager.start()
+    return manager
+
+
+def use_shared_limiters(address):
+    """在工作进程中连接管理进程，之后 get_limiter 返回跨进程共享的限速器"""
+    global _remote
+    manager = LimiterManager(address=address)
+    manager.connect()
+    with _registry_lock:
+        _remote = manager
+        _limiters.clear()
+
+
+def limiter_metrics(names=None):
+    """导出各数据源限速器的统计信息"""
+    with _registry_lock:
+        limiters = dict(_limiters)
+    return {
+        name: limiter.metrics()
+        for name, limiter in limiters.items()
+        if names is None or name in names
+    }
@@ -9,13 +9,21 @@ from colorama import Fore, Style
 
 class Report:
     """报告类"""
-    
+
+    # 按条目记录的报告类别（增量模式按条目保存与合并）
+    ENTRY_SECTIONS = (
+        'updates', 'update_candidates', 'update_misses', 'snapshot_misses', 'source_skips',
+        'author_truncations', 'fixes', 'dead_links', 'errors'
+    )
+
     def __init__(self):
         """初始化报告"""
         self._lock = threading.Lock()
         self.updates = []  # 更新的条目
         self.update_candidates = []  # 可更新的条目（已检索到正式版本）
         self.update_misses = []  # 未找到正式版本
+        self.snapshot_misses = []  # 离线快照未覆盖的条目
+        self.source_skips = []  # 因熔断被跳过的数据源
         self.author_truncations = []  # 作者截断
         self.fixes = []  # 自动修复
         self.dead_links = []  # 失效链接
@@ -27,12 +35,14 @@ class Report:
             'duplicate_ids': [],
             'type_issues': [],
             'doi_format': [],
+            'doi_unresolved': [],
             'isbn_format': [],
             'issn_format': [],
             'year_range': [],
             'pages_format': [],
             'url_format': []
         }
+        self.performance = {}  # 性能统计（按模块分组）
     
     def add_update(self, entry_id, old_type, new_type, changes):
         """添加更新记录"""
@@ -44,8 +54,9 @@ class Report:
                 'changes': changes
             })
 
-    def add_update_candidate(self, entry_id, title, venue, year, doi, urls, sources, arxiv_id):
-        """添加可更新条目记录"""
+    def add_update_candidate(self, entry_id, title, venue, year, doi, urls, sources, arxiv_id,
+                             bibtex_source=''):
+        """添加可更新条目记录（bibtex_source 为将用其 BibTeX 整体替换条目的数据源）"""
         with self._lock:
             self.update_candidates.append({
                 'entry_id': entry_id,
@@ -55,7 +66,8 @@ class Report:
                 'doi': doi,
                 'urls': urls,
                 'sources': sources,
-                'arxiv_id': arxiv_id
+                'arxiv_id': arxiv_id,
+                'bibtex_source': bibtex_source
             })
 
     def add_update_miss(self, entry_id, title, arxiv_id):
@@ -67,6 +79,23 @@ class Report:
                 'arxiv_id': arxiv_id
             })
     
+    def add_snapshot_miss(self, entry_id, stage, urls):
+        """添加离线快照未覆盖记录（离线模式下被拦截的请求）"""
+        with self._lock:
+            self.snapshot_misses.append({
+                'entry_id': entry_id,
+                'stage': stage,
+                'requests': list(urls)
+            })
+
+    def add_source_skip(self, entry_id, sources):
+        """添加因熔断器打开而未查询的数据源记录"""
+        with self._lock:
+            self.source_skips.append({
+                'entry_id': entry_id,
+                'sources': list(sources)
+            })
+
     def add_author_truncation(self, entry_id, old_value, new_value, total_authors, max_authors):
         """添加作者截断记录"""
         with self._lock:
@@ -118,6 +147,32 @@ class Report:
                 'message': message
             })
     
+    def entry_findings(self):
+        """按条目 ID 分组的检查结果：{entry_id: {类别: [记录]}}，校验问题类别为 validation.<类型>"""
+        findings = {}
+        with self._lock:
+            sections = [(name, getattr(self, name)) for name in self.ENTRY_SECTIONS]
+            sections += [(f"validation.{name}", items) for name, items in self.validation_issues.items()]
+            for name, items in sections:
+                for item in items:
+                    findings.setdefault(item.get('entry_id', ''), {}).setdefault(name, []).append(item)
+        return findings
+
+    def merge_findings(self, findings):
+        """合并 entry_findings() 格式的检查结果（增量模式复用上次结果）"""
+        with self._lock:
+            for entry_findings in findings.values():
+                for name, items in entry_findings.items():
+                    if name.startswith('validation.'):
+                        self.validation_issues.setdefault(name.split('.', 1)[1], []).extend(items)
+                    elif name in self.ENTRY_SECTIONS:
+                        getattr(self, name).extend(items)
+
+    def set_performance(self, section, stats):
+        """记录性能统计"""
+        with self._lock:
+            self.performance[section] = stats
+
     def print_report(self):
         """打印报告"""
         
@@ -216,6 +271,36 @@ class Report:
         print(f"  • 失效链接: {len(self.dead_links)}")
         print(f"  • 校验问题: {total_validation_issues}")
         print(f"  • 错误: {len(self.errors)}")
+        if self.snapshot_misses:
+            print(f"  • 离线快照未覆盖: {len(self.snapshot_misses)}")
+        if self.source_skips:
+            print(f"  • 数据源熔断跳过: {len(self.source_skips)} 个条目")
+        resolution = self.performance.get('resolution')
+        if resolution:
+            print(f"  • 数据源调用: {resolution.get('source_calls', 0)} "
+                  f"(策略 {resolution.get('policy', 'all')}，节省 {resolution.get('source_calls_saved', 0)}，"
+                  f"身份索引命中 {resolution.get('identity_hits', 0)})")
+        coalesced = ((resolution or {}).get('coalesced', 0) +
+                     (self.performance.get('link_check') or {}).get('coalesced', 0))
+        if coalesced:
+            print(f"  • 合并的并发重复请求: {coalesced}")
+        concurrency = self.performance.get('concurrency') or {}
+        if concurrency:
+            limits = ', '.join(f"{name} {stats['trajectory'][0][1]}→{stats['limit']}（峰值 {stats['peak']}）"
+                               for name, stats in concurrency.items() if stats.get('requests'))
+            if limits:
+                print(f"  • 自适应并发: {limits}")
+        link_concurrency = self.performance.get('link_concurrency') or {}
+        if link_concurrency:
+            decreases = sum(stats.get('decreases', 0) for stats in link_concurrency.values())
+            print(f"  • 链接主机自适应并发: {len(link_concurrency)} 个主机，拥塞降低 {decreases} 次")
+        cache = self.performance.get('cache') or {}
+        memory = cache.get('memory', {})
+        if memory.get('hits', 0) + memory.get('misses', 0) > 0:
+            disk = cache.get('disk', {})
+            stale = f"（其中过期 {disk['stale']}）" if disk.get('stale') else ''
+            print(f"  • 缓存命中: 内存 {memory.get('hits', 0)}/{memory.get('hits', 0) + memory.get('misses', 0)}, "
+                  f"磁盘 {disk.get('hits', 0)}/{disk.get('hits', 0) + disk.get('misses', 0)}{stale}")
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
     
     def to_dict(self):
@@ -232,7 +317,10 @@ class Report:
                 'validation': self.validation_issues
             },
             'update_candidates': self.update_candidates,
-            'update_misses': self.update_misses
+            'update_misses': self.update_misses,
+            'snapshot_misses': self.snapshot_misses,
+            'source_skips': self.source_skips,
+            'performance': self.performance
         }
 
     def write_markdown(self, filepath):
@@ -276,6 +364,21 @@ class Report:
             else:
                 lines.append("- 无")
 
+            if self.snapshot_misses:
+                lines.append("")
+                lines.append("## 离线快照未覆盖的条目")
+                for item in self.snapshot_misses:
+                    lines.append(
+                        f"- {item.get('entry_id','')} ({item.get('stage','')}): "
+                        f"{len(item.get('requests', []))} 个请求未命中快照"
+                    )
+
+            if self.source_skips:
+                lines.append("")
+                lines.append("## 因熔断跳过的数据源")
+                for item in self.source_skips:
+                    lines.append(f"- {item.get('entry_id','')}: {', '.join(item.get('sources', []))}")
+
             lines.append("")
             lines.append("## 具体修改")
             if self.updates:
@@ -367,6 +470,12 @@ class Report:
                     for issue in self.validation_issues['doi_format']:
                         lines.append(f"- {issue['entry_id']}: {issue['message']}")
 
+                if self.validation_issues['doi_unresolved']:
+                    lines.append("")
+                    lines.append("### DOI 无法解析")
+                    for issue in self.validation_issues['doi_unresolved']:
+                        lines.append(f"- {issue['entry_id']}: {issue['message']}")
+
                 if self.validation_issues['isbn_format']:
                     lines.append("")
                     lines.append("### ISBN 格式")
@@ -816,6 +925,7 @@ $(document).ready(function() {{
         <button class="filter-btn" data-category="duplicate_ids">重复ID</button>
         <button class="filter-btn" data-category="type_issues">类型问题</button>
         <button class="filter-btn" data-category="doi_format">DOI 格式</button>
+        <button class="filter-btn" data-category="doi_unresolved">DOI 无法解析</button>
         <button class="filter-btn" data-category="isbn_format">ISBN 格式</button>
         <button class="filter-btn" data-category="issn_format">ISSN 格式</button>
         <button class="filter-btn" data-category="year_range">年份范围</button>
@@ -915,6 +1025,7 @@ $(document).ready(function() {{
             'type_issues': 'medium',
             'journal_abbrev': 'low',
             'doi_format': 'medium',
+            'doi_unresolved': 'medium',
             'isbn_format': 'medium',
             'issn_format': 'medium',
             'year_range': 'medium',
@@ -932,6 +1043,7 @@ $(document).ready(function() {{
             'duplicate_ids': '重复ID',
             'type_issues': '类型问题',
             'doi_format': 'DOI 格式',
+            'doi_unresolved': 'DOI 无法解析',
             'isbn_format': 'ISBN 格式',
             'issn_format': 'ISSN 格式',
             'year_range': '年份范围',
@@ -971,8 +1083,10 @@ $(document).ready(function() {{
 class SummaryReport:
     """批量处理汇总报告"""
 
-    def __init__(self, items):
+    def __init__(self, items, dedup=None):
         self.items = items
+        # 跨文件去重统计：{'entries', 'unique', 'saved'}
+        self.dedup = dedup
 
     def to_dict(self):
         total = {
@@ -989,10 +1103,13 @@ class SummaryReport:
             stats = item.get('stats', {})
             for key in total:
                 total[key] += int(stats.get(key, 0))
-        return {
+        data = {
             'files': self.items,
             'total': total
         }
+        if self.dedup:
+            data['lookup_dedup'] = self.dedup
+        return data
 
     def write_json(self, filepath):
         try:
@@ -1026,6 +1143,13 @@ class SummaryReport:
             for key, value in total.items():
                 lines.append(f"- {key}: {value}")
 
+            if self.dedup:
+                lines.append("")
+                lines.append("## 跨文件查询去重")
+                lines.append(f"- arXiv-only 条目: {self.dedup.get('entries', 0)}")
+                lines.append(f"- 唯一标识: {self.dedup.get('unique', 0)}")
+                lines.append(f"- 节省查询: {self.dedup.get('saved', 0)}")
+
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write("\n".join(lines) + "\n")
             return True
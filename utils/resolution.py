@@ -0,0 +1,61 @@
+"""数据源解析策略"""
+
+import re
+
+
+class ResolutionPolicy:
+    """决定何时停止继续查询后续数据源
+
+    支持的策略：
+    - all: 查询全部数据源（默认，与旧行为一致）
+    - first-bibtex-hit: 任一数据源返回 BibTeX 即停止
+    - first-published-hit: 任一数据源返回正式出版版本即停止
+    - quorum-N: 累计 N 个数据源命中即停止
+    """
+
+    NAMES = ('all', 'first-bibtex-hit', 'first-published-hit', 'quorum-N')
+
+    def __init__(self, name='all'):
+        self.name = (name or 'all').strip().lower()
+        self.quorum = 0
+
+        match = re.fullmatch(r'quorum-(\d+)', self.name)
+        if match:
+            self.quorum = int(match.group(1))
+            if self.quorum < 1:
+                raise ValueError(f"quorum 必须为正整数: {name}")
+        elif self.name not in ('all', 'first-bibtex-hit', 'first-published-hit'):
+            raise ValueError(f"未知的解析策略: {name}（可选: {', '.join(self.NAMES)}）")
+
+    @classmethod
+    def from_config(cls, config):
+        """从配置读取策略"""
+        return cls(config.get('sources', {}).get('resolution', 'all'))
+
+    def is_satisfied(self, results):
+        """根据已获得的结果判断是否可以停止查询"""
+        if self.name == 'all' or not results:
+            return False
+        if self.name == 'first-bibtex-hit':
+            return any(has_bibtex(result) for result in results.values())
+        if self.name == 'first-published-hit':
+            return any(result.get('is_published') for result in results.values())
+        return len(results) >= self.quorum
+
+    def reach(self, sources):
+        """按查询顺序排列的 sources 中一定会被查询的前几个数据源
+
+        all 查询全部；quorum-N 至少查询 N 个；first-*-hit 只有第一个是确定会查询的，
+        之后的数据源可能因策略已满足而不再查询。
+        """
+        if self.name == 'all':
+            return list(sources)
+        return list(sources)[:max(self.quorum, 1)]
+
+    def __str__(self):
+        return self.name
+
+
+def has_bibtex(result):
+    """结果是否带有（或可按需获取）BibTeX"""
+    return bool(result and (result.get('bibtex') or result.get('bibtex_pending')))
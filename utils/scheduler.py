@@ -0,0 +1,157 @@
+"""自适应数据源调度：按观测到的命中率与延迟为每个条目排序数据源"""
+
+import json
+import os
+import threading
+
+from utils.resolution import has_bibtex
+
+
+# 无观测数据时的先验（Laplace 平滑）
+_PRIOR_LATENCY = 1.0
+
+
+def query_kind(title=None, arxiv_id=None, doi=None):
+    """条目可用的最强标识类型，命中率按类型分别统计"""
+    if doi:
+        return 'doi'
+    if arxiv_id:
+        return 'arxiv'
+    return 'title'
+
+
+class SourceScheduler:
+    """按期望耗时排序数据源
+
+    每个 (数据源, 标识类型) 统计请求次数、命中数、带 BibTeX 的命中数、正式出版命中数
+    与累计延迟，只统计得到数据源响应的查询（缓存命中不计）；请求失败（超时、5xx、
+    熔断）单独计为 failures，不算作"未找到"。按解析策略选择"可用结果"的概率 p
+    （Laplace 平滑）并乘以可用率，依次查询时按延迟 / p 升序排列可使期望耗时最小；
+    分数相同时保持传入顺序（sources.priority）。
+    样本足够且 p 低于 skip_below 的数据源会被跳过，但每 explore_every 个条目仍查询一次，
+    以便其命中率恢复时能重新排上来。统计保存在缓存目录中，跨运行累积。
+    """
+
+    def __init__(self, policy='all', path=None, min_samples=10,
+                 skip_below=0.05, explore_every=20, max_samples=1000):
+        self.policy = str(policy)
+        self.path = path
+        self.min_samples = int(min_samples)
+        self.skip_below = float(skip_below)
+        self.explore_every = max(int(explore_every), 1)
+        self.max_samples = max(int(max_samples), self.min_samples * 2, 2)
+        self.stats = {}
+        self.skipped = {}
+        self._passes = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.stats = json.load(f).get('stats', {})
+        except (OSError, ValueError):
+            self.stats = {}
+
+    def save(self):
+        """写入统计文件（先写临时文件再替换）"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {'version': 1, 'stats': self.stats}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def record(self, source, kind, result, latency, failed=False):
+        """记录一次经网络请求的数据源查询；failed 表示请求失败而未得到结果"""
+        with self._lock:
+            stats = self.stats.setdefault(source, {}).setdefault(kind, {
+                'requests': 0, 'hits': 0, 'bibtex': 0, 'published': 0, 'latency': 0.0
+            })
+            stats.setdefault('failures', 0)
+            if failed and not result:
+                stats['failures'] += 1
+            else:
+                stats['requests'] += 1
+                stats['latency'] += latency
+            if result:
+                stats['hits'] += 1
+                stats['bibtex'] += int(has_bibtex(result))
+                stats['published'] += int(bool(result.get('is_published')))
+            if stats['requests'] + stats['failures'] > self.max_samples:
+                # 指数遗忘：样本过多时减半，使统计跟随数据源的变化
+                for key in stats:
+                    stats[key] /= 2
+
+    def order(self, sources, kind):
+        """返回本条目应查询的数据源（按期望耗时排序，已去掉跳过的数据源）"""
+        return self._rank(sources, kind, explore=True)
+
+    def preview(self, sources, kind):
+        """与 order 相同的排序，但不计入探测与跳过统计，低命中率的数据源一律去掉（批量预取使用）"""
+        return self._rank(sources, kind, explore=False)
+
+    def _rank(self, sources, kind, explore):
+        ranked = []
+        with self._lock:
+            for index, source in enumerate(sources):
+                probability, latency, samples = self._estimate(source, kind)
+                if samples >= self.min_samples and probability < self.skip_below:
+                    if not explore:
+                        continue
+                    count = self._passes.get(source, 0) + 1
+                    self._passes[source] = count
+                    if count % self.explore_every:
+                        self.skipped[source] = self.skipped.get(source, 0) + 1
+                        continue
+                ranked.append((round(latency / max(probability, 1e-6), 3), index, source))
+        ranked.sort()
+        return [source for _, _, source in ranked]
+
+    def _estimate(self, source, kind):
+        """返回 (可用结果概率, 平均延迟, 样本数)"""
+        stats = self.stats.get(source, {}).get(kind)
+        if not stats:
+            return 0.5, _PRIOR_LATENCY, 0
+        requests = stats['requests']
+        if self.policy == 'first-bibtex-hit':
+            usable = stats['bibtex']
+        elif self.policy == 'first-published-hit':
+            usable = stats['published']
+        else:
+            usable = stats['hits']
+        failures = stats.get('failures', 0)
+        availability = (requests + 1) / (requests + failures + 1)
+        probability = (usable + 1) / (requests + 2) * availability
+        latency = (stats['latency'] + _PRIOR_LATENCY) / (requests + 1)
+        return probability, latency, requests + failures
+
+    def metrics(self):
+        """各数据源的命中率、BibTeX 可用率、平均延迟与跳过次数"""
+        with self._lock:
+            metrics = {}
+            for source, kinds in self.stats.items():
+                requests = sum(stats['requests'] for stats in kinds.values())
+                failures = sum(stats.get('failures', 0) for stats in kinds.values())
+                if not requests:
+                    if failures:
+                        metrics[source] = {'requests': 0, 'failures': round(failures, 1),
+                                           'skipped': self.skipped.get(source, 0)}
+                    continue
+                metrics[source] = {
+                    'requests': round(requests, 1),
+                    'failures': round(failures, 1),
+                    'hit_rate': round(sum(s['hits'] for s in kinds.values()) / requests, 3),
+                    'bibtex_rate': round(sum(s['bibtex'] for s in kinds.values()) / requests, 3),
+                    'avg_latency': round(sum(s['latency'] for s in kinds.values()) / requests, 3),
+                    'skipped': self.skipped.get(source, 0)
+                }
+            return metrics
@@ -0,0 +1,59 @@
+"""请求合并（single-flight）：相同键的并发调用只执行一次"""
+
+import threading
+
+
+class _Call:
+    """进行中的一次调用"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """合并并发的相同请求
+
+    第一个调用者执行请求，同一键上并发到达的调用者等待并共享其结果（或异常）。
+    请求完成后键即释放，之后的调用照常执行（由缓存负责复用）。
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """执行 fn(*args, **kwargs)，返回 (结果, 是否复用了其他调用的结果)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+_flight = SingleFlight()
+
+
+def get_flight():
+    """进程内共享的请求合并组（数据源查询与链接检查共用，键带各自前缀）"""
+    return _flight
@@ -0,0 +1,112 @@
+"""离线缓存快照：导出、导入与只读读取"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from utils.cache import MISSING
+
+
+SNAPSHOT_VERSION = 1
+
+
+def write_snapshot(path, records):
+    """将 {缓存键: 值} 写入 gzip 压缩的内容寻址快照
+
+    相同内容的记录只保存一份（按 JSON 的 sha256 寻址），
+    keys 部分仅保存缓存键到内容摘要的映射。
+    """
+    keys = {}
+    objects = {}
+    for key in sorted(records):
+        payload = json.dumps(records[key], ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        keys[key] = digest
+        objects.setdefault(digest, records[key])
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'created': time.time(),
+        'keys': keys,
+        'objects': objects
+    }
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    return len(keys), len(objects)
+
+
+def read_snapshot(path):
+    """读取快照，返回 {缓存键: 值}"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    version = snapshot.get('version')
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"不支持的快照版本: {version}")
+    objects = snapshot.get('objects', {})
+    records = {}
+    for key, digest in snapshot.get('keys', {}).items():
+        if digest not in objects:
+            raise ValueError(f"快照缺少对象 {digest}（键 {key}）")
+        records[key] = objects[digest]
+    return records
+
+
+class SnapshotCache:
+    """只读快照缓存，接口与 FileCache 相同，set() 不做任何操作"""
+
+    def __init__(self, path):
+        self.path = path
+        self.enabled = True
+        self._records = read_snapshot(path)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        value = self._records.get(key, MISSING)
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return default if value is MISSING else value
+
+    def set(self, key, value):
+        return
+
+    def __len__(self):
+        return len(self._records)
+
+
+class RecordingCache:
+    """包装缓存并记录运行中读到或写入的全部条目，用于导出快照"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.records = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.cache.enabled
+
+    def get(self, key, default=None):
+        value = self.cache.get(key, MISSING)
+        if value is MISSING:
+            return default
+        with self._lock:
+            self.records[key] = value
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self.records[key] = value
+        self.cache.set(key, value)
+
+    def reset_stats(self):
+        if hasattr(self.cache, 'reset_stats'):
+            self.cache.reset_stats()
+
+    def stats(self):
+        return self.cache.stats() if hasattr(self.cache, 'stats') else {}